@@ -1,27 +1,66 @@
-from time import sleep
-from inspy_hard_stat.ihs_lib.libre_hw_monitor.config import CONFIG
-from inspy_hard_stat.ihs_lib.libre_hw_monitor.utils import is_lhwmon_running
-import os
-import atexit
+import sys
+from importlib import import_module
 
 
-print(os.getpid())
+def _default_subcommand_accepts(argv) -> bool:
+    """
+    Whether the command line is empty or consists only of the default sub-command's (the daemon's) options.
+    """
+    if not argv:
+        return True
 
+    if not argv[0].startswith('-'):
+        return False
 
-def main_loop():
-    acc = 0
-    while True:
-        acc += 1
-        try:
-            sleep(1)
-            print("Main loop running...")
-            print(f"Libre Hardware Monitor running: {is_lhwmon_running(CONFIG.executable_path)}")
-        except KeyboardInterrupt:
-            print("\nExiting main loop...")
-            print(acc)
-            break
+    from argparse import ArgumentParser
+    from inspy_hard_stat.ihs_lib.daemon.daemon import add_daemon_arguments
 
+    _, unknown = add_daemon_arguments(ArgumentParser(add_help=False)).parse_known_args(argv)
+
+    return not unknown
+
+
+def run_cli(argv) -> int:
+    """
+    Parse the command line with the full interface (see :class:`inspy_hard_stat.cli.arguments.ParsedArgs`) and run the
+    selected sub-command, or the default one if none was selected.
+    """
+    from inspy_hard_stat.cli.arguments import ParsedArgs
+    from inspy_hard_stat.cli.subcommands import DEFAULT_SUBCOMMAND
+
+    def parse(args):
+        return ParsedArgs('inspy-hard-stat', 'Monitor hardware and system statistics.', args=args).parse_args()
+
+    args = parse(argv)
+
+    if getattr(args, 'subcommand_handler', None) is None:
+        args = parse([*argv, DEFAULT_SUBCOMMAND])
+
+    return args.subcommand_handler(args)
+
+
+def main(argv=None):
+    """
+    The ``inspy-hard-stat`` entry point.
+
+    Sub-commands are looked up in the registry (:mod:`inspy_hard_stat.cli.subcommands`). Those with a fast path
+    (``snapshot``, ``sample`` and ``daemon``) are handed straight to it, so they only load the sampling code. With no
+    arguments, or only the daemon's options, the monitoring daemon runs the same way. Anything else (``version``,
+    ``--version``, ``--check-updates``, ``--help``, ...) goes through the full command-line interface.
+    """
+    from inspy_hard_stat.cli.subcommands import DEFAULT_SUBCOMMAND, find_subcommand
+
+    argv = sys.argv[1:] if argv is None else list(argv)
+    spec = find_subcommand(argv[0]) if argv else None
+
+    if spec is None and _default_subcommand_accepts(argv):
+        spec, argv = find_subcommand(DEFAULT_SUBCOMMAND), [DEFAULT_SUBCOMMAND, *argv]
+
+    if spec is not None and spec.fast_path:
+        return import_module(spec.fast_path).main(argv[1:])
+
+    return run_cli(argv)
 
 
 if __name__ == '__main__':
-    main_loop()
+    sys.exit(main())
@@ -1,16 +1,33 @@
 import os
 import sys
-import time
-import subprocess
+import threading
 import psutil
 import ctypes
 from inspy_hard_stat.ihs_lib.libre_hw_monitor.config import CONFIG
+from inspy_hard_stat.ihs_lib.process.events import ProcessEventKind, ProcessEventStream
+from inspy_hard_stat.ihs_lib.supervisor import ChildSpec, ChildState, RestartPolicy, Supervisor
+
+
+LHM_CHILD_NAME = 'lhm'
+
 
 class LibreHardwareMonitorWatchdog:
-    def __init__(self, script_name, libre_monitor_path):
+    def __init__(self, script_name, libre_monitor_path, check_interval=5):
         self.script_name = script_name
         self.libre_monitor_path = libre_monitor_path
-        self.libre_monitor_process = None
+        self.check_interval = check_interval
+        self.stopped = threading.Event()
+        self.events = ProcessEventStream()
+        self.events.subscribe(self._on_process_event)
+        self.script_pids = None
+        self.supervisor = Supervisor([
+                ChildSpec(LHM_CHILD_NAME, [libre_monitor_path], restart=RestartPolicy.ALWAYS)
+                ])
+
+    @property
+    def libre_monitor_process(self):
+        """The status of the supervised Libre Hardware Monitor process."""
+        return self.supervisor.status(LHM_CHILD_NAME)
 
     def is_admin(self):
         """Check if the script is running with administrator privileges."""
@@ -30,30 +47,51 @@ class LibreHardwareMonitorWatchdog:
         )
         sys.exit()
 
-    def is_script_running(self):
-        """Check if the specified Python script is running."""
-        for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-            if proc.info['name'] in ('python.exe', 'pythonw.exe'):
+    def is_script_process(self, proc):
+        """Check if the given process is running the specified Python script."""
+        try:
+            if proc.name() in ('python.exe', 'pythonw.exe'):
                 # Check if the script name is part of the command line arguments
-                if any(self.script_name in cmd for cmd in proc.info['cmdline']):
-                    return True
+                return any(self.script_name in cmd for cmd in proc.cmdline())
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
         return False
 
+    def _on_process_event(self, event):
+        if event.kind is ProcessEventKind.EXITED:
+            self.script_pids.discard(event.pid)
+        else:
+            try:
+                if self.is_script_process(psutil.Process(event.pid)):
+                    self.script_pids.add(event.pid)
+            except psutil.NoSuchProcess:
+                pass
+
+    def is_script_running(self):
+        """Check if the specified Python script is running."""
+        if self.script_pids is None:
+            # Scan the full process list once; after that, only processes that start or exit are looked at.
+            self.events.poll()
+            self.script_pids = {proc.pid for proc in psutil.process_iter() if self.is_script_process(proc)}
+        else:
+            self.events.poll()
+        return bool(self.script_pids)
+
     def start_libre_monitor(self):
-        """Start Libre Hardware Monitor with administrator privileges."""
-        if self.libre_monitor_process is None or self.libre_monitor_process.poll() is not None:
+        """Start Libre Hardware Monitor under the supervisor, which restarts it (with back-off) if it exits."""
+        if not self.supervisor.is_running:
+            print("Starting Libre Hardware Monitor...")
+            self.supervisor.start()
+        elif self.libre_monitor_process.state in (ChildState.STOPPED, ChildState.EXITED, ChildState.FAILED):
             print("Starting Libre Hardware Monitor...")
-            self.libre_monitor_process = subprocess.Popen([self.libre_monitor_path], shell=True)
-            print(f"Libre Hardware Monitor started with PID {self.libre_monitor_process.pid}")
+            self.supervisor.start_child(LHM_CHILD_NAME)
 
     def stop_libre_monitor(self):
         """Stop Libre Hardware Monitor."""
-        if self.libre_monitor_process is not None:
+        if self.supervisor.is_running:
             print("Stopping Libre Hardware Monitor...")
-            self.libre_monitor_process.terminate()
-            self.libre_monitor_process.wait()
+            self.supervisor.stop()
             print("Libre Hardware Monitor stopped.")
-            self.libre_monitor_process = None
 
     def run(self):
         """Main loop that monitors the Python script and Libre Hardware Monitor."""
@@ -61,14 +99,16 @@ class LibreHardwareMonitorWatchdog:
         try:
             with open(log_file, "a") as log:
                 log.write("Starting watchdog...\n")
-                while True:
-                    if self.is_script_running():
-                        self.start_libre_monitor()
-                    else:
+
+                # Restarting LHM is the supervisor's job; this loop only checks whether the script is still around,
+                # and starts LHM once it is.
+                while not self.stopped.is_set():
+                    if not self.is_script_running():
                         log.write(f"{self.script_name} is not running. Exiting...\n")
                         break
 
-                    time.sleep(5)  # Check every 5 seconds
+                    self.start_libre_monitor()
+                    self.stopped.wait(self.check_interval)
         finally:
             with open(log_file, "a") as log:
                 self.stop_libre_monitor()
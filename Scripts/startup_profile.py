@@ -0,0 +1,419 @@
+"""
+Report how long it takes to import Inspy-Hard-Stat modules, module by module.
+
+Each module is imported in a fresh interpreter with ``-X importtime``, so every figure is a cold import. With
+``--budget``, the exit status is 1 when a module takes longer than the budget, so the check can be run in CI.
+
+With ``--benchmark``, the one-shot snapshot command (``inspy-hard-stat snapshot --json``) is also run several times,
+and its wall time and peak resident memory are reported next to those of a bare interpreter; ``--wall-budget`` and
+``--rss-budget`` turn those into checks too.
+
+Usage::
+
+    ihs-startup-profile [MODULE ...] [--top N] [--budget MS]
+    ihs-startup-profile --benchmark [--repeat N] [--wall-budget MS] [--rss-budget MB]
+
+Since:
+    1.0.0
+"""
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+from typing import NamedTuple, Optional, Sequence
+
+
+DEFAULT_MODULES = ('inspy_hard_stat.ihs_lib.process',)
+"""The core sampling API; importing it must stay cheap."""
+
+DEFAULT_TOP = 20
+
+BENCHMARK_COMMAND = (sys.executable, '-m', 'inspy_hard_stat.ihs_lib.snapshot', '--json')
+"""The one-shot snapshot fast path, as run by ``inspy-hard-stat snapshot --json``."""
+
+BASELINE_COMMAND = (sys.executable, '-c', 'pass')
+"""A bare interpreter, for comparison."""
+
+DEFAULT_REPEAT = 5
+
+IMPORT_TIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)\s*$')
+
+
+class ImportTiming(NamedTuple):
+    """
+    One line of ``-X importtime`` output.
+
+    Attributes:
+        module (str):
+            The module imported.
+
+        self_us (int):
+            Microseconds spent importing the module itself.
+
+        cumulative_us (int):
+            Microseconds spent importing the module and everything it imported.
+
+        depth (int):
+            How deeply nested the import was; 0 for imports made directly by the program.
+    """
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> list[ImportTiming]:
+    """
+    Parse the output of ``python -X importtime``.
+
+    Parameters:
+        output (str):
+            The interpreter's standard error.
+
+    Returns:
+        list[ImportTiming]:
+            One entry per imported module, in the order they finished importing. Other lines are ignored.
+    """
+    timings = []
+
+    for line in output.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            timings.append(ImportTiming(module, int(self_us), int(cumulative_us), len(indent) // 2))
+
+    return timings
+
+
+def profile_import(module: str, python: str = sys.executable) -> list[ImportTiming]:
+    """
+    Import a module in a fresh interpreter and time every import it makes.
+
+    Parameters:
+        module (str):
+            The module to import.
+
+        python (str):
+            The interpreter to use. Optional; default is the current one.
+
+    Returns:
+        list[ImportTiming]
+
+    Raises:
+        RuntimeError:
+            Raised when the module fails to import.
+    """
+    result = subprocess.run(
+            [python, '-X', 'importtime', '-c', f'import {module}'],
+            capture_output=True,
+            text=True,
+            )
+
+    if result.returncode:
+        raise RuntimeError(f'Importing {module} failed:\n{result.stderr[-2000:]}')
+
+    return parse_importtime(result.stderr)
+
+
+def total_import_time(module: str, timings: list[ImportTiming]) -> Optional[int]:
+    """
+    Get the cumulative time taken to import a module.
+
+    Parameters:
+        module (str):
+            The module.
+
+        timings (list[ImportTiming]):
+            The timings from :func:`profile_import`.
+
+    Returns:
+        Optional[int]:
+            The time in microseconds, or None if the module does not appear in the timings.
+    """
+    for timing in timings:
+        if timing.module == module and timing.depth == 0:
+            return timing.cumulative_us
+
+    return None
+
+
+def import_tree(module: str, timings: list[ImportTiming]) -> list[ImportTiming]:
+    """
+    Select the timings of a module and everything it imported, leaving out the interpreter's own start-up imports.
+
+    Parameters:
+        module (str):
+            The module.
+
+        timings (list[ImportTiming]):
+            The timings from :func:`profile_import`.
+
+    Returns:
+        list[ImportTiming]
+    """
+    for end, timing in enumerate(timings):
+        if timing.module == module and timing.depth == 0:
+            start = end
+
+            # Nested imports are reported before the module that made them.
+            while start and timings[start - 1].depth > 0:
+                start -= 1
+
+            return timings[start:end + 1]
+
+    return []
+
+
+def report(module: str, timings: list[ImportTiming], top: int = DEFAULT_TOP) -> str:
+    """
+    Format the slowest imports of a module as a table.
+
+    Parameters:
+        module (str):
+            The module that was imported.
+
+        timings (list[ImportTiming]):
+            The timings from :func:`profile_import`.
+
+        top (int):
+            The number of modules to list, slowest (by self time) first. Optional; default is :data:`DEFAULT_TOP`.
+
+    Returns:
+        str
+    """
+    total = total_import_time(module, timings) or 0
+    timings = import_tree(module, timings)
+    lines = [
+            f'{module}: {total / 1000:.1f} ms cold import, {len(timings)} modules',
+            f'{"self ms":>10} {"cumul. ms":>10}  module',
+            ]
+
+    for timing in sorted(timings, key=lambda timing: timing.self_us, reverse=True)[:top]:
+        lines.append(f'{timing.self_us / 1000:>10.1f} {timing.cumulative_us / 1000:>10.1f}  {timing.module}')
+
+    return '\n'.join(lines)
+
+
+class BenchmarkResult(NamedTuple):
+    """
+    Timings of repeated runs of a command.
+
+    Attributes:
+        command (tuple[str, ...]):
+            The command run.
+
+        wall_ms (list[float]):
+            The wall time of each run, in milliseconds.
+
+        peak_rss_kb (list[Optional[int]]):
+            The peak resident memory of each run, in KiB; None where the platform does not report it.
+    """
+    command: tuple
+    wall_ms: list
+    peak_rss_kb: list
+
+    @property
+    def median_wall_ms(self) -> float:
+        """
+        The median wall time, in milliseconds.
+
+        Returns:
+            float
+        """
+        return statistics.median(self.wall_ms)
+
+    @property
+    def max_peak_rss_kb(self) -> Optional[int]:
+        """
+        The largest peak resident memory over the runs, in KiB, or None if it was not reported.
+
+        Returns:
+            Optional[int]
+        """
+        reported = [rss for rss in self.peak_rss_kb if rss is not None]
+
+        return max(reported) if reported else None
+
+
+def run_once(command: Sequence[str]) -> tuple[float, Optional[int]]:
+    """
+    Run a command once, discarding its output, and measure it.
+
+    Parameters:
+        command (Sequence[str]):
+            The command.
+
+    Returns:
+        tuple[float, Optional[int]]:
+            The wall time in milliseconds, and the peak resident memory in KiB (None where :func:`os.wait4` is not
+            available).
+
+    Raises:
+        RuntimeError:
+            Raised when the command exits with a non-zero status.
+    """
+    # stderr goes to a file rather than a pipe: nothing reads a pipe while the child is waited on, so a child that
+    # wrote more than a pipe's buffer would block forever.
+    with tempfile.TemporaryFile() as stderr_file:
+        start = time.perf_counter()
+        process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=stderr_file)
+
+        if hasattr(os, 'wait4'):
+            # wait4 reports the peak memory of this child alone; getrusage(RUSAGE_CHILDREN) would mix in earlier runs.
+            _, status, usage = os.wait4(process.pid, 0)
+            wall_ms = (time.perf_counter() - start) * 1000
+            returncode = os.waitstatus_to_exitcode(status)
+            process.returncode = returncode
+            peak_rss_kb = usage.ru_maxrss // 1024 if sys.platform == 'darwin' else usage.ru_maxrss
+        else:
+            returncode = process.wait()
+            wall_ms = (time.perf_counter() - start) * 1000
+            peak_rss_kb = None
+
+        stderr_file.seek(0)
+        stderr = stderr_file.read().decode(errors='replace')
+
+    if returncode:
+        raise RuntimeError(f'{" ".join(command)} exited with status {returncode}:\n{stderr[-2000:]}')
+
+    return wall_ms, peak_rss_kb
+
+
+def benchmark(command: Sequence[str] = BENCHMARK_COMMAND, repeat: int = DEFAULT_REPEAT) -> BenchmarkResult:
+    """
+    Run a command several times and measure each run.
+
+    Parameters:
+        command (Sequence[str]):
+            The command. Optional; default is :data:`BENCHMARK_COMMAND`.
+
+        repeat (int):
+            The number of runs. Optional; default is :data:`DEFAULT_REPEAT`.
+
+    Returns:
+        BenchmarkResult
+    """
+    runs = [run_once(command) for _ in range(repeat)]
+
+    return BenchmarkResult(tuple(command), [run[0] for run in runs], [run[1] for run in runs])
+
+
+def format_benchmark(result: BenchmarkResult, baseline: Optional[BenchmarkResult] = None) -> str:
+    """
+    Format a benchmark result, optionally next to a baseline.
+
+    Parameters:
+        result (BenchmarkResult):
+            The result.
+
+        baseline (BenchmarkResult):
+            The result for a bare interpreter. Optional.
+
+    Returns:
+        str
+    """
+    def describe(label, measured):
+        rss = measured.max_peak_rss_kb
+        rss_text = f'{rss / 1024:.1f} MiB' if rss is not None else 'n/a'
+
+        return (
+                f'{label:<10} median {measured.median_wall_ms:7.1f} ms  '
+                f'min {min(measured.wall_ms):7.1f} ms  peak RSS {rss_text}'
+                )
+
+    lines = [' '.join(result.command), describe('command', result)]
+
+    if baseline is not None:
+        lines.append(describe('baseline', baseline))
+        lines.append(f'{"overhead":<10} median {result.median_wall_ms - baseline.median_wall_ms:7.1f} ms')
+
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = ArgumentParser(prog='ihs-startup-profile', description='Report cold import times, module by module.')
+    parser.add_argument(
+            'modules',
+            nargs='*',
+            default=list(DEFAULT_MODULES),
+            help=f'The modules to profile. Default: {", ".join(DEFAULT_MODULES)}',
+            )
+    parser.add_argument(
+            '--top',
+            type=int,
+            default=DEFAULT_TOP,
+            help='The number of slowest modules to list for each. Default: %(default)s',
+            )
+    parser.add_argument(
+            '--budget',
+            type=float,
+            default=None,
+            metavar='MS',
+            help='Exit with status 1 if any module takes longer than this many milliseconds to import.',
+            )
+    parser.add_argument(
+            '--benchmark',
+            action='store_true',
+            default=False,
+            help='Also benchmark the one-shot snapshot command: wall time and peak RSS.',
+            )
+    parser.add_argument(
+            '--repeat',
+            type=int,
+            default=DEFAULT_REPEAT,
+            help='The number of benchmark runs. Default: %(default)s',
+            )
+    parser.add_argument(
+            '--wall-budget',
+            type=float,
+            default=None,
+            metavar='MS',
+            help='With --benchmark, exit with status 1 if the median wall time is longer than this.',
+            )
+    parser.add_argument(
+            '--rss-budget',
+            type=float,
+            default=None,
+            metavar='MB',
+            help='With --benchmark, exit with status 1 if the peak RSS is larger than this many MiB.',
+            )
+    args = parser.parse_args(argv)
+
+    over_budget = []
+
+    if args.benchmark:
+        result = benchmark(BENCHMARK_COMMAND, args.repeat)
+        print(format_benchmark(result, benchmark(BASELINE_COMMAND, args.repeat)), end='\n\n')
+
+        if args.wall_budget is not None and result.median_wall_ms > args.wall_budget:
+            over_budget.append(f'snapshot wall time ({result.median_wall_ms:.1f} ms > {args.wall_budget:g} ms)')
+
+        rss = result.max_peak_rss_kb
+
+        if args.rss_budget is not None and rss is not None and rss / 1024 > args.rss_budget:
+            over_budget.append(f'snapshot peak RSS ({rss / 1024:.1f} MiB > {args.rss_budget:g} MiB)')
+
+    for module in args.modules:
+        timings = profile_import(module)
+        print(report(module, timings, args.top), end='\n\n')
+
+        total = total_import_time(module, timings) or 0
+
+        if args.budget is not None and total / 1000 > args.budget:
+            over_budget.append(f'{module} import ({total / 1000:.1f} ms > {args.budget:g} ms)')
+
+    if over_budget:
+        print(f'Over budget: {", ".join(over_budget)}', file=sys.stderr)
+
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,10 +1,202 @@
-from inspyre_toolbox.ver_man import PyPiVersionInfo
-from inspyre_toolbox.ver_man.helpers import get_version_from_file
+"""
+Version information for Inspy-Hard-Stat.
+
+The version is read from the bundled ``VERSION`` file; importing this module never touches the network. Checking PyPI
+for a newer release only happens when :func:`check_for_updates` is called (``--check-updates`` on the command line),
+and its result is cached on disk for :data:`UPDATE_CHECK_TTL` seconds, so hosts without network access pay for at most
+one timeout per day.
+
+``VERSION_INFO`` (a parsed version object) and ``PYPI_VERSION_INFO`` (a live
+:class:`~inspyre_toolbox.ver_man.PyPiVersionInfo`, which queries PyPI when created) are still available, but are only
+built when first accessed (PEP 562).
+
+Attributes:
+    VERSION (str):
+        The version of this package, as written in the ``VERSION`` file.
+
+Classes:
+    UpdateCheck:
+        The result of checking PyPI for a newer release.
+
+Functions:
+    check_for_updates(force=False, ttl=UPDATE_CHECK_TTL, timeout=UPDATE_CHECK_TIMEOUT):
+        Check PyPI for a newer release, using the cached result when it is recent enough.
+
+Since:
+    1.0.0
+"""
+import json
+import time
 from pathlib import Path
+from typing import NamedTuple, Optional
+
 
+PACKAGE_NAME = 'inspy-hard-stat'
 
 VERSION_FILE_PATH = Path(__file__).parent.joinpath('VERSION')
 
-VERSION_INFO = get_version_from_file(VERSION_FILE_PATH)
+VERSION = VERSION_FILE_PATH.read_text(encoding='utf-8').strip()
+
+PYPI_JSON_URL = f'https://pypi.org/pypi/{PACKAGE_NAME}/json'
+
+UPDATE_CHECK_CACHE_FILE_NAME = 'pypi_version.json'
+
+UPDATE_CHECK_TTL = 24 * 60 * 60
+"""Seconds a PyPI check result is reused before PyPI is asked again."""
+
+UPDATE_CHECK_TIMEOUT = 5.0
+
+
+class UpdateCheck(NamedTuple):
+    """
+    The result of checking PyPI for a newer release.
+
+    Attributes:
+        installed (str):
+            The version of this package.
+
+        latest (Optional[str]):
+            The latest release on PyPI, or None if PyPI could not be reached and nothing was cached.
+
+        checked_at (float):
+            When PyPI was last asked, as a UNIX timestamp; 0 if it never answered.
+
+        from_cache (bool):
+            Whether the result came from the on-disk cache.
+    """
+    installed: str
+    latest: Optional[str]
+    checked_at: float
+    from_cache: bool
+
+    @property
+    def update_available(self) -> bool:
+        """
+        Whether the latest release on PyPI is newer than this package.
+
+        Returns:
+            bool
+        """
+        if not self.latest:
+            return False
+
+        try:
+            from packaging.version import InvalidVersion, Version
+        except ImportError:
+            return self.latest != self.installed
+
+        try:
+            return Version(self.latest) > Version(self.installed)
+        except InvalidVersion:
+            return self.latest != self.installed
+
+    def __str__(self):
+        if not self.latest:
+            return f'{PACKAGE_NAME} {self.installed} (could not check PyPI for updates)'
+
+        if self.update_available:
+            return f'{PACKAGE_NAME} {self.installed} (version {self.latest} is available on PyPI)'
+
+        return f'{PACKAGE_NAME} {self.installed} (up to date)'
+
+
+def get_update_check_cache_path() -> Path:
+    """
+    Get the path of the file caching the last PyPI check.
+
+    Returns:
+        Path
+    """
+    from inspy_hard_stat.config.constants import FILE_SYSTEM_DEFAULTS
+
+    return Path(FILE_SYSTEM_DEFAULTS['dirs']['cache']) / UPDATE_CHECK_CACHE_FILE_NAME
+
+
+def _read_update_cache() -> Optional[dict]:
+    try:
+        cached = json.loads(get_update_check_cache_path().read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+
+    return cached if isinstance(cached, dict) else None
+
+
+def check_for_updates(
+        force: bool = False,
+        ttl: float = UPDATE_CHECK_TTL,
+        timeout: float = UPDATE_CHECK_TIMEOUT,
+        ) -> UpdateCheck:
+    """
+    Check PyPI for a newer release, using the cached result when it is recent enough.
+
+    Parameters:
+        force (bool):
+            If True, ask PyPI even if the cached result is recent. Optional; default is False.
+
+        ttl (float):
+            The age, in seconds, after which the cached result is no longer used. Optional; default is
+            :data:`UPDATE_CHECK_TTL`.
+
+        timeout (float):
+            Seconds to wait for PyPI. Optional; default is :data:`UPDATE_CHECK_TIMEOUT`.
+
+    Returns:
+        UpdateCheck:
+            The result. If PyPI cannot be reached, the cached result is returned however old it is, or a result with
+            no latest version if nothing is cached. Failed attempts are cached too, so an offline host does not wait
+            for the timeout on every call.
+    """
+    cached = _read_update_cache()
+    now = time.time()
+
+    if cached and not force and now - cached.get('attempted_at', 0) < ttl:
+        return UpdateCheck(VERSION, cached.get('latest'), cached.get('checked_at', 0), True)
+
+    import requests
+
+    try:
+        response = requests.get(PYPI_JSON_URL, timeout=timeout)
+        response.raise_for_status()
+        latest = response.json()['info']['version']
+    except (requests.RequestException, ValueError, KeyError):
+        latest = None
+
+    if latest:
+        result = UpdateCheck(VERSION, latest, now, False)
+    elif cached:
+        result = UpdateCheck(VERSION, cached.get('latest'), cached.get('checked_at', 0), True)
+    else:
+        result = UpdateCheck(VERSION, None, 0, False)
+
+    try:
+        from inspy_hard_stat.config.utils import atomic_write_text
+
+        cache_path = get_update_check_cache_path()
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(
+                cache_path,
+                json.dumps({'latest': result.latest, 'checked_at': result.checked_at, 'attempted_at': now}),
+                )
+    except OSError:
+        pass
+
+    return result
+
+
+def __getattr__(name):
+    if name == 'VERSION_INFO':
+        from inspyre_toolbox.ver_man.helpers import get_version_from_file
+
+        value = get_version_from_file(VERSION_FILE_PATH)
+    elif name == 'PYPI_VERSION_INFO':
+        from inspyre_toolbox.ver_man import PyPiVersionInfo
+
+        value = PyPiVersionInfo(PACKAGE_NAME)
+    elif name == 'PyPiVersionInfo':
+        from inspyre_toolbox.ver_man import PyPiVersionInfo as value
+    else:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    globals()[name] = value
 
-PYPI_VERSION_INFO = PyPiVersionInfo('inspy-hard-stat')
+    return value
@@ -1,34 +1,46 @@
-import os
+from pathlib import Path
 from warnings import warn
-import shutil
 from inspy_hard_stat.log_engine import ROOT_LOGGER as PARENT_LOGGER
 
 APP_LOGGER = PARENT_LOGGER.get_child('IHSConfigRestore')
 from inspy_hard_stat.apps.backup_restore.errors import NoConfigSystemSelectedError, NoBackupSelectedError
 from inspy_hard_stat.apps.backup_restore.ui.dialogs import BackupSelectionDialog, SystemSelectionDialog
-from inspy_hard_stat.apps.backup_restore.utils import find_backups, BACKUP_DIR
+from inspy_hard_stat.apps.backup_restore.constants import MORE_BACKUPS, PAGE_SIZE
+from inspy_hard_stat.apps.backup_restore.utils import backup_choices, find_backups, get_backup_catalog, BACKUP_DIR
 
 
-def restore_backup(backup_folder, original_folder, selected_backup):
-    src_path = os.path.join(backup_folder, selected_backup)
-    config_name = f'{selected_backup.split("_")[0]}.ini'
-    dest_path = os.path.join(original_folder, config_name)
-    shutil.copy(src_path, dest_path)
-    print(f'Restored {config_name} from {selected_backup}')
+def restore_backup(catalog, original_folder, selected_backup):
+    """
+    Restore a backup over its configuration file.
+
+    Parameters:
+        catalog (BackupStore):
+            The store holding the backup.
+
+        original_folder (Union[str, Path]):
+            The configuration folder; used when the record does not say which file was backed up.
+
+        selected_backup (BackupRecord):
+            The backup to restore.
+    """
+    dest_path = Path(selected_backup.source or Path(original_folder, f'{selected_backup.system}.ini'))
+    catalog.restore(selected_backup, dest_path)
+    print(f'Restored {dest_path.name} from the backup taken {selected_backup.readable_time}')
 
 
 
 def main():
     """Restore a configuration backup."""
 
-    backups = find_backups()
+    catalog = get_backup_catalog()
+    systems = catalog.systems()
 
-    if not backups:
+    if not systems:
 
         print("No backups found.")
         return
 
-    system_select_dialog = SystemSelectionDialog(backups)
+    system_select_dialog = SystemSelectionDialog(dict.fromkeys(systems))
 
     selected_system = system_select_dialog.run()
 
@@ -37,15 +49,27 @@ def main():
         raise NoConfigSystemSelectedError('User left dialog without making a selection.')
 
 
-    config_file_select_dialog = BackupSelectionDialog(backups[selected_system])
+    # Backups are read from the catalog a page at a time, newest first; 'More...' lists the next page.
+    choices = {}
+    offset = 0
+
+    while True:
+        page = catalog.page(selected_system, offset, PAGE_SIZE + 1)
+        choices.update(backup_choices(page[:PAGE_SIZE]))
+
+        config_file_select_dialog = BackupSelectionDialog(choices, more=len(page) > PAGE_SIZE)
+        selected_config_file = config_file_select_dialog.run()
+
+        if selected_config_file != MORE_BACKUPS:
+            break
 
-    selected_config_file = config_file_select_dialog.run()
+        offset += PAGE_SIZE
 
     if not selected_config_file:
         warn('User did not select a configuration-file backup to restore.')
         raise NoBackupSelectedError('User left dialog without making a selection.')
 
-    restore_backup(BACKUP_DIR, BACKUP_DIR.parent, selected_config_file)
+    restore_backup(catalog, BACKUP_DIR.parent, selected_config_file)
 
 if __name__ == "__main__":
     main()
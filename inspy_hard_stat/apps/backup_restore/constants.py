@@ -3,3 +3,9 @@ from inspy_hard_stat.ihs_lib.libre_hw_monitor.config import CONFIG
 
 
 BACKUP_DIR = CONFIG.config_dir_path.joinpath('backups')
+
+PAGE_SIZE = 20
+"""The number of backups listed at a time in the backup selection dialog."""
+
+MORE_BACKUPS = '__more__'
+"""The value of the dialog choice that lists the next page of backups."""
@@ -1,5 +1,6 @@
 from prompt_toolkit.shortcuts.dialogs import yes_no_dialog, radiolist_dialog
 
+from inspy_hard_stat.apps.backup_restore.constants import MORE_BACKUPS
 from inspy_hard_stat.apps.backup_restore.ui.dialogs.constants import (DEFAULT_DIALOG_STYLE as DIALOG_STYLE,
                                                                       DEFAULT_WARNING_STYLE as WARNING_STYLE)
 from inspy_hard_stat.apps.backup_restore.ui.dialogs.utils import loop_radio_list
@@ -28,6 +29,9 @@ class BackupSelectionDialog(Loggable):
         backup_dict (dict):
             The backup dictionary.
 
+        more (bool):
+            Whether there are more backups than are listed.
+
         burned (bool):
             Whether the dialog has been burned.
 
@@ -45,17 +49,22 @@ class BackupSelectionDialog(Loggable):
             'No backup selected',
             text='You have not selected a config for restoration. Would you like to exit?'
             )
-    def __init__(self, backup_dict):
+    def __init__(self, backup_dict, more=False):
         """
         Initialize the dialog.
 
         Parameters:
             backup_dict (dict):
                 The backup dictionary.
+
+            more (bool):
+                If True, a 'More...' choice is added; selecting it answers :data:`MORE_BACKUPS`. Optional; default is
+                False.
         """
         super().__init__(parent_log_device=MOD_LOGGER)
-        self.class_logger.debug(f'Received backup_dict for config system; {backup_dict}')
+        self.class_logger.debug(f'Received {len(backup_dict)} backups for config system.')
         self.backup_dict = backup_dict
+        self.more = more
 
         self.__burned = False
         self.__answer = None
@@ -121,6 +130,9 @@ class BackupSelectionDialog(Loggable):
         for file, name in self.backup_dict.items():
             yield (file, name)
 
+        if self.more:
+            yield (MORE_BACKUPS, 'More...')
+
     def __run(self):
         """
         Run the dialog.
@@ -1,24 +1,55 @@
-import os
-import re
-from datetime import datetime
-from inspy_hard_stat.apps.backup_restore.constants import BACKUP_DIR
-
-
-def find_backups(backup_folder=BACKUP_DIR):
-
-    backup_files = os.listdir(backup_folder)
-    backup_dict = {}
-
-    for file in backup_files:
-        match = re.match(r'(\w+)_(\d{8})_(\d{6}).bak', file)
-        if match:
-            config_name = match.group(1)
-            date_str = match.group(2)
-            time_str = match.group(3)
-            timestamp = datetime.strptime(date_str + time_str, '%Y%m%d%H%M%S')
-            readable_time = timestamp.strftime('%Y-%m-%d %H:%M:%S')
-            if config_name not in backup_dict:
-                backup_dict[config_name] = {}
-            backup_dict[config_name][file] = f"{config_name} - {readable_time}"
-
-    return backup_dict
+from inspy_hard_stat.apps.backup_restore.constants import BACKUP_DIR, PAGE_SIZE
+from inspy_hard_stat.config.backups import get_backup_store
+
+
+def get_backup_catalog(backup_folder=BACKUP_DIR):
+    """
+    Get the backup store for a folder, to browse its index, importing any backup files written by older versions first.
+    The folder is only searched for them the first time.
+
+    Parameters:
+        backup_folder (Union[str, Path]):
+            The backup folder. Optional; default is :data:`BACKUP_DIR`.
+
+    Returns:
+        BackupStore
+    """
+    catalog = get_backup_store(backup_folder)
+    catalog.import_legacy(once=True)
+
+    return catalog
+
+
+def backup_choices(records):
+    """
+    Label backup records for display.
+
+    Parameters:
+        records (Iterable[BackupRecord]):
+            The records.
+
+    Returns:
+        dict:
+            Each record mapped to its label.
+    """
+    return {record: f'{record.system} - {record.readable_time}' for record in records}
+
+
+def find_backups(backup_folder=BACKUP_DIR, limit=PAGE_SIZE):
+    """
+    Find the most recent backups of each configuration system.
+
+    Parameters:
+        backup_folder (Union[str, Path]):
+            The backup folder. Optional; default is :data:`BACKUP_DIR`.
+
+        limit (int):
+            The largest number of backups to list for each system. Optional; default is :data:`PAGE_SIZE`.
+
+    Returns:
+        dict:
+            For each configuration system, its backup records (newest first) mapped to their labels.
+    """
+    catalog = get_backup_catalog(backup_folder)
+
+    return {system: backup_choices(catalog.page(system, 0, limit)) for system in catalog.systems()}
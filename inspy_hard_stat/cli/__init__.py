@@ -1,4 +1,24 @@
-from inspy_hard_stat.log_engine import ROOT_LOGGER as PARENT_LOGGER
+"""
+The command-line interface.
 
+Importing this package is cheap: :data:`MOD_LOGGER` is provided lazily (PEP 562), so the sub-command registry in
+:mod:`inspy_hard_stat.cli.subcommands` can be consulted without loading the logger.
 
-MOD_LOGGER = PARENT_LOGGER.get_child('cli')
+Attributes:
+    MOD_LOGGER:
+        The logger for this package.
+
+Since:
+    1.0.0
+"""
+
+
+def __getattr__(name):
+    if name == 'MOD_LOGGER':
+        from inspy_hard_stat.log_engine import ROOT_LOGGER as PARENT_LOGGER
+
+        value = globals()[name] = PARENT_LOGGER.get_child('cli')
+
+        return value
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
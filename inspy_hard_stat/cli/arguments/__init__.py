@@ -1,10 +1,11 @@
 from argparse import ArgumentParser, Namespace
 from inspy_hard_stat.log_engine import LOG_LEVELS
-from inspy_hard_stat.about.version import PYPI_VERSION_INFO, PyPiVersionInfo
+from inspy_hard_stat.about.version import VERSION
 from inspyre_toolbox.syntactic_sweets.classes.decorators.type_validation import validate_type
 from inspy_hard_stat.cli.arguments.meta import SingletonMeta
-from inspy_hard_stat.cli.arguments.utils import is_argument_registered
-from inspy_hard_stat.config.developer import DEV_MODE
+from inspy_hard_stat.cli.arguments.utils import CheckForUpdatesAction, is_argument_registered
+from inspy_hard_stat.cli.subcommands import add_subcommand_placeholders, parse_with_subcommands
+from inspy_hard_stat.cli.subcommands.base import BaseSubcommand
 
 
 class IHSParser(metaclass=SingletonMeta):
@@ -16,6 +17,7 @@ class IHSParser(metaclass=SingletonMeta):
     def __init__(self, prog: str, description: str):
         self.parser = ArgumentParser(prog=prog, description=description)
         self.subparsers = None
+        self._subcommand_registry = None
         self._configured = False
         self.register_core_arguments()
 
@@ -28,6 +30,21 @@ class IHSParser(metaclass=SingletonMeta):
                     )
         return self.parser
 
+    def add_subcommands(self, registry=None):
+        """
+        Add the registered sub-commands. Only their names and help text are loaded; a sub-command's module is imported
+        when it is selected.
+
+        Parameters:
+            registry (dict):
+                The sub-command registry. Optional; default is
+                :data:`~inspy_hard_stat.cli.subcommands.SUBCOMMANDS`.
+        """
+        if self.subparsers is None:
+            self.subparsers = self.parser.add_subparsers(dest='subcommand', title='Sub-Commands')
+            self._subcommand_registry = registry
+            add_subcommand_placeholders(self.subparsers, registry)
+
     def register_arguments(self, register_func):
         """Register arguments by passing a function that configures the parser."""
         if not self._configured:
@@ -45,7 +62,13 @@ class IHSParser(metaclass=SingletonMeta):
         self.parser.add_argument(
                 '-V', '--version',
                 action='version',
-                version=str(PYPI_VERSION_INFO)
+                version=f'%(prog)s {VERSION}'
+                )
+
+        self.parser.add_argument(
+                '--check-updates',
+                action=CheckForUpdatesAction,
+                help='Check PyPI for a newer release and exit.'
                 )
 
         self.parser.add_argument(
@@ -74,6 +97,9 @@ class IHSParser(metaclass=SingletonMeta):
 
     def parse_args(self) -> Namespace:
         """Parse the command-line arguments and return the result."""
+        if self.subparsers is not None:
+            return parse_with_subcommands(self.parser, self.subparsers, registry=self._subcommand_registry)
+
         return self.parser.parse_args()
 
 
@@ -82,21 +108,6 @@ def build_main_parser(parser: ArgumentParser) -> IHSParser:
 
 
 
-class BaseSubcommand:
-    """
-    Base class for subcommands.
-    Each subclass should implement the 'add_subcommand' method.
-    """
-
-    def __init__(self, subparsers):
-        self.subparsers = subparsers
-        self.add_subcommand()
-
-    def add_subcommand(self):
-        """Method to be overridden by subclasses to add their specific subcommand."""
-        raise NotImplementedError("Subclasses must implement this method.")
-
-
 class ParsedArgs:
     """
     A class to handle argument parsing for the Inspy-Hard-Stat command-line tool.
@@ -106,10 +117,9 @@ class ParsedArgs:
             An argument parser for the command-line interface.
     """
 
-    DEVELOPER_MODE = DEV_MODE
     VALID_LOG_LEVELS = LOG_LEVELS + [level.lower() for level in LOG_LEVELS]
 
-    def __init__(self, prog, description, ver_obj):
+    def __init__(self, prog, description, ver_obj=None, args=None):
         """
         Instantiate the argument parser.
 
@@ -120,30 +130,53 @@ class ParsedArgs:
             description (str):
                 A description of the program.
 
-            ver_obj (PyPiVersionInfo):
-                An object representing the version information.
+            ver_obj (Optional[object]):
+                An object representing the version information. Optional; default is the version in the bundled
+                ``VERSION`` file.
+
+            args (Optional[Sequence[str]]):
+                The arguments to parse. Optional; default is ``sys.argv[1:]``.
 
         Properties:
             parser (ArgumentParser):
                 A prepared :class:`argparse.ArgumentParser` object.
         """
+        self.__args = args
         self.__parsed = None
         self.__parser = None
 
-        self.parser = ArgumentParser(prog, description)
+        self.__dev_mode_handled = False
+
+        self.parser = ArgumentParser(prog=prog, description=description)
         self.__subcommands = self.parser.add_subparsers(dest='subcommand', title='Sub-Commands')
 
         self.register_core_arguments(ver_obj)
         self.load_subcommands()
-        self.handle_dev_mode()
+
+    @property
+    def DEVELOPER_MODE(self):
+        """
+        The developer-mode object; imported on first access rather than when the parser is built.
+
+        Returns:
+            DeveloperMode
+        """
+        from inspy_hard_stat.config.developer import DEV_MODE
+
+        return DEV_MODE
 
     def handle_dev_mode(self):
         """
-        Handle the developer mode arguments.
+        Handle the developer mode arguments. Called once, just before the command line is parsed.
 
         Returns:
             None
         """
+        if self.__dev_mode_handled:
+            return
+
+        self.__dev_mode_handled = True
+
         if self.DEVELOPER_MODE.is_enabled:
             self.DEVELOPER_MODE.args_parser = self
             self.DEVELOPER_MODE.add_developer_commands_to_parser(self.parser)
@@ -158,7 +191,8 @@ class ParsedArgs:
                 The parsed command-line arguments.
         """
         if self.__parsed is None:
-            self.__parsed = self.parser.parse_args()
+            self.handle_dev_mode()
+            self.__parsed = parse_with_subcommands(self.parser, self.__subcommands, self.__args)
         return self.__parsed
 
     @property
@@ -187,13 +221,14 @@ class ParsedArgs:
         """
         return self.parsed_args
 
-    def register_core_arguments(self, ver_obj: PyPiVersionInfo):
+    def register_core_arguments(self, ver_obj=None):
         """
         Register the core arguments for the argument parser.
 
         Parameters:
-            ver_obj (PyPiVersionInfo):
-                An object representing the version information.
+            ver_obj (Optional[object]):
+                An object representing the version information. Optional; default is the version in the bundled
+                ``VERSION`` file.
 
         Returns:
             None
@@ -204,7 +239,13 @@ class ParsedArgs:
             default='info'
         )
 
-        self.parser.add_argument('-V', '--version', action='version', version=str(ver_obj))
+        self.parser.add_argument('-V', '--version', action='version', version=f'%(prog)s {ver_obj or VERSION}')
+
+        self.parser.add_argument(
+            '--check-updates',
+            action=CheckForUpdatesAction,
+            help='Check PyPI for a newer release and exit.'
+        )
 
         self.parser.add_argument(
             '-C', '--config-filepath',
@@ -232,25 +273,14 @@ class ParsedArgs:
 
     def load_subcommands(self):
         """
-        Create sub-commands for the passed :class:`argparse.ArgumentParser` object.
-
-        Returns:
-            ArgumentParser:
-                The same object that was passed but with the following sub-commands:
+        Add the registered sub-commands (see :mod:`inspy_hard_stat.cli.subcommands`) to the parser.
 
-                - get-public:
-                    Return the external IP to the command-line and nothing else.
+        Only each sub-command's name and help text are added here; its module is imported, and its arguments added,
+        when it is selected on the command line. The parser therefore costs the same to build however many
+        sub-commands are registered.
 
-                - get-host:
-                    Return the hostname to the command-line and nothing else.
-
-                - get-local:
-                    Return the local IP-Address to the command-line and nothing else.
-
-                - get-all:
-                    Return the public IP, private IP, and hostname to the command-line and immediately exit.
-
-                - print-version-info:
-                    Print a pretty table of the version information for this program.
+        Returns:
+            dict[str, ArgumentParser]:
+                The placeholder sub-parsers, by sub-command name.
         """
-        self.parser.add_subparsers()
+        return add_subcommand_placeholders(self.__subcommands)
@@ -1,6 +1,9 @@
 """
 Utility functions for working with argparse arguments.
 
+Classes:
+    CheckForUpdatesAction
+
 Functions:
     is_argument_registered
 
@@ -8,7 +11,25 @@ Since:
     1.0.0
 """
 
-from argparse import ArgumentParser
+from argparse import Action, ArgumentParser, SUPPRESS
+
+
+class CheckForUpdatesAction(Action):
+    """
+    An argparse action that checks PyPI for a newer release, prints the result and exits.
+
+    The check is only made when the option is given; see
+    :func:`~inspy_hard_stat.about.version.check_for_updates` for how results are cached.
+    """
+
+    def __init__(self, option_strings, dest=SUPPRESS, default=SUPPRESS, help=None):
+        super().__init__(option_strings=option_strings, dest=dest, default=default, nargs=0, help=help)
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        from inspy_hard_stat.about.version import check_for_updates
+
+        parser.exit(message=f'{check_for_updates()}\n')
+
 
 def is_argument_registered(parser: ArgumentParser, argument: str) -> bool:
     """
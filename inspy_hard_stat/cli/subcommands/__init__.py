@@ -0,0 +1,261 @@
+"""
+The registry of command-line sub-commands.
+
+Each sub-command is registered by name, with its help text and the location (``'package.module:ClassName'``) of its
+:class:`~inspy_hard_stat.cli.subcommands.base.BaseSubcommand` subclass. Building the parser only adds a placeholder
+sub-parser per entry, so ``--help`` and ``--version`` cost the same however many sub-commands there are; a
+sub-command's module is imported only when that sub-command is selected on the command line.
+
+A sub-command may also name a fast path: a lightweight module whose ``main(argv)`` runs it without the rest of the
+command-line interface. The ``inspy-hard-stat`` entry point uses it, when given, to skip building the full parser.
+
+Classes:
+    SubcommandSpec:
+        One entry in the registry.
+
+Functions:
+    register_subcommand(name, help, target, aliases=(), fast_path=None):
+        Add a sub-command to the registry.
+
+    find_subcommand(name, registry=None):
+        Look up a registered sub-command by name or alias.
+
+    load_subcommand(name):
+        Import a registered sub-command's class.
+
+    add_subcommand_placeholders(subparsers, registry=None):
+        Add a placeholder sub-parser for every registered sub-command.
+
+    parse_with_subcommands(parser, subparsers, args=None, registry=None):
+        Parse the command line, loading only the selected sub-command.
+
+Since:
+    1.0.0
+"""
+from argparse import ArgumentParser, Namespace
+from importlib import import_module
+from typing import NamedTuple, Optional, Sequence
+
+
+class SubcommandSpec(NamedTuple):
+    """
+    One entry in the sub-command registry.
+
+    Attributes:
+        name (str):
+            The name typed on the command line.
+
+        help (str):
+            The help text shown in the top-level ``--help``.
+
+        target (str):
+            Where the sub-command's class lives, as ``'package.module:ClassName'``.
+
+        aliases (tuple[str, ...]):
+            Other names for the sub-command.
+
+        fast_path (Optional[str]):
+            A module whose ``main(argv)`` runs the sub-command without the rest of the command-line interface, if
+            there is one.
+    """
+    name: str
+    help: str
+    target: str
+    aliases: tuple = ()
+    fast_path: Optional[str] = None
+
+
+SUBCOMMANDS = {}
+"""The registered sub-commands, by name."""
+
+DEFAULT_SUBCOMMAND = 'daemon'
+"""The sub-command ``inspy-hard-stat`` runs when none is given."""
+
+
+def register_subcommand(
+        name: str,
+        help: str,
+        target: str,
+        aliases: Sequence[str] = (),
+        fast_path: Optional[str] = None,
+        ) -> SubcommandSpec:
+    """
+    Add a sub-command to the registry. Nothing is imported.
+
+    Parameters:
+        name (str):
+            The name typed on the command line.
+
+        help (str):
+            The help text.
+
+        target (str):
+            Where the sub-command's class lives, as ``'package.module:ClassName'``.
+
+        aliases (Sequence[str]):
+            Other names for the sub-command. Optional.
+
+        fast_path (str):
+            A module whose ``main(argv)`` runs the sub-command on its own. Optional.
+
+    Returns:
+        SubcommandSpec
+
+    Raises:
+        ValueError:
+            Raised when ``target`` is not of the form ``'module:attribute'``.
+    """
+    if target.count(':') != 1:
+        raise ValueError(f"Sub-command target must be 'module:attribute', not {target!r}")
+
+    spec = SUBCOMMANDS[name] = SubcommandSpec(name, help, target, tuple(aliases), fast_path)
+
+    return spec
+
+
+def find_subcommand(name: str, registry: Optional[dict] = None) -> Optional[SubcommandSpec]:
+    """
+    Look up a registered sub-command by name or alias. Nothing is imported.
+
+    Parameters:
+        name (str):
+            The sub-command's name or one of its aliases.
+
+        registry (dict):
+            The registry to look in. Optional; default is :data:`SUBCOMMANDS`.
+
+    Returns:
+        Optional[SubcommandSpec]:
+            The sub-command, or None if none of that name is registered.
+    """
+    registry = SUBCOMMANDS if registry is None else registry
+
+    for spec in registry.values():
+        if name == spec.name or name in spec.aliases:
+            return spec
+
+    return None
+
+
+def load_subcommand(name: str, registry: Optional[dict] = None) -> type:
+    """
+    Import a registered sub-command's class.
+
+    Parameters:
+        name (str):
+            The sub-command's name or one of its aliases.
+
+        registry (dict):
+            The registry to look in. Optional; default is :data:`SUBCOMMANDS`.
+
+    Returns:
+        type:
+            The :class:`~inspy_hard_stat.cli.subcommands.base.BaseSubcommand` subclass.
+
+    Raises:
+        KeyError:
+            Raised when no sub-command of that name is registered.
+    """
+    spec = find_subcommand(name, registry)
+
+    if spec is None:
+        raise KeyError(name)
+
+    module_name, attribute = spec.target.split(':')
+
+    return getattr(import_module(module_name), attribute)
+
+
+def add_subcommand_placeholders(subparsers, registry: Optional[dict] = None) -> dict[str, ArgumentParser]:
+    """
+    Add a placeholder sub-parser for every registered sub-command.
+
+    The placeholders carry only the name and help text, and accept any arguments; :func:`parse_with_subcommands` fills
+    in the selected one.
+
+    Parameters:
+        subparsers:
+            The object returned by :meth:`ArgumentParser.add_subparsers`.
+
+        registry (dict):
+            The registry to use. Optional; default is :data:`SUBCOMMANDS`.
+
+    Returns:
+        dict[str, ArgumentParser]:
+            The placeholders, by sub-command name.
+    """
+    registry = SUBCOMMANDS if registry is None else registry
+
+    return {
+            spec.name: subparsers.add_parser(spec.name, help=spec.help, aliases=list(spec.aliases), add_help=False)
+            for spec in registry.values()
+            }
+
+
+def parse_with_subcommands(
+        parser: ArgumentParser,
+        subparsers,
+        args: Optional[Sequence[str]] = None,
+        registry: Optional[dict] = None,
+        ) -> Namespace:
+    """
+    Parse the command line, importing only the selected sub-command.
+
+    The command line is parsed twice: first against the placeholders, to find out which sub-command (if any) was
+    given; then, once that sub-command's class has configured its parser, in full.
+
+    Parameters:
+        parser (ArgumentParser):
+            The top-level parser.
+
+        subparsers:
+            The object returned by :meth:`ArgumentParser.add_subparsers`, with placeholders added by
+            :func:`add_subcommand_placeholders`.
+
+        args (Sequence[str]):
+            The arguments to parse. Optional; default is ``sys.argv[1:]``.
+
+        registry (dict):
+            The registry to use. Optional; default is :data:`SUBCOMMANDS`.
+
+    Returns:
+        Namespace:
+            The parsed arguments. If a sub-command was selected, ``subcommand_handler`` is set to its ``run`` method.
+    """
+    known, _ = parser.parse_known_args(args)
+    selected = getattr(known, subparsers.dest, None) if subparsers.dest else None
+
+    if selected:
+        subparser = subparsers.choices[selected]
+        subparser.add_argument('-h', '--help', action='help', help='show this help message and exit')
+        load_subcommand(selected, registry)(parser=subparser)
+
+    return parser.parse_args(args)
+
+
+register_subcommand(
+        'version',
+        'Print the version, optionally checking PyPI for a newer release.',
+        'inspy_hard_stat.cli.subcommands.version:VersionSubcommand',
+        )
+
+register_subcommand(
+        'snapshot',
+        'Print one system snapshot and exit.',
+        'inspy_hard_stat.cli.subcommands.snapshot:SnapshotSubcommand',
+        fast_path='inspy_hard_stat.ihs_lib.snapshot',
+        )
+
+register_subcommand(
+        'sample',
+        'Stream samples to standard output as NDJSON.',
+        'inspy_hard_stat.cli.subcommands.sample:SampleSubcommand',
+        fast_path='inspy_hard_stat.ihs_lib.sampler',
+        )
+
+register_subcommand(
+        'daemon',
+        'Run the monitoring daemon, sending readings to sinks until stopped.',
+        'inspy_hard_stat.cli.subcommands.daemon:DaemonSubcommand',
+        fast_path='inspy_hard_stat.ihs_lib.daemon.daemon',
+        )
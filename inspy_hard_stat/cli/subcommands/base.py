@@ -1,13 +1,47 @@
 class BaseSubcommand:
     """
     Base class for subcommands.
-    Each subclass should implement the 'add_subcommand' method.
+
+    A subcommand either adds its own parser to a set of sub-parsers (``BaseSubcommand(subparsers)``, which calls
+    :meth:`add_subcommand`), or fills in a parser made for it by the registry (``BaseSubcommand(parser=parser)``, see
+    :mod:`inspy_hard_stat.cli.subcommands`). Either way, :meth:`configure` adds the arguments, and :meth:`run` is set
+    as the parsed arguments' ``subcommand_handler``.
     """
+    name = None
+    help = None
 
-    def __init__(self, subparsers):
+    def __init__(self, subparsers=None, parser=None):
         self.subparsers = subparsers
-        self.add_subcommand()
+        self.parser = parser
+
+        if parser is None:
+            self.add_subcommand()
+        else:
+            self.configure(parser)
+            parser.set_defaults(subcommand_handler=self.run)
 
     def add_subcommand(self):
-        """Method to be overridden by subclasses to add their specific subcommand."""
+        """Add this subcommand's parser to :attr:`subparsers` and configure it."""
+        if self.name is None:
+            raise NotImplementedError("Subclasses must set 'name' or implement this method.")
+
+        self.parser = self.subparsers.add_parser(self.name, help=self.help)
+        self.configure(self.parser)
+        self.parser.set_defaults(subcommand_handler=self.run)
+
+    def configure(self, parser):
+        """Method to be overridden by subclasses to add their arguments to the parser."""
+
+    def run(self, args):
+        """
+        Method to be overridden by subclasses to carry out the subcommand.
+
+        Parameters:
+            args (Namespace):
+                The parsed command-line arguments.
+
+        Returns:
+            Optional[int]:
+                The exit status.
+        """
         raise NotImplementedError("Subclasses must implement this method.")
@@ -0,0 +1,26 @@
+"""
+The ``daemon`` sub-command.
+
+Classes:
+    DaemonSubcommand:
+        Run the monitoring daemon.
+
+Since:
+    1.0.0
+"""
+from inspy_hard_stat.cli.subcommands.base import BaseSubcommand
+from inspy_hard_stat.ihs_lib.daemon.daemon import add_daemon_arguments, run_daemon
+
+
+class DaemonSubcommand(BaseSubcommand):
+    """
+    Run the monitoring daemon, sending readings to sinks until stopped.
+    """
+    name = 'daemon'
+    help = 'Run the monitoring daemon, sending readings to sinks until stopped.'
+
+    def configure(self, parser):
+        add_daemon_arguments(parser)
+
+    def run(self, args):
+        return run_daemon(args)
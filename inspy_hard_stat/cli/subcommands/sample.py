@@ -0,0 +1,26 @@
+"""
+The ``sample`` sub-command.
+
+Classes:
+    SampleSubcommand:
+        Stream samples to standard output as NDJSON.
+
+Since:
+    1.0.0
+"""
+from inspy_hard_stat.cli.subcommands.base import BaseSubcommand
+from inspy_hard_stat.ihs_lib.sampler import add_sample_arguments, run_sampler
+
+
+class SampleSubcommand(BaseSubcommand):
+    """
+    Stream samples to standard output as NDJSON.
+    """
+    name = 'sample'
+    help = 'Stream samples to standard output as NDJSON.'
+
+    def configure(self, parser):
+        add_sample_arguments(parser)
+
+    def run(self, args):
+        return run_sampler(args)
@@ -0,0 +1,26 @@
+"""
+The ``snapshot`` sub-command.
+
+Classes:
+    SnapshotSubcommand:
+        Print one system snapshot and exit.
+
+Since:
+    1.0.0
+"""
+from inspy_hard_stat.cli.subcommands.base import BaseSubcommand
+from inspy_hard_stat.ihs_lib.snapshot import add_snapshot_arguments, print_snapshot
+
+
+class SnapshotSubcommand(BaseSubcommand):
+    """
+    Print one system snapshot and exit.
+    """
+    name = 'snapshot'
+    help = 'Print one system snapshot and exit.'
+
+    def configure(self, parser):
+        add_snapshot_arguments(parser)
+
+    def run(self, args):
+        return print_snapshot(args)
@@ -0,0 +1,42 @@
+"""
+The ``version`` sub-command.
+
+Classes:
+    VersionSubcommand:
+        Print the version, optionally checking PyPI for a newer release.
+
+Since:
+    1.0.0
+"""
+from inspy_hard_stat.about.version import VERSION, check_for_updates
+from inspy_hard_stat.cli.subcommands.base import BaseSubcommand
+
+
+class VersionSubcommand(BaseSubcommand):
+    """
+    Print the version, optionally checking PyPI for a newer release.
+    """
+    name = 'version'
+    help = 'Print the version, optionally checking PyPI for a newer release.'
+
+    def configure(self, parser):
+        parser.add_argument(
+                '--check-updates',
+                action='store_true',
+                default=False,
+                help='Also check PyPI for a newer release (the result is cached for a day).'
+                )
+        parser.add_argument(
+                '--refresh',
+                action='store_true',
+                default=False,
+                help='With --check-updates, ask PyPI even if a recent result is cached.'
+                )
+
+    def run(self, args):
+        if args.check_updates:
+            print(check_for_updates(force=args.refresh))
+        else:
+            print(VERSION)
+
+        return 0
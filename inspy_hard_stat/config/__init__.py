@@ -1,47 +1,157 @@
 """
+Configuration for Inspy-Hard-Stat.
 
+Nothing heavy happens when this package is imported. The names below are provided lazily (PEP 562): each is built the
+first time it is accessed, so a program that only samples hardware never loads the logger, the configuration
+specifications or any INI file.
+
+Attributes:
+    CONFIG_SYSTEMS (dict):
+        The configuration systems, with the path of each one's specification and the default path of its file.
+
+    NON_DEFAULT_DIRS (ConfigFactory):
+        The configuration for alternate directories, used when the user keeps files somewhere other than the default
+        locations.
+
+    LOGGER_CONFIG (ConfigFactory):
+        The logger configuration. When it is first loaded, its log level is applied to the root logger, and re-applied
+        whenever it changes. It is loaded by :mod:`inspy_hard_stat.log_engine` when that is imported.
+
+    MOD_LOGGER:
+        The logger for this package.
+
+Since:
+    1.0.0
 """
+import threading
+from importlib import import_module
 from pathlib import Path
-from inspy_hard_stat.log_engine import ROOT_LOGGER as PARENT_LOGGER
-from inspy_hard_stat.config.spec import CONFIG_SPECS
-from inspy_hard_stat.config.factory import ConfigFactory
-from inspy_hard_stat.config.constants import FILE_SYSTEM_DEFAULTS
-
-
-MOD_LOGGER = PARENT_LOGGER.get_child('config')
-
-
-# Define the configuration systems, their specifications, and the default file paths for the configuration files for
-# each system.
-CONFIG_SYSTEMS = {
-        'core':                  {
-                'spec':    CONFIG_SPECS['serial'].file_path,
-                'default': Path(FILE_SYSTEM_DEFAULTS['files']['config']['core']).expanduser().resolve().absolute()
-                },
-        'logger':                {
-                'spec':    CONFIG_SPECS['logger'].file_path,
-                'default': Path(FILE_SYSTEM_DEFAULTS['files']['config']['logger']).expanduser().resolve().absolute()
-                },
-        'alternate_dirs': {
-                'spec':    CONFIG_SPECS['alternate_dirs'].file_path,
-                'default': Path(FILE_SYSTEM_DEFAULTS['files']['alternate_dirs'])
-                },
+
+
+_LAZY_IMPORTS = {
+        'ConfigFactory':        'inspy_hard_stat.config.factory',
+        'CONFIG_SPECS':         'inspy_hard_stat.config.spec',
+        'FILE_SYSTEM_DEFAULTS': 'inspy_hard_stat.config.constants',
+        }
+
+_LAZY_LOCK = threading.RLock()
+
+
+def _build_mod_logger():
+    from inspy_hard_stat.log_engine import ROOT_LOGGER as PARENT_LOGGER
+
+    return PARENT_LOGGER.get_child('config')
+
+
+def _build_config_systems():
+    # Define the configuration systems, their specifications, and the default file paths for the configuration files
+    # for each system.
+    from inspy_hard_stat.config.constants import FILE_SYSTEM_DEFAULTS
+    from inspy_hard_stat.config.spec import CONFIG_SPECS
+
+    return {
+            'core':           {
+                    'spec':    CONFIG_SPECS['serial'].file_path,
+                    'default': Path(FILE_SYSTEM_DEFAULTS['files']['config']['core']).expanduser().resolve().absolute()
+                    },
+            'logger':         {
+                    'spec':    CONFIG_SPECS['logger'].file_path,
+                    'default': Path(FILE_SYSTEM_DEFAULTS['files']['config']['logger']).expanduser().resolve().absolute()
+                    },
+            'alternate_dirs': {
+                    'spec':    CONFIG_SPECS['alternate_dirs'].file_path,
+                    'default': Path(FILE_SYSTEM_DEFAULTS['files']['alternate_dirs'])
+                    },
+            }
+
+
+def _build_non_default_dirs():
+    # Load the configuration file for the alternate directories.
+    # This is for when the user has specified alternate directories for the cache, config, data, log, and temp
+    # directories, and the configuration file is not in the default location.
+    from inspy_hard_stat.config.factory import ConfigFactory
+
+    return ConfigFactory('alternate_dirs', auto_load=True)
+
+
+def _build_logger_config():
+    from inspy_hard_stat.config.factory import ConfigFactory
+
+    non_default_dirs = __getattr__('NON_DEFAULT_DIRS')
+
+    if non_default_dirs.config_dir:
+        logger_config_dir = Path(non_default_dirs.config_dir).expanduser().resolve().absolute()
+    else:
+        logger_config_dir = __getattr__('CONFIG_SYSTEMS')['logger']['default'].parent
+
+    logger_config = ConfigFactory('logger', auto_load=True, config_dir_path=logger_config_dir)
+
+    # Publish before applying the level, which reads it back through this module.
+    globals()['LOGGER_CONFIG'] = logger_config
+
+    if logger_config.config.get('USER', 'log_level', fallback=None) and logger_config.loaded_config:
+        apply_log_level()
+
+    logger_config.subscribe('log_level', apply_log_level)
+
+    return logger_config
+
+
+_LAZY_BUILDERS = {
+        'MOD_LOGGER':       _build_mod_logger,
+        'CONFIG_SYSTEMS':   _build_config_systems,
+        'NON_DEFAULT_DIRS': _build_non_default_dirs,
+        'LOGGER_CONFIG':    _build_logger_config,
         }
 
-# Load the configuration files for the alternate directories.
-# This is for when the user has specified alternate directories for the cache, config, data, log, and temp directories,
-# and the configuration file is not in the default location.
-NON_DEFAULT_DIRS = ConfigFactory('alternate_dirs', auto_load=True)
 
-if NON_DEFAULT_DIRS.config_dir:
-    logger_config_dir = Path(NON_DEFAULT_DIRS.config_dir).expanduser().resolve().absolute()
-else:
-    logger_config_dir = CONFIG_SYSTEMS['logger']['default'].parent
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        value = getattr(import_module(_LAZY_IMPORTS[name]), name)
+        globals()[name] = value
+
+        return value
+
+    builder = _LAZY_BUILDERS.get(name)
+
+    if builder is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
-LOGGER_CONFIG = ConfigFactory('logger', auto_load=True, config_dir_path = logger_config_dir)
+    with _LAZY_LOCK:
+        # Another thread may have built it while we waited.
+        if name not in globals():
+            globals()[name] = builder()
 
+    return globals()[name]
 
-if LOGGER_CONFIG.config.get('USER', 'log_level', fallback=None) and LOGGER_CONFIG.loaded_config:
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS) | set(_LAZY_BUILDERS))
+
+
+def apply_log_level(key=None, old=None, new=None):
+    """
+    Apply the configured log level to the root logger.
+
+    Called when the logger configuration is first loaded, and again whenever ``log_level`` changes in it (including
+    when ``logger.ini`` is edited while the application is running).
+
+    Parameters:
+        key (str):
+            The configuration key that changed. Optional.
+
+        old (str):
+            The previous log level. Optional.
+
+        new (str):
+            The new log level. Optional; read from the configuration if not provided.
+
+    Returns:
+        None
+    """
     from inspy_hard_stat.log_engine import ROOT_LOGGER
-    log_level = LOGGER_CONFIG.config.get('USER', 'log_level')
-    ROOT_LOGGER.set_level(console_level=log_level)
+
+    log_level = new or __getattr__('LOGGER_CONFIG').config.get('USER', 'log_level', fallback=None)
+
+    if log_level:
+        ROOT_LOGGER.set_level(console_level=log_level)
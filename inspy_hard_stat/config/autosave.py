@@ -0,0 +1,159 @@
+"""
+Debounced, background saving for configuration objects.
+
+Classes:
+    DebouncedSaver:
+        Runs a save callback on a background thread once changes stop arriving.
+
+Since:
+    1.0.0
+"""
+import atexit
+import threading
+import time
+import weakref
+from typing import Callable, Optional
+from warnings import warn
+
+
+DEFAULT_SAVE_DELAY = 0.5
+"""Seconds to wait after the last change before saving."""
+
+# Every saver, flushed at exit; held weakly, so a saver that is replaced can be collected.
+_SAVERS = weakref.WeakSet()
+
+
+def _flush_all() -> None:
+    for saver in list(_SAVERS):
+        saver.flush()
+
+
+atexit.register(_flush_all)
+
+
+class DebouncedSaver:
+    """
+    Runs a save callback on a background thread once changes stop arriving.
+
+    Each call to :meth:`schedule` pushes the save back by the delay, so a burst of changes is saved once. A call to
+    :meth:`flush` saves any pending changes straight away, on the caller's thread. Pending changes are also flushed
+    when the interpreter exits.
+    """
+
+    def __init__(self, save: Callable[[], None], delay: float = DEFAULT_SAVE_DELAY, name: Optional[str] = None):
+        """
+        Initialize the saver.
+
+        Parameters:
+            save (Callable[[], None]):
+                The callable that does the saving.
+
+            delay (float):
+                Seconds to wait after the last change before saving. Optional; default is
+                :data:`DEFAULT_SAVE_DELAY`.
+
+            name (str):
+                A name for the background thread. Optional.
+        """
+        self.__condition = threading.Condition()
+        self.__delay = delay
+        self.__due = None
+        self.__name = name or 'ihs-config-autosave'
+        self.__save = save
+        self.__save_lock = threading.Lock()
+        self.__thread = None
+
+        _SAVERS.add(self)
+
+    @property
+    def delay(self) -> float:
+        """
+        Seconds waited after the last change before saving.
+
+        Returns:
+            float
+        """
+        return self.__delay
+
+    @property
+    def pending(self) -> bool:
+        """
+        Whether there are changes waiting to be saved.
+
+        Returns:
+            bool
+        """
+        return self.__due is not None
+
+    def schedule(self) -> None:
+        """
+        Note that something changed; it will be saved once no further changes arrive for the delay.
+
+        Returns:
+            None
+        """
+        with self.__condition:
+            self.__due = time.monotonic() + self.__delay
+
+            if self.__thread is None or not self.__thread.is_alive():
+                self.__thread = threading.Thread(target=self._run, name=self.__name, daemon=True)
+                self.__thread.start()
+
+            self.__condition.notify()
+
+    def cancel(self) -> None:
+        """
+        Drop any pending save.
+
+        Returns:
+            None
+        """
+        with self.__condition:
+            self.__due = None
+            self.__condition.notify()
+
+    def flush(self) -> None:
+        """
+        Save any pending changes now, on the calling thread, and wait for any save already in progress.
+
+        Returns:
+            None
+        """
+        with self.__condition:
+            due = self.__due
+            self.__due = None
+            self.__condition.notify()
+
+        with self.__save_lock:
+            if due is not None:
+                self.__save()
+
+    def _run(self) -> None:
+        with self.__condition:
+            while True:
+                if self.__due is None:
+                    # Nothing pending; let the thread end rather than idle. The next change starts a new one.
+                    if not self.__condition.wait(self.__delay * 4 or 1.0) and self.__due is None:
+                        if self.__thread is threading.current_thread():
+                            self.__thread = None
+
+                        return
+
+                    continue
+
+                remaining = self.__due - time.monotonic()
+
+                if remaining > 0:
+                    self.__condition.wait(remaining)
+                    continue
+
+                self.__due = None
+                self.__condition.release()
+
+                try:
+                    with self.__save_lock:
+                        self.__save()
+                except Exception as e:
+                    warn(f'Background save failed: {e}')
+                finally:
+                    self.__condition.acquire()
@@ -0,0 +1,764 @@
+"""
+A content-addressed store for configuration backups.
+
+Each distinct version of a configuration file is stored once, under ``objects/<hash>`` in the store's directory, named
+by the SHA-256 hash of its contents. Every backup taken is recorded as one JSON line in ``index.jsonl``, giving the
+configuration system, the time, the hash and the size. Backing up a file that has not changed since its last backup
+adds nothing.
+
+Retention is applied on a background thread shortly after backups are taken: for each configuration system the most
+recent ``keep_last`` backups are kept, along with the newest backup of each of the last ``keep_daily_days`` days.
+Objects no longer referenced by the index are deleted. The store's size therefore stays flat however often the
+configuration is saved.
+
+Several processes may share a store. Adding a backup (from the duplicate check to the index append), importing legacy
+backups and applying retention each hold an exclusive :func:`fcntl.flock` on ``index.lock`` (where available), so
+retention never deletes an object another process has written but not yet indexed, and two processes cannot both
+record the same unchanged file.
+
+The index doubles as the catalog the restore app browses: :meth:`BackupStore.page` reads it backward from the end, so
+showing the most recent backups never means listing the directory or reading the whole index. Next to the index,
+``systems.json`` holds the offset of each configuration system's latest record, so :meth:`BackupStore.systems` and
+:meth:`BackupStore.latest` read a single line of the index at most; it is rebuilt from the index whenever it is found
+out of date. Backups written as individual ``<system>_<date>_<time>.bak`` files by older versions are brought into the
+store by :meth:`BackupStore.import_legacy`.
+
+Classes:
+    BackupRecord:
+        One entry in the backup index.
+
+    BackupStore:
+        The store itself.
+
+Functions:
+    get_backup_store(root):
+        Get the shared store for a directory.
+
+Since:
+    1.0.0
+"""
+import hashlib
+import json
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Iterator, NamedTuple, Optional, Union
+
+from inspy_hard_stat.config.autosave import DebouncedSaver
+from inspy_hard_stat.config.constants import FILE_SYSTEM_DEFAULTS
+from inspy_hard_stat.config.utils import atomic_write_bytes
+
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+DEFAULT_BACKUP_DIR = FILE_SYSTEM_DEFAULTS['dirs']['config'] / 'backups'
+
+DEFAULT_KEEP_LAST = 20
+"""The number of most recent backups kept for each configuration system."""
+
+DEFAULT_KEEP_DAILY_DAYS = 30
+"""The number of days for which the newest backup of each day is kept."""
+
+INDEX_FILE_NAME = 'index.jsonl'
+
+LOCK_FILE_NAME = 'index.lock'
+
+SUMMARY_FILE_NAME = 'systems.json'
+
+OBJECTS_DIR_NAME = 'objects'
+
+INDEX_READ_BLOCK_SIZE = 64 * 1024
+
+LEGACY_BACKUP_PATTERN = re.compile(r'(\w+?)_(\d{8})_(\d{6})(?:_\d+)?\.bak$')
+"""Matches the names of backup files written before the store existed, capturing the system, date and time."""
+
+LEGACY_DIR_NAME = 'legacy'
+
+LEGACY_MARKER_NAME = '.legacy-imported'
+"""Left in a directory once its legacy backups have been imported; see :meth:`BackupStore.import_legacy`."""
+
+RETENTION_DELAY = 2.0
+"""Seconds after the last backup before retention runs."""
+
+_STORES = {}
+_STORES_LOCK = threading.Lock()
+
+
+class BackupRecord(NamedTuple):
+    """
+    One entry in the backup index.
+
+    Attributes:
+        system (str):
+            The configuration system the backup belongs to.
+
+        timestamp (float):
+            When the backup was taken, as a UNIX timestamp.
+
+        hash (str):
+            The SHA-256 hash of the backed-up contents; also the name of the stored object.
+
+        size (int):
+            The size of the backed-up contents, in bytes.
+
+        source (str):
+            The path of the file that was backed up.
+    """
+    system: str
+    timestamp: float
+    hash: str
+    size: int
+    source: str
+
+    @property
+    def readable_time(self) -> str:
+        """
+        The time the backup was taken, formatted for display.
+
+        Returns:
+            str
+        """
+        return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.timestamp))
+
+    def to_json(self) -> str:
+        """
+        Encode the record as a single line of JSON.
+
+        Returns:
+            str
+        """
+        return json.dumps(self._asdict(), separators=(',', ':'))
+
+
+class BackupStore:
+    """
+    A content-addressed store for configuration backups, with an index and background retention.
+    """
+
+    def __init__(
+            self,
+            root: Union[str, Path] = DEFAULT_BACKUP_DIR,
+            keep_last: int = DEFAULT_KEEP_LAST,
+            keep_daily_days: int = DEFAULT_KEEP_DAILY_DAYS,
+            ):
+        """
+        Initialize the store.
+
+        Parameters:
+            root (Union[str, Path]):
+                The directory holding the store. Optional; default is :data:`DEFAULT_BACKUP_DIR`.
+
+            keep_last (int):
+                The number of most recent backups kept for each configuration system. Optional; default is
+                :data:`DEFAULT_KEEP_LAST`.
+
+            keep_daily_days (int):
+                The number of days for which the newest backup of each day is kept. Optional; default is
+                :data:`DEFAULT_KEEP_DAILY_DAYS`.
+        """
+        self.__keep_daily_days = keep_daily_days
+        self.__keep_last = keep_last
+        self.__lock = threading.RLock()
+        self.__lock_file = None
+        self.__root = Path(root).expanduser().resolve().absolute()
+        self.__retention = DebouncedSaver(self.apply_retention, RETENTION_DELAY, 'ihs-backup-retention')
+
+    @property
+    def index_path(self) -> Path:
+        """
+        The path of the index file.
+
+        Returns:
+            Path
+        """
+        return self.__root / INDEX_FILE_NAME
+
+    @property
+    def objects_dir(self) -> Path:
+        """
+        The directory holding the stored objects.
+
+        Returns:
+            Path
+        """
+        return self.__root / OBJECTS_DIR_NAME
+
+    @property
+    def summary_path(self) -> Path:
+        """
+        The path of the per-system summary of the index.
+
+        Returns:
+            Path
+        """
+        return self.__root / SUMMARY_FILE_NAME
+
+    @property
+    def root(self) -> Path:
+        """
+        The directory holding the store.
+
+        Returns:
+            Path
+        """
+        return self.__root
+
+    @contextmanager
+    def _exclusive(self):
+        """
+        Hold the store against other threads and, through a lock on ``index.lock``, other processes.
+
+        The index itself is replaced whenever it is rewritten, so it cannot carry the lock. Nested uses on the same
+        thread only take the lock once.
+        """
+        with self.__lock:
+            if self.__lock_file is not None or fcntl is None:
+                yield
+                return
+
+            self.__root.mkdir(parents=True, exist_ok=True)
+
+            with open(self.__root / LOCK_FILE_NAME, 'a') as lock_file:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                self.__lock_file = lock_file
+
+                try:
+                    yield
+                finally:
+                    self.__lock_file = None
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _write_summary(self, index_size: int, latest: dict[str, int]) -> None:
+        atomic_write_bytes(
+                self.summary_path,
+                json.dumps({'index_size': index_size, 'latest': latest}, separators=(',', ':')).encode(),
+                )
+
+    def _read_summary(self) -> Optional[dict[str, int]]:
+        """
+        Read the summary, if it matches the index as it is now.
+
+        Returns:
+            Optional[dict[str, int]]:
+                The offset of each system's latest record in the index; None if the summary is missing or out of date.
+        """
+        try:
+            index_size = self.index_path.stat().st_size
+        except FileNotFoundError:
+            index_size = 0
+        except OSError:
+            return None
+
+        try:
+            summary = json.loads(self.summary_path.read_bytes())
+        except FileNotFoundError:
+            return {} if index_size == 0 else None
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(summary, dict) or summary.get('index_size') != index_size:
+            return None
+
+        return summary.get('latest')
+
+    def _rebuild_summary(self) -> dict[str, int]:
+        """
+        Scan the whole index to rebuild the summary, and save it.
+        """
+        latest = {}
+        offset = 0
+
+        try:
+            with open(self.index_path, 'rb') as index:
+                for line in index:
+                    try:
+                        latest[BackupRecord(**json.loads(line)).system] = offset
+                    except (ValueError, TypeError):
+                        pass
+
+                    offset += len(line)
+        except FileNotFoundError:
+            return latest
+
+        try:
+            self._write_summary(offset, latest)
+        except OSError:
+            pass
+
+        return latest
+
+    def _summary(self) -> dict[str, int]:
+        latest = self._read_summary()
+
+        if latest is None:
+            with self._exclusive():
+                latest = self._read_summary()
+
+                if latest is None:
+                    latest = self._rebuild_summary()
+
+        return latest
+
+    def _read_record_at(self, offset: int) -> Optional[BackupRecord]:
+        try:
+            with open(self.index_path, 'rb') as index:
+                index.seek(offset)
+                return BackupRecord(**json.loads(index.readline()))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def _write_index(self, records: list[BackupRecord]) -> None:
+        """
+        Replace the index with the given records, and the summary to match.
+        """
+        lines = []
+        latest = {}
+        offset = 0
+
+        for record in records:
+            line = (record.to_json() + '\n').encode()
+            latest[record.system] = offset
+            lines.append(line)
+            offset += len(line)
+
+        self.__root.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(self.index_path, b''.join(lines))
+        self._write_summary(offset, latest)
+
+    def object_path(self, digest: str) -> Path:
+        """
+        Get the path of a stored object.
+
+        Parameters:
+            digest (str):
+                The hash of the object.
+
+        Returns:
+            Path
+        """
+        return self.objects_dir / digest[:2] / digest
+
+    def add(
+            self,
+            system: str,
+            source: Optional[Union[str, Path]] = None,
+            data: Optional[bytes] = None,
+            timestamp: Optional[float] = None,
+            ) -> BackupRecord:
+        """
+        Back up a configuration file.
+
+        Parameters:
+            system (str):
+                The configuration system the file belongs to.
+
+            source (Union[str, Path]):
+                The file to back up. Optional if ``data`` is given.
+
+            data (bytes):
+                The contents to back up. Optional; read from ``source`` if not given.
+
+            timestamp (float):
+                When the backup was taken. Optional; default is now.
+
+        Returns:
+            BackupRecord:
+                The record for the backup. If the contents are the same as the system's most recent backup, that
+                record is returned and nothing is added.
+
+        Raises:
+            ValueError:
+                Raised when neither ``source`` nor ``data`` is given.
+        """
+        if data is None:
+            if source is None:
+                raise ValueError('Either a source file or the data to back up must be given.')
+
+            data = Path(source).read_bytes()
+
+        digest = hashlib.sha256(data).hexdigest()
+        system = system.lower()
+
+        with self._exclusive():
+            latest = self.latest(system)
+
+            if latest is not None and latest.hash == digest:
+                return latest
+
+            object_path = self.object_path(digest)
+
+            if not object_path.exists():
+                object_path.parent.mkdir(parents=True, exist_ok=True)
+                atomic_write_bytes(object_path, data)
+
+            record = BackupRecord(
+                    system=system,
+                    timestamp=time.time() if timestamp is None else timestamp,
+                    hash=digest,
+                    size=len(data),
+                    source=str(source or ''),
+                    )
+
+            line = (record.to_json() + '\n').encode()
+            latest = self._summary()
+
+            with open(self.index_path, 'ab') as index:
+                offset = index.seek(0, 2)
+                index.write(line)
+
+            latest[system] = offset
+            self._write_summary(offset + len(line), latest)
+
+        self.__retention.schedule()
+
+        return record
+
+    def records(self, system: Optional[str] = None) -> list[BackupRecord]:
+        """
+        Read the index.
+
+        Parameters:
+            system (str):
+                Only return records for this configuration system. Optional.
+
+        Returns:
+            list[BackupRecord]:
+                The records, oldest first. Lines that cannot be parsed are skipped.
+        """
+        system = system.lower() if system else None
+        records = []
+
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as index:
+                for line in index:
+                    try:
+                        record = BackupRecord(**json.loads(line))
+                    except (ValueError, TypeError):
+                        continue
+
+                    if system is None or record.system == system:
+                        records.append(record)
+        except FileNotFoundError:
+            pass
+
+        return records
+
+    def iter_records_newest_first(self, system: Optional[str] = None) -> Iterator[BackupRecord]:
+        """
+        Read the index backward, one block at a time, yielding the newest records first.
+
+        Only as much of the index as is needed is read, so taking the first page of a long index is cheap.
+
+        Parameters:
+            system (str):
+                Only yield records for this configuration system. Optional.
+
+        Yields:
+            BackupRecord:
+                The records, newest first. Lines that cannot be parsed are skipped.
+        """
+        system = system.lower() if system else None
+
+        def parse(line: bytes) -> Optional[BackupRecord]:
+            try:
+                record = BackupRecord(**json.loads(line))
+            except (ValueError, TypeError):
+                return None
+
+            return record if system is None or record.system == system else None
+
+        try:
+            index = open(self.index_path, 'rb')
+        except FileNotFoundError:
+            return
+
+        with index:
+            position = index.seek(0, 2)
+            remainder = b''
+
+            while position > 0:
+                size = min(INDEX_READ_BLOCK_SIZE, position)
+                position -= size
+                index.seek(position)
+                lines = (index.read(size) + remainder).split(b'\n')
+                remainder = lines[0]
+
+                for line in reversed(lines[1:]):
+                    record = parse(line) if line else None
+
+                    if record is not None:
+                        yield record
+
+            record = parse(remainder) if remainder else None
+
+            if record is not None:
+                yield record
+
+    def latest(self, system: str) -> Optional[BackupRecord]:
+        """
+        Get the most recent backup of a configuration system.
+
+        Parameters:
+            system (str):
+                The configuration system.
+
+        Returns:
+            Optional[BackupRecord]:
+                The record, or None if the system has no backups.
+        """
+        system = system.lower()
+        offset = self._summary().get(system)
+
+        if offset is None:
+            return None
+
+        record = self._read_record_at(offset)
+
+        if record is None or record.system != system:
+            # The index was rewritten after the summary was read.
+            return next(self.iter_records_newest_first(system), None)
+
+        return record
+
+    def page(self, system: Optional[str] = None, offset: int = 0, limit: int = 20) -> list[BackupRecord]:
+        """
+        Get one page of backups, newest first.
+
+        Parameters:
+            system (str):
+                Only include backups of this configuration system. Optional.
+
+            offset (int):
+                The number of (newer) backups to skip. Optional; default is 0.
+
+            limit (int):
+                The largest number of backups to return. Optional; default is 20.
+
+        Returns:
+            list[BackupRecord]
+        """
+        return list(islice(self.iter_records_newest_first(system), offset, offset + limit))
+
+    def systems(self) -> list[str]:
+        """
+        Get the configuration systems that have backups, most recently backed up first.
+
+        Returns:
+            list[str]
+        """
+        latest = self._summary()
+
+        return sorted(latest, key=latest.get, reverse=True)
+
+    def import_legacy(self, directory: Optional[Union[str, Path]] = None, once: bool = False) -> int:
+        """
+        Bring backup files written by older versions (``<system>_<date>_<time>.bak``) into the store.
+
+        Each file is stored and indexed under the time in its name, then moved into a ``legacy`` subdirectory, so it is
+        only imported once and nothing is deleted. The directory is then marked with a :data:`LEGACY_MARKER_NAME` file.
+
+        Parameters:
+            directory (Union[str, Path]):
+                The directory holding the files. Optional; default is the store's directory.
+
+            once (bool):
+                If True, do nothing if the directory is already marked, rather than listing it again. Optional;
+                default is False.
+
+        Returns:
+            int:
+                The number of files imported.
+        """
+        directory = Path(directory) if directory else self.__root
+        marker = directory / LEGACY_MARKER_NAME
+
+        if not directory.is_dir() or (once and marker.exists()):
+            return 0
+
+        legacy = []
+
+        for entry in directory.iterdir():
+            match = LEGACY_BACKUP_PATTERN.match(entry.name)
+
+            if match and entry.is_file():
+                system, date_str, time_str = match.groups()
+                timestamp = datetime.strptime(date_str + time_str, '%Y%m%d%H%M%S').timestamp()
+                legacy.append((timestamp, system.lower(), entry))
+
+        if not legacy:
+            marker.touch()
+            return 0
+
+        legacy_dir = directory / LEGACY_DIR_NAME
+        legacy_dir.mkdir(parents=True, exist_ok=True)
+
+        with self._exclusive():
+            records = self.records()
+
+            for timestamp, system, entry in sorted(legacy):
+                data = entry.read_bytes()
+                digest = hashlib.sha256(data).hexdigest()
+                object_path = self.object_path(digest)
+
+                if not object_path.exists():
+                    object_path.parent.mkdir(parents=True, exist_ok=True)
+                    atomic_write_bytes(object_path, data)
+
+                records.append(BackupRecord(system, timestamp, digest, len(data), ''))
+                entry.replace(legacy_dir / entry.name)
+
+            # The imported backups are older than most of the index; keep it in time order so it can be read backward.
+            records.sort(key=lambda record: record.timestamp)
+            self._write_index(records)
+
+        marker.touch()
+        self.__retention.schedule()
+
+        return len(legacy)
+
+    def read(self, record: Union[BackupRecord, str]) -> bytes:
+        """
+        Read the contents of a backup.
+
+        Parameters:
+            record (Union[BackupRecord, str]):
+                The record, or the hash of the object.
+
+        Returns:
+            bytes
+
+        Raises:
+            FileNotFoundError:
+                Raised when the object is missing from the store.
+        """
+        digest = record.hash if isinstance(record, BackupRecord) else record
+
+        return self.object_path(digest).read_bytes()
+
+    def restore(self, record: Union[BackupRecord, str], destination: Union[str, Path]) -> None:
+        """
+        Write the contents of a backup to a file, atomically.
+
+        Parameters:
+            record (Union[BackupRecord, str]):
+                The record, or the hash of the object.
+
+            destination (Union[str, Path]):
+                The file to write.
+
+        Returns:
+            None
+        """
+        atomic_write_bytes(destination, self.read(record))
+
+    def select_retained(self, records: list[BackupRecord], now: Optional[float] = None) -> list[BackupRecord]:
+        """
+        Decide which records the retention policy keeps.
+
+        Parameters:
+            records (list[BackupRecord]):
+                The records to consider.
+
+            now (float):
+                The current time. Optional; default is now.
+
+        Returns:
+            list[BackupRecord]:
+                The records to keep, oldest first.
+        """
+        now = time.time() if now is None else now
+        cutoff = now - self.__keep_daily_days * 86400
+        by_system = {}
+
+        for record in records:
+            by_system.setdefault(record.system, []).append(record)
+
+        kept = set()
+
+        for system_records in by_system.values():
+            system_records.sort(key=lambda record: record.timestamp, reverse=True)
+            kept.update(system_records[:self.__keep_last])
+
+            days_seen = set()
+
+            for record in system_records:
+                if record.timestamp < cutoff:
+                    break
+
+                day = time.strftime('%Y%m%d', time.localtime(record.timestamp))
+
+                if day not in days_seen:
+                    days_seen.add(day)
+                    kept.add(record)
+
+        return sorted(kept, key=lambda record: record.timestamp)
+
+    def apply_retention(self, now: Optional[float] = None) -> int:
+        """
+        Apply the retention policy: rewrite the index with only the retained records, and delete unreferenced objects.
+
+        This runs automatically on a background thread after backups are added.
+
+        Parameters:
+            now (float):
+                The current time. Optional; default is now.
+
+        Returns:
+            int:
+                The number of records removed.
+        """
+        with self._exclusive():
+            records = self.records()
+            kept = self.select_retained(records, now)
+            removed = len(records) - len(kept)
+
+            if removed:
+                self._write_index(kept)
+
+            referenced = {record.hash for record in kept}
+
+            if self.objects_dir.exists():
+                for object_path in self.objects_dir.glob('*/*'):
+                    if object_path.name not in referenced and not object_path.name.startswith('.'):
+                        object_path.unlink(missing_ok=True)
+
+        return removed
+
+    def flush(self) -> None:
+        """
+        Apply any pending retention now.
+
+        Returns:
+            None
+        """
+        self.__retention.flush()
+
+
+def get_backup_store(root: Union[str, Path] = DEFAULT_BACKUP_DIR) -> BackupStore:
+    """
+    Get the shared store for a directory, creating it on first use.
+
+    Parameters:
+        root (Union[str, Path]):
+            The directory holding the store. Optional; default is :data:`DEFAULT_BACKUP_DIR`.
+
+    Returns:
+        BackupStore
+    """
+    key = str(Path(root).expanduser().resolve().absolute())
+
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+
+        if store is None:
+            store = _STORES[key] = BackupStore(key)
+
+    return store
@@ -1,6 +1,7 @@
 import configparser
-import os
-import time
+import io
+import threading
+from contextlib import contextmanager
 from inspyre_toolbox.syntactic_sweets.classes.decorators.type_validation import validate_type
 from pathlib import Path
 from typing import Optional, Union
@@ -11,9 +12,17 @@ from inspy_hard_stat.config.spec import CONFIG_SPECS
 from inspy_hard_stat.config.errors import (
     ConfigBackupDirectoryNonExistentError, ConfigDirectoryNonExistentError, InvalidConfigSystemError
     )
+from inspy_hard_stat.config.autosave import DEFAULT_SAVE_DELAY, DebouncedSaver
+from inspy_hard_stat.config.backups import BackupRecord, get_backup_store
+from inspy_hard_stat.config.snapshot import ConfigSnapshot, snapshot_class_for, write_snapshot_cache
 from inspy_hard_stat.config.constants import CONFIG_SYSTEM_NAMES, FILE_SYSTEM_DEFAULTS
-from inspy_hard_stat.utils import wait_for_changes
-from inspy_hard_stat.config.utils import convert_str_to_type
+from inspy_hard_stat.utils import open_in_default_app, wait_for_changes
+from inspy_hard_stat.config.utils import atomic_write_text
+from inspy_hard_stat.config.watcher import CONFIG_WATCHER
+
+
+# Values of these types are not cached, as callers could change the cached object without going through __setattr__.
+UNCACHED_VALUE_TYPES = (list, dict, set, bytearray)
 
 
 class ConfigFactory:
@@ -47,6 +56,8 @@ class ConfigFactory:
             skip_auto_saving: Optional[bool] = False,
             config_dir_path: Optional[Union[str, Path]] = FILE_SYSTEM_DEFAULTS['dirs']['config'],
             skip_reload_on_change: Optional[bool] = False,
+            background_save: Optional[bool] = False,
+            save_delay: Optional[float] = DEFAULT_SAVE_DELAY,
             ):
         """
         Initialize a ConfigFactory object.
@@ -55,6 +66,14 @@ class ConfigFactory:
             config_system (str):
                 The name of the configuration system to use. Must be one of the keys in :attr:`CONFIG_SYSTEMS`.
 
+            background_save (bool):
+                If True, auto-saves are debounced and written on a background thread, so setting a value only changes
+                memory. Call :meth:`flush` to make sure changes are on disk; pending changes are also flushed at exit.
+                Default is False.
+
+            save_delay (float):
+                With background saving, how long to wait after the last change before saving, in seconds.
+
         """
         self._initialized = False
         self._initialize_attributes(
@@ -63,6 +82,8 @@ class ConfigFactory:
                 skip_auto_saving,
                 config_dir_path,
                 skip_reload_on_change,
+                background_save,
+                save_delay,
             )
         self._initialized = True
 
@@ -79,6 +100,8 @@ class ConfigFactory:
             skip_auto_saving: Optional[bool] = False,
             config_dir_path: Optional[Union[str, Path]] = FILE_SYSTEM_DEFAULTS['dirs']['config'],
             skip_reload_on_change: Optional[bool] = False,
+            background_save: Optional[bool] = False,
+            save_delay: Optional[float] = DEFAULT_SAVE_DELAY,
         ):
         def get_config_systems():
             from inspy_hard_stat.config import CONFIG_SYSTEMS
@@ -86,12 +109,32 @@ class ConfigFactory:
             return CONFIG_SYSTEMS
 
         self.__auto_save = not skip_auto_saving
+        self.__background_save = background_save
+        self.__batch_depth = 0
+        self.__staged_before = {}
+        self.__lock = self.__dict__.get('_ConfigFactory__lock') or threading.RLock()
+        self.__reload_callbacks = self.__dict__.get('_ConfigFactory__reload_callbacks') or []
+        self.__key_subscribers = self.__dict__.get('_ConfigFactory__key_subscribers') or {}
+        self.__watching_file = self.__dict__.get('_ConfigFactory__watching_file', False)
+        self.__saver = self.__dict__.get('_ConfigFactory__saver')
+
+        if background_save and (self.__saver is None or self.__saver.delay != save_delay):
+            if self.__saver is not None:
+                self.__saver.flush()
+
+            self.__saver = DebouncedSaver(self._save_in_background, save_delay, f'ihs-config-autosave-{config_system}')
         self.__config_system = config_system.lower()
         self.__config_changed = False
         self.__file_modified = None
         self.__reload_file_on_change = not skip_reload_on_change
         self.__config_dir_path = Path(config_dir_path).expanduser().resolve().absolute()
         self.__loaded_config = False
+        self.__snapshot = None
+        self.__snapshot_listeners = self.__dict__.get('_ConfigFactory__snapshot_listeners') or []
+        self.__snapshot_version = self.__dict__.get('_ConfigFactory__snapshot_version', 0)
+        self.__cache_lock = self.__dict__.get('_ConfigFactory__cache_lock') or threading.Lock()
+        self.__cache_generation = self.__dict__.get('_ConfigFactory__cache_generation', 0)
+        self.__value_cache = {}
 
         self.__config_systems = get_config_systems()
         self.__config = configparser.ConfigParser()
@@ -108,13 +151,11 @@ class ConfigFactory:
             section_name = section_name.upper()
 
         if item in self.config_spec.spec:
-            type_name = self.config_spec.spec[item]['type']
             val = self.config.get(section_name, item, fallback=None)
             if val is None:
                 val = self.config_spec.spec[item]['default']
 
-            type_obj = convert_str_to_type(val, type_name)
-            return type_obj
+            return self.config_spec.converters[item](val)
 
     def _return_from_defaults(self, item):
         from inspy_hard_stat.utils import search_file_for_user_line
@@ -152,6 +193,15 @@ class ConfigFactory:
             return True
 
     def __getattr__(self, item):
+        # Fast path; typed values are cached until the configuration changes (see `clear_value_cache`).
+        value_cache = self.__dict__.get('_ConfigFactory__value_cache')
+
+        if value_cache is not None:
+            if item in value_cache:
+                return value_cache[item]
+
+            generation = self.__dict__['_ConfigFactory__cache_generation']
+
         section_name = self.determine_section()
         self._check_section(section_name)
         if not self._initialized:
@@ -164,13 +214,23 @@ class ConfigFactory:
         if item in self.__dict__:
             return self.__dict__[item]
         elif item in self.__dict__['_ConfigFactory__config'].defaults():
+            # Already converted to the type in the specification.
             res = self._return_from_config(item, section_name)
         elif item in self.__dict__['_ConfigFactory__config_spec'].defaults:
             res = self._return_from_defaults(item)
 
+            if res is not None:
+                res = self.__dict__['_ConfigFactory__config_spec'].converters[item](res)
+
 
         if res is not None:
-            return convert_str_to_type(res, self._get_type_from_spec(item))
+            if value_cache is not None and not isinstance(res, UNCACHED_VALUE_TYPES):
+                with self.__dict__['_ConfigFactory__cache_lock']:
+                    # Only cache the value if nothing was set or loaded while it was being read; it may be stale.
+                    if self.__dict__['_ConfigFactory__cache_generation'] == generation:
+                        value_cache[item] = res
+
+            return res
 
 
         raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{item}'")
@@ -184,14 +244,94 @@ class ConfigFactory:
             return
         elif key in self.__dict__['_ConfigFactory__config'].defaults():
             section_name = self.determine_section()
-            self._check_section(section_name)
-            self.__dict__['_ConfigFactory__config'].set(section_name, key, str(value))
-            self.__config_changed = True
+
+            with self.__lock:
+                # Only the thread running a transaction can get here while one is open, as it holds the lock.
+                if self.__batch_depth:
+                    if key not in self.__staged_before and self.__key_subscribers.get(key):
+                        self.__staged_before[key] = self._read_typed(key)
+
+                    self._set_value(section_name, key, value)
+                    return
+
+            with self._notifying_changes((key,)), self.__lock:
+                self._set_value(section_name, key, value)
+                self._publish_snapshot()
 
         if key in self.config.defaults():
-            if self.__config_changed and self.__auto_save:
-                self.save_config()
-                self.load_config()
+            if self.__config_changed and self.__auto_save and not self.__batch_depth:
+                self._auto_save()
+
+    def _set_value(self, section_name: str, key: str, value) -> None:
+        self._check_section(section_name)
+        self.__dict__['_ConfigFactory__config'].set(section_name, key, str(value))
+
+        with self.__cache_lock:
+            self.__cache_generation += 1
+            self.__value_cache.pop(key, None)
+        self.__config_changed = True
+
+    def _notify_staged(self, before: dict) -> None:
+        for key, old in before.items():
+            new = self._read_typed(key)
+
+            if new != old:
+                for callback in list(self.__key_subscribers.get(key, ())):
+                    callback(key, old, new)
+
+    def _read_typed(self, key: str):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            return None
+
+    @contextmanager
+    def _notifying_changes(self, keys=None):
+        """
+        Notify key subscribers of any values that differ after the block from what they were before it.
+
+        Parameters:
+            keys (Iterable[str]):
+                The keys that may change. Optional; default is every subscribed key.
+        """
+        subscribers = self.__key_subscribers
+
+        if keys is None:
+            keys = list(subscribers)
+        else:
+            keys = [key for key in keys if subscribers.get(key)]
+
+        if not keys:
+            yield
+            return
+
+        before = {key: self._read_typed(key) for key in keys}
+
+        yield
+
+        for key in keys:
+            new = self._read_typed(key)
+
+            if new != before[key]:
+                for callback in list(subscribers.get(key, ())):
+                    callback(key, before[key], new)
+
+    def _auto_save(self) -> None:
+        """
+        Save after a change, either now or, with background saving, once changes stop arriving.
+
+        Returns:
+            None
+        """
+        if self.__background_save:
+            self.__saver.schedule()
+        else:
+            self.save_config()
+            self.load_config()
+
+    def _save_in_background(self) -> None:
+        if self.__config_changed:
+            self.save_config()
 
     def _check_section(self, section: str = 'USER', do_not_create: bool = False):
         """
@@ -242,7 +382,9 @@ class ConfigFactory:
         Returns:
             None
         """
-        self.__config = new
+        with self.__lock:
+            self.__config = new
+            self._commit_values()
 
     @property
     def config_changed(self) -> bool:
@@ -274,6 +416,28 @@ class ConfigFactory:
         """
         self.__config_changed = new
 
+    @property
+    def background_save(self) -> bool:
+        """
+        Check whether auto-saves are debounced and written on a background thread.
+
+        Returns:
+            bool:
+                True if background saving is on, False otherwise.
+        """
+        return self.__background_save
+
+    @property
+    def in_transaction(self) -> bool:
+        """
+        Check whether changes are currently being staged by :meth:`transaction`.
+
+        Returns:
+            bool:
+                True if inside a transaction, False otherwise.
+        """
+        return self.__batch_depth > 0
+
     @property
     def config_dir_path(self):
         """
@@ -506,7 +670,7 @@ class ConfigFactory:
             backup_ext: Optional[str] = '.bak',
             do_not_create_dir: Optional[bool] = False,
             overwrite: Optional[bool] = False
-            ) -> None:
+            ) -> Optional[BackupRecord]:
         """
         Backup the configuration file.
 
@@ -516,8 +680,9 @@ class ConfigFactory:
                 The directory to place the backup file in.
 
             backup_name (str):
-                The name to give the backup file. If None, the backup file will be named after the configuration file,
-                with the current date and time appended.
+                The name to give the backup file. If None, the backup is added to the backup store in `backup_dir`
+                (see :class:`~inspy_hard_stat.config.backups.BackupStore`), which stores each distinct version of the
+                file once and records the time of each backup in its index.
 
             backup_ext (str):
                 The extension to give the backup file. If None, the extension will be '.bak'.
@@ -527,9 +692,11 @@ class ConfigFactory:
                 ConfigBackupDirectoryNonExistentError if the directory does not exist.
 
             overwrite:
+                If True, an existing backup file with the same name is overwritten.
 
         Returns:
-
+            Optional[BackupRecord]:
+                The store's record of the backup, when no name was given.
         """
 
         backup_dir = Path(backup_dir)
@@ -545,12 +712,14 @@ class ConfigFactory:
                     "Set `do_not_create_dir` to `False` to create the directory."
                     )
 
-        # Determine the name of the backup file.
+        # Unnamed backups go to the content-addressed store, which keeps each distinct version once and prunes old ones.
         if not backup_name:
-            backup_name = self.config_file_path.stem
-            backup_file_name = f'{backup_name}_{time.strftime("%Y%m%d_%H%M%S")}{backup_ext}'
-        else:
-            backup_file_name = f'{backup_name}{backup_ext}' if not backup_name.endswith(backup_ext) else backup_name
+            record = get_backup_store(backup_dir).add(self.__config_system, self.config_file_path)
+            print('Created backup')
+
+            return record
+
+        backup_file_name = f'{backup_name}{backup_ext}' if not backup_name.endswith(backup_ext) else backup_name
 
         # Create the full path to the backup file.
         backup_file_path = backup_dir / backup_file_name
@@ -566,6 +735,250 @@ class ConfigFactory:
 
         print('Created backup')
 
+    def add_reload_callback(self, callback) -> None:
+        """
+        Register a callable to be called after the configuration is reloaded because its file changed on disk.
+
+        This starts watching the file (see :meth:`watch_file`) if it is not already being watched.
+
+        Parameters:
+            callback (Callable[[ConfigFactory], None]):
+                Called with this object, on the file watcher's thread.
+
+        Returns:
+            None
+        """
+        if callback not in self.__reload_callbacks:
+            self.__reload_callbacks.append(callback)
+
+        self.watch_file()
+
+    def remove_reload_callback(self, callback) -> None:
+        """
+        Stop calling a callable previously passed to :meth:`add_reload_callback`.
+
+        Parameters:
+            callback (Callable[[ConfigFactory], None]):
+                The callable to remove.
+
+        Returns:
+            None
+        """
+        if callback in self.__reload_callbacks:
+            self.__reload_callbacks.remove(callback)
+
+    def watch_file(self) -> None:
+        """
+        Watch the configuration file for changes made outside this object, e.g. in an editor.
+
+        When the contents of the file change, the configuration is reloaded (if :attr:`reload_file_on_change` is set)
+        and the callables registered with :meth:`add_reload_callback` are called. Writes made by :meth:`save_config`
+        are not reported. All configuration files share one watcher thread.
+
+        Returns:
+            None
+        """
+        if not self.__watching_file:
+            self.create_config_directory()
+            CONFIG_WATCHER.watch(self.config_file_path, self._on_file_changed)
+            self.__watching_file = True
+
+    def unwatch_file(self) -> None:
+        """
+        Stop watching the configuration file.
+
+        Returns:
+            None
+        """
+        if self.__watching_file:
+            CONFIG_WATCHER.unwatch(self.config_file_path, self._on_file_changed)
+            self.__watching_file = False
+
+    def _on_file_changed(self, path) -> None:
+        self.__file_modified = True
+
+        if not self.__reload_file_on_change:
+            return
+
+        self.reload_config()
+
+        for callback in list(self.__reload_callbacks):
+            callback(self)
+
+    def subscribe(self, key: str, callback, watch_file: Optional[bool] = True) -> None:
+        """
+        Register a callable to be called whenever the typed value of a key changes.
+
+        The callable is run after the value is set through attribute assignment, and after the configuration is
+        reloaded, reset or restored, but only if the value is different afterward. This lets running components
+        (pollers, samplers, the logger) pick up new settings without being restarted.
+
+        Example:
+            >>> def on_interval_change(key, old, new):
+            ...     sampler.interval = new
+            >>> CONFIG.subscribe('interval', on_interval_change)
+
+        Parameters:
+            key (str):
+                The configuration key.
+
+            callback (Callable[[str, Any, Any], None]):
+                Called with the key, the old value and the new value. When the change comes from the file being
+                edited, this runs on the file watcher's thread.
+
+            watch_file (bool):
+                If True, the configuration file is watched (see :meth:`watch_file`) so edits made to it are picked
+                up. Default is True.
+
+        Returns:
+            None
+        """
+        callbacks = self.__key_subscribers.setdefault(key, [])
+
+        if callback not in callbacks:
+            callbacks.append(callback)
+
+        if watch_file:
+            self.watch_file()
+
+    def unsubscribe(self, key: str, callback) -> None:
+        """
+        Stop calling a callable previously passed to :meth:`subscribe`.
+
+        Parameters:
+            key (str):
+                The configuration key.
+
+            callback (Callable[[str, Any, Any], None]):
+                The callable to remove.
+
+        Returns:
+            None
+        """
+        callbacks = self.__key_subscribers.get(key, [])
+
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+        if not callbacks:
+            self.__key_subscribers.pop(key, None)
+
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        """
+        Get an immutable snapshot of the committed configuration values.
+
+        A new snapshot is published (by swapping a single reference) whenever a change is committed: an attribute
+        assignment outside a transaction, the end of a transaction, or a load, reset or regeneration. Take the
+        snapshot once and read everything from it to get a consistent view; no lock is needed.
+
+        Example:
+            >>> snap = CONFIG.snapshot
+            >>> connect(snap.host, snap.port)
+
+        Returns:
+            ConfigSnapshot:
+                The current snapshot. Values are typed as in the specification; list, set and dict values are frozen.
+        """
+        snapshot = self.__snapshot
+
+        if snapshot is None:
+            snapshot = self._publish_snapshot()
+
+        return snapshot
+
+    def _publish_snapshot(self) -> ConfigSnapshot:
+        """
+        Build a snapshot of the current values and make it the published one.
+
+        Returns:
+            ConfigSnapshot:
+                The new snapshot.
+        """
+        spec = self.__config_spec
+        converters = spec.converters or {}
+        defaults = spec.defaults or {}
+        section = self.determine_section()
+
+        with self.__lock:
+            config = self.__config
+            values = {}
+
+            for key, converter in converters.items():
+                if config.has_section(section):
+                    raw = config.get(section, key, fallback=None)
+                else:
+                    raw = config.defaults().get(key)
+
+                if raw is None:
+                    raw = defaults.get(key)
+
+                try:
+                    values[key] = converter(raw) if raw is not None and converter is not None else None
+                except (TypeError, ValueError):
+                    values[key] = None
+
+            self.__snapshot_version += 1
+            snapshot = snapshot_class_for(self.__config_system, converters)(self.__snapshot_version, values)
+            self.__snapshot = snapshot
+
+        for listener in list(self.__snapshot_listeners):
+            listener(self, snapshot)
+
+        return snapshot
+
+    def add_snapshot_listener(self, listener) -> None:
+        """
+        Register a callable to be called each time a new snapshot is published (see :attr:`snapshot`).
+
+        Parameters:
+            listener (Callable[[ConfigFactory, ConfigSnapshot], None]):
+                Called with this object and the new snapshot, on the thread that committed the change.
+
+        Returns:
+            None
+        """
+        if listener not in self.__snapshot_listeners:
+            self.__snapshot_listeners.append(listener)
+
+    def remove_snapshot_listener(self, listener) -> None:
+        """
+        Stop calling a callable previously passed to :meth:`add_snapshot_listener`.
+
+        Parameters:
+            listener (Callable[[ConfigFactory, ConfigSnapshot], None]):
+                The callable to remove.
+
+        Returns:
+            None
+        """
+        if listener in self.__snapshot_listeners:
+            self.__snapshot_listeners.remove(listener)
+
+    def _commit_values(self) -> None:
+        """
+        Clear the value cache and publish a new snapshot after the configuration has changed wholesale.
+
+        Returns:
+            None
+        """
+        self.clear_value_cache()
+        self._publish_snapshot()
+
+    def clear_value_cache(self) -> None:
+        """
+        Forget the typed values cached by attribute reads.
+
+        The cache is cleared whenever the configuration is loaded, reset or regenerated, and entries are dropped as
+        they are set through attribute assignment. Call this after changing :attr:`config` directly.
+
+        Returns:
+            None
+        """
+        with self.__cache_lock:
+            self.__cache_generation += 1
+            self.__value_cache.clear()
+
     def create_config_directory(self, fail_if_exists=False) -> None:
         """
         Create the parent directory for the configuration (ini) file.
@@ -627,6 +1040,16 @@ class ConfigFactory:
             return 'CACHE'
         return 'USER'
 
+    def flush(self) -> None:
+        """
+        Write any changes waiting for a background save to disk now.
+
+        Returns:
+            None
+        """
+        if self.__saver is not None:
+            self.__saver.flush()
+
     def generate_config(self) -> None:
         """
         Generate a ConfigParser object from the configuration specification.
@@ -639,19 +1062,31 @@ class ConfigFactory:
         """
         if not self.defaults:
             raise ValueError("No defaults found in configuration specification.")
-        self.config['DEFAULT'] = self.defaults
+        with self._notifying_changes(), self.__lock:
+            self.config['DEFAULT'] = self.defaults
+            self._commit_values()
 
     def load_config(self) -> None:
         """
         Load the configuration from the INI file.
 
+        The file is parsed into a new parser first, which then replaces the current one under the lock, so a reload
+        (from the file watcher's thread, say) waits for an open :meth:`transaction` to finish rather than mixing the
+        file's values into it.
+
         Returns:
             None
         """
-        self.config.read(self.config_file_path)
-        self.__loaded_config = True
+        loaded = configparser.ConfigParser()
+        loaded.read(self.config_file_path)
+
+        with self._notifying_changes(), self.__lock:
+            self.__config = loaded
+            self.__loaded_config = True
+            self._commit_values()
 
         self.sync_config_with_spec()
+        write_snapshot_cache(self.__config_system, self.snapshot, self.config_file_path)
 
     def load_config_if_exists(self):
         """
@@ -707,8 +1142,7 @@ class ConfigFactory:
             None
 
         """
-        directory = str(self.config_file_path.parent)
-        os.startfile(directory)
+        open_in_default_app(self.config_file_path.parent)
 
     def open_config_file(
             self,
@@ -742,13 +1176,76 @@ class ConfigFactory:
         if not skip_wait_for_changes:
             self.__file_modified = wait_for_changes(self)
         else:
-            config_fp_str = str(self.config_file_path)
-            os.startfile(config_fp_str)
+            open_in_default_app(self.config_file_path)
             return
 
         if self.config_file_modified and not skip_reload_on_change:
             self.load_config()
 
+    @contextmanager
+    def transaction(self):
+        """
+        Stage several changes in memory and save them together.
+
+        Attribute assignments made inside the block are not saved one by one. When the outermost block exits
+        normally, any changes are saved with a single backup and a single write (if auto-saving is on). If it exits
+        with an exception, the configuration is rolled back to how it was when the block was entered, and the
+        exception is re-raised. Transactions can be nested; only the outermost one saves or rolls back.
+
+        Key subscribers (see :meth:`subscribe`) are not told about staged values: they are notified once, with each
+        key's value from before the block and its committed value, when the outermost block exits normally, and not
+        at all on rollback. The block holds the configuration's lock, so assignments from other threads wait until
+        it has committed or rolled back rather than joining it.
+
+        Example:
+            >>> with CONFIG.transaction():
+            ...     CONFIG.host = 'localhost'
+            ...     CONFIG.port = 8085
+
+        Yields:
+            ConfigFactory:
+                This object.
+        """
+        self.__lock.acquire()
+        outermost = not self.__batch_depth
+
+        if outermost:
+            staged_from = io.StringIO()
+            self.config.write(staged_from)
+            changed_before = self.__config_changed
+            self.__staged_before = {}
+
+        self.__batch_depth += 1
+
+        try:
+            yield self
+        except BaseException:
+            if outermost:
+                restored = configparser.ConfigParser()
+                restored.read_string(staged_from.getvalue())
+
+                # Subscribers never saw the staged values, so there is nothing to tell them.
+                self.__config = restored
+                self.__config_changed = changed_before
+                self.__staged_before = {}
+                self._commit_values()
+
+            raise
+        finally:
+            self.__batch_depth -= 1
+            self.__lock.release()
+
+        if outermost:
+            staged_before, self.__staged_before = self.__staged_before, {}
+            self._publish_snapshot()
+            self._notify_staged(staged_before)
+
+        if outermost and self.__config_changed and self.__auto_save:
+            self._auto_save()
+
+    # Alias, for readability where a group of settings is written at once.
+    batch = transaction
+
     def reload_config(self) -> None:
         """
         Reload the configuration from the INI file.
@@ -765,30 +1262,53 @@ class ConfigFactory:
         Returns:
             None
         """
-        self.config['USER'] = self.config['DEFAULT']
+        with self._notifying_changes(), self.__lock:
+            self.config['USER'] = self.config['DEFAULT']
+            self._commit_values()
+
         if not skip_save:
             self.save_config()
 
-    def restore_config_from_backup(self, backup_file: Union[str, Path] = None) -> None:
+    def restore_config_from_backup(
+            self,
+            backup_file: Union[str, Path, BackupRecord] = None,
+            backup_dir: Optional[Union[str, Path]] = FILE_SYSTEM_DEFAULTS['dirs']['config'] / 'backups',
+            ) -> None:
         """
         Restore the configuration from a backup file.
 
         Parameters:
-            backup_file (Union[str, Path]):
-                The path to the backup file to restore from, if no backup file is provided, the system will choose the
-                most recent backup file for restoration.
+            backup_file (Union[str, Path, BackupRecord]):
+                The path to the backup file to restore from, or a record from the backup store. If no backup is
+                provided, the most recent backup of this configuration system in the store is restored.
+
+            backup_dir (Union[str, Path]):
+                The directory holding the backup store.
 
         Returns:
             None
         """
+        if backup_file is None or isinstance(backup_file, BackupRecord):
+            store = get_backup_store(backup_dir)
+            record = backup_file or store.latest(self.__config_system)
+
+            if record is None:
+                raise FileNotFoundError(f"No backups found for '{self.__config_system}' in {store.root}")
+
+            with CONFIG_WATCHER.writing(self.config_file_path):
+                store.restore(record, self.config_file_path)
+
+            self.load_config()
+            return
+
         backup_file = Path(backup_file)
 
         if not backup_file.exists():
             raise FileNotFoundError(f"Backup file does not exist: {backup_file}")
 
         with open(backup_file, 'r') as backup:
-            with open(self.config_file_path, 'w') as config:
-                config.write(backup.read())
+            with CONFIG_WATCHER.writing(self.config_file_path):
+                atomic_write_text(self.config_file_path, backup.read())
 
         self.load_config()
 
@@ -817,11 +1337,18 @@ class ConfigFactory:
                 except FileExistsError as e:
                     warn(f"FileExistsError: {e} - Skipping backup.")
 
-            with open(self.config_file_path, 'w') as configfile:
-                self.config.write(configfile)
+            # Render under the lock so a concurrent change cannot be half-written, then write outside it.
+            with self.__lock:
+                rendered = io.StringIO()
+                self.config.write(rendered)
+                # Set directly; `__setattr__` does not pass assignments through to property setters.
+                self.__config_changed = False
+
+            # Write to a temporary file and swap it in, so a crash mid-write cannot leave a truncated file behind.
+            with CONFIG_WATCHER.writing(self.config_file_path):
+                atomic_write_text(self.config_file_path, rendered.getvalue())
 
-            if self.config_changed:
-                self.config_changed = False
+            write_snapshot_cache(self.__config_system, self.snapshot, self.config_file_path)
 
     def set_config_file_path(
             self,
@@ -0,0 +1,402 @@
+"""
+Sharing configuration snapshots with worker processes through shared memory.
+
+The parent process runs a :class:`SharedConfigPublisher`, which writes the snapshot of each configuration system (see
+:attr:`ConfigFactory.snapshot <inspy_hard_stat.config.factory.ConfigFactory.snapshot>`) into a
+:class:`multiprocessing.shared_memory.SharedMemory` segment every time a change is committed. Workers attach a
+:class:`SharedConfigReader` to the segment; they never open an INI file, and they can tell whether anything changed by
+comparing a version number.
+
+Segment layout (little-endian)::
+
+    0   uint64   sequence   even when stable, odd while the publisher is writing
+    8   uint64   length     length of the payload
+    16  bytes    payload    marshal-encoded {system: {option: value}}
+
+Readers use the sequence number as a seqlock: they read it, copy the payload, and read it again, retrying if it was odd
+or has changed. A reader's :attr:`~SharedConfigReader.version` is always that of a payload it has read this way. If
+the publisher dies part way through a write, the sequence stays odd; readers give up after :data:`READ_TIMEOUT`
+seconds, issue a warning and keep the last version they read.
+
+A commit whose snapshots no longer fit in the segment is not published; a warning is issued, and readers keep the last
+version that fitted. The segment cannot grow in place, as workers are already attached to it, so pass a larger
+``size`` to the publisher if this happens.
+
+Classes:
+    SharedConfigPublisher:
+        Publishes configuration snapshots to a shared memory segment.
+
+    SharedConfigReader:
+        Reads configuration snapshots from a shared memory segment.
+
+Since:
+    1.0.0
+"""
+import atexit
+import marshal
+import os
+import struct
+import threading
+import time
+from multiprocessing import shared_memory
+from pathlib import PurePath
+from types import MappingProxyType
+from typing import Iterable, Optional
+from warnings import warn
+
+from inspy_hard_stat.config.snapshot import ConfigSnapshot, snapshot_class_for
+
+
+SHARED_CONFIG_ENV_VAR = 'IHS_SHARED_CONFIG'
+"""The environment variable the publisher sets to the segment name, so worker processes can find it."""
+
+DEFAULT_SEGMENT_SIZE = 64 * 1024
+
+HEADER = struct.Struct('<QQ')
+
+READ_TIMEOUT = 1.0
+"""Seconds a reader retries a segment that is being written before giving up on that write."""
+
+# Names of the segments created by publishers in this process (or, after a fork, its parent), whose resource tracker
+# registration belongs to the publisher.
+_PUBLISHED_NAMES = set()
+
+
+def _plain(value):
+    # Convert snapshot values to types marshal can encode.
+    if isinstance(value, MappingProxyType):
+        return {key: _plain(item) for key, item in value.items()}
+
+    if isinstance(value, tuple):
+        return tuple(_plain(item) for item in value)
+
+    if isinstance(value, PurePath):
+        return str(value)
+
+    return value
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """
+    Attach to an existing segment without letting this process's resource tracker unlink it at exit.
+
+    Parameters:
+        name (str):
+            The name of the segment.
+
+    Returns:
+        shared_memory.SharedMemory
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 always registers the segment with the resource tracker, which would remove it when this
+        # process exits even though the publisher still owns it.
+        segment = shared_memory.SharedMemory(name=name)
+
+        # Attaching re-registered a name the publisher already had registered with this (possibly inherited) tracker;
+        # removing it here would make the publisher's unlink fail in the tracker.
+        if os.name == 'posix' and segment._name not in _PUBLISHED_NAMES:
+            from multiprocessing import resource_tracker
+
+            resource_tracker.unregister(segment._name, 'shared_memory')
+
+        return segment
+
+
+class SharedConfigPublisher:
+    """
+    Publishes configuration snapshots to a shared memory segment.
+
+    The segment is created when the publisher is, and removed by :meth:`close` (which also runs at exit).
+    """
+
+    def __init__(
+            self,
+            factories: Optional[Iterable] = None,
+            name: Optional[str] = None,
+            size: int = DEFAULT_SEGMENT_SIZE,
+            set_env: bool = True,
+            ):
+        """
+        Create the segment and publish the current snapshots.
+
+        Parameters:
+            factories (Iterable[ConfigFactory]):
+                The configuration objects to publish. Optional; default is every configuration object created so far.
+                Each is followed, so later commits are published automatically.
+
+            name (str):
+                The name of the segment. Optional; default is derived from this process's PID.
+
+            size (int):
+                The size of the segment, in bytes. Optional; default is :data:`DEFAULT_SEGMENT_SIZE`.
+
+            set_env (bool):
+                If True, :data:`SHARED_CONFIG_ENV_VAR` is set to the segment name, so child processes started
+                afterward can find it. Optional; default is True.
+        """
+        if factories is None:
+            from inspy_hard_stat.config.factory import ConfigFactory
+
+            factories = list(ConfigFactory._instances.values())
+
+        self.__factories = list(factories)
+        self.__lock = threading.Lock()
+        self.__sequence = 0
+        self.__segment = shared_memory.SharedMemory(
+                name=name or f'ihs_config_{os.getpid()}', create=True, size=size
+                )
+
+        HEADER.pack_into(self.__segment.buf, 0, 0, 0)
+        _PUBLISHED_NAMES.add(self.__segment._name)
+
+        if set_env:
+            os.environ[SHARED_CONFIG_ENV_VAR] = self.__segment.name
+
+        for factory in self.__factories:
+            factory.add_snapshot_listener(self._on_snapshot)
+
+        atexit.register(self.close)
+        self.publish()
+
+    @property
+    def name(self) -> str:
+        """
+        The name of the segment; pass it to :class:`SharedConfigReader` in the worker.
+
+        Returns:
+            str
+        """
+        return self.__segment.name
+
+    @property
+    def version(self) -> int:
+        """
+        The number of times the snapshots have been published.
+
+        Returns:
+            int
+        """
+        return self.__sequence // 2
+
+    def _on_snapshot(self, factory, snapshot: ConfigSnapshot) -> None:
+        # Runs inside whatever committed the change (an attribute assignment, say), which must not fail because of it.
+        try:
+            self.publish()
+        except ValueError as e:
+            warn(f'Shared config not published: {e}')
+
+    def publish(self) -> int:
+        """
+        Write the current snapshot of every followed configuration object to the segment.
+
+        Returns:
+            int:
+                The new version.
+
+        Raises:
+            ValueError:
+                Raised when the snapshots do not fit in the segment.
+        """
+        payload = marshal.dumps({
+                factory.config_system: {key: _plain(value) for key, value in factory.snapshot.as_dict().items()}
+                for factory in self.__factories
+                })
+
+        with self.__lock:
+            buf = self.__segment.buf
+
+            if buf is None:
+                raise ValueError('The shared config segment has been closed.')
+
+            if HEADER.size + len(payload) > len(buf):
+                raise ValueError(
+                        f'Config snapshot ({len(payload)} bytes) does not fit in the shared segment ({len(buf)} bytes)'
+                        )
+
+            # Odd sequence: readers retry until the write is finished.
+            self.__sequence += 1
+            HEADER.pack_into(buf, 0, self.__sequence, len(payload))
+            buf[HEADER.size:HEADER.size + len(payload)] = payload
+            self.__sequence += 1
+            HEADER.pack_into(buf, 0, self.__sequence, len(payload))
+
+        return self.version
+
+    def close(self) -> None:
+        """
+        Stop publishing and remove the segment.
+
+        Returns:
+            None
+        """
+        with self.__lock:
+            for factory in self.__factories:
+                factory.remove_snapshot_listener(self._on_snapshot)
+
+            self.__factories = []
+
+            if self.__segment.buf is None:
+                return
+
+            self.__segment.close()
+
+            try:
+                self.__segment.unlink()
+            except FileNotFoundError:
+                pass
+
+            _PUBLISHED_NAMES.discard(self.__segment._name)
+
+            if os.environ.get(SHARED_CONFIG_ENV_VAR) == self.__segment.name:
+                del os.environ[SHARED_CONFIG_ENV_VAR]
+
+
+class SharedConfigReader:
+    """
+    Reads configuration snapshots from a shared memory segment written by a :class:`SharedConfigPublisher`.
+
+    Decoding only happens when the version changes; between changes, :meth:`get` returns the same snapshot objects.
+    """
+
+    def __init__(self, name: Optional[str] = None):
+        """
+        Attach to the segment, read-only.
+
+        Parameters:
+            name (str):
+                The name of the segment. Optional; default is the value of :data:`SHARED_CONFIG_ENV_VAR`.
+
+        Raises:
+            FileNotFoundError:
+                Raised when no name is given and the environment variable is not set, or the segment does not exist.
+        """
+        name = name or os.environ.get(SHARED_CONFIG_ENV_VAR)
+
+        if not name:
+            raise FileNotFoundError(f'No shared config segment name given, and {SHARED_CONFIG_ENV_VAR} is not set.')
+
+        self.__segment = _attach(name)
+        self.__view = self.__segment.buf.toreadonly()
+        self.__abandoned_sequence = None
+        self.__sequence = None
+        self.__snapshots = {}
+
+    @property
+    def version(self) -> int:
+        """
+        The version most recently published, read (along with its snapshots) if it is new. It is always the version of
+        the snapshots :meth:`get` returns. Compare it with a previous value to see whether anything changed.
+
+        Returns:
+            int
+        """
+        if self.changed:
+            self._read()
+
+        return self.__sequence // 2
+
+    @property
+    def changed(self) -> bool:
+        """
+        Whether a new version has been published since this reader last decoded the snapshots.
+
+        Returns:
+            bool
+        """
+        return HEADER.unpack_from(self.__view, 0)[0] != self.__sequence
+
+    def _read(self) -> None:
+        """
+        Decode the published snapshots, if they are new.
+
+        Raises:
+            TimeoutError:
+                Raised when the publisher never finished writing the segment and nothing was read from it before.
+        """
+        view = self.__view
+        deadline = None
+
+        while True:
+            sequence, length = HEADER.unpack_from(view, 0)
+
+            if not sequence & 1:
+                payload = bytes(view[HEADER.size:HEADER.size + length])
+
+                if HEADER.unpack_from(view, 0)[0] == sequence:
+                    break
+            elif sequence != self.__abandoned_sequence:
+                if deadline is None:
+                    deadline = time.monotonic() + READ_TIMEOUT
+                elif time.monotonic() >= deadline:
+                    # The publisher has stopped part way through a write. Give up on it once, not on every read.
+                    self.__abandoned_sequence = sequence
+
+                    if self.__sequence is not None:
+                        warn(f'Shared config write {sequence} never finished; keeping version {self.__sequence // 2}.')
+
+            if sequence == self.__abandoned_sequence:
+                if self.__sequence is None:
+                    raise TimeoutError(f'Shared config write {sequence} never finished, and nothing was read before.')
+
+                return
+
+            time.sleep(0)
+
+        if sequence == self.__sequence:
+            return
+
+        values = marshal.loads(payload) if length else {}
+        version = sequence // 2
+
+        self.__snapshots = {
+                system: snapshot_class_for(system, options)(version, options)
+                for system, options in values.items()
+                }
+        self.__sequence = sequence
+
+    def get(self, config_system: str) -> ConfigSnapshot:
+        """
+        Get the latest snapshot of a configuration system.
+
+        Parameters:
+            config_system (str):
+                The name of the configuration system.
+
+        Returns:
+            ConfigSnapshot
+
+        Raises:
+            KeyError:
+                Raised when the system is not published.
+
+            TimeoutError:
+                Raised when the publisher died part way through its first write.
+        """
+        if self.changed:
+            self._read()
+
+        return self.__snapshots[config_system.lower()]
+
+    def snapshots(self) -> dict[str, ConfigSnapshot]:
+        """
+        Get the latest snapshot of every published configuration system.
+
+        Returns:
+            dict[str, ConfigSnapshot]
+        """
+        if self.changed:
+            self._read()
+
+        return dict(self.__snapshots)
+
+    def close(self) -> None:
+        """
+        Detach from the segment. The segment itself is left for the publisher to remove.
+
+        Returns:
+            None
+        """
+        self.__view.release()
+        self.__segment.close()
@@ -0,0 +1,271 @@
+"""
+Immutable snapshots of a configuration's typed values.
+
+A :class:`~inspy_hard_stat.config.factory.ConfigFactory` builds a new snapshot whenever a change is committed and
+swaps it in with a single reference assignment. Reader threads take :attr:`ConfigFactory.snapshot` once and read from
+that object; they need no lock, and every value they read comes from the same committed state, even if a save or
+reload is running at the same time.
+
+Each configuration system gets its own snapshot class, with one slot per option, so reading a value is a plain
+attribute lookup.
+
+Snapshots are also cached on disk as JSON whenever a configuration is loaded or saved. Short-lived entry points (such
+as ``inspy-hard-stat snapshot``) read the cache with :func:`read_snapshot_cache` instead of loading the configuration
+system; the cache is ignored once the INI file it came from changes.
+
+Classes:
+    ConfigSnapshot:
+        The base class of every snapshot class.
+
+Functions:
+    freeze_value(value):
+        Convert a value to an immutable equivalent.
+
+    snapshot_class_for(config_system, keys):
+        Get (creating if needed) the snapshot class for a configuration system.
+
+    write_snapshot_cache(config_system, snapshot, source):
+        Cache a snapshot's values on disk.
+
+    read_snapshot_cache(config_system):
+        Read cached snapshot values, if they are still current.
+
+Since:
+    1.0.0
+"""
+import json
+import os
+from pathlib import Path, PurePath
+from types import MappingProxyType
+from typing import Any, Iterable, Optional, Union
+
+
+SNAPSHOT_CACHE_DIR_NAME = 'config_snapshots'
+
+
+_SNAPSHOT_CLASSES = {}
+
+
+def freeze_value(value: Any) -> Any:
+    """
+    Convert a value to an immutable equivalent, so it can be shared between threads safely.
+
+    Parameters:
+        value (Any):
+            The value.
+
+    Returns:
+        Any:
+            Lists become tuples, sets become frozensets, dictionaries become read-only mappings and byte arrays become
+            bytes. Other values are returned unchanged.
+    """
+    if isinstance(value, list):
+        return tuple(freeze_value(item) for item in value)
+
+    if isinstance(value, set):
+        return frozenset(value)
+
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze_value(item) for key, item in value.items()})
+
+    if isinstance(value, bytearray):
+        return bytes(value)
+
+    return value
+
+
+class ConfigSnapshot:
+    """
+    The base class of every snapshot class.
+
+    Attributes:
+        version (int):
+            Increases by one with each snapshot published by the same configuration object.
+    """
+    __slots__ = ('version',)
+
+    KEYS = ()
+
+    def __init__(self, version: int, values: dict):
+        object.__setattr__(self, 'version', version)
+
+        for key in self.KEYS:
+            object.__setattr__(self, key, freeze_value(values.get(key)))
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"'{self.__class__.__name__}' objects are read-only")
+
+    def __delattr__(self, key):
+        raise AttributeError(f"'{self.__class__.__name__}' objects are read-only")
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.KEYS:
+            raise KeyError(key)
+
+        return getattr(self, key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.KEYS
+
+    def __iter__(self):
+        return iter(self.KEYS)
+
+    def __len__(self):
+        return len(self.KEYS)
+
+    def as_dict(self) -> dict:
+        """
+        Copy the values into a dictionary.
+
+        Returns:
+            dict:
+                The values, keyed by option name.
+        """
+        return {key: getattr(self, key) for key in self.KEYS}
+
+    def __repr__(self):
+        # Values are left out; some (passwords) should not end up in logs.
+        return f'<{self.__class__.__name__} v{self.version}: {", ".join(self.KEYS)}>'
+
+
+def snapshot_class_for(config_system: str, keys: Iterable[str]) -> type:
+    """
+    Get (creating if needed) the snapshot class for a configuration system.
+
+    Parameters:
+        config_system (str):
+            The name of the configuration system.
+
+        keys (Iterable[str]):
+            The option names.
+
+    Returns:
+        type:
+            A :class:`ConfigSnapshot` subclass with one slot per option.
+    """
+    keys = tuple(keys)
+    cache_key = (config_system, keys)
+    cls = _SNAPSHOT_CLASSES.get(cache_key)
+
+    if cls is None:
+        name = ''.join(part.capitalize() for part in config_system.split('_')) + 'ConfigSnapshot'
+        cls = _SNAPSHOT_CLASSES[cache_key] = type(name, (ConfigSnapshot,), {'__slots__': keys, 'KEYS': keys})
+
+    return cls
+
+
+def get_snapshot_cache_path(config_system: str) -> Path:
+    """
+    Get the path of the on-disk cache of a configuration system's snapshot.
+
+    Parameters:
+        config_system (str):
+            The name of the configuration system.
+
+    Returns:
+        Path
+    """
+    from inspy_hard_stat.config.constants import FILE_SYSTEM_DEFAULTS
+
+    return Path(FILE_SYSTEM_DEFAULTS['dirs']['cache']) / SNAPSHOT_CACHE_DIR_NAME / f'{config_system.lower()}.json'
+
+
+def _source_stamp(source: Union[str, Path]) -> Optional[list]:
+    try:
+        stat = os.stat(source)
+    except OSError:
+        return None
+
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _json_default(value):
+    if isinstance(value, MappingProxyType):
+        return dict(value)
+
+    if isinstance(value, frozenset):
+        return sorted(value, key=str)
+
+    if isinstance(value, (PurePath, bytes)):
+        return str(value)
+
+    raise TypeError(f'Cannot encode {type(value).__name__} in a config snapshot cache')
+
+
+def write_snapshot_cache(config_system: str, snapshot: ConfigSnapshot, source: Union[str, Path]) -> bool:
+    """
+    Cache a snapshot's values on disk, stamped with the modification time and size of the INI file they came from.
+
+    Parameters:
+        config_system (str):
+            The name of the configuration system.
+
+        snapshot (ConfigSnapshot):
+            The snapshot.
+
+        source (Union[str, Path]):
+            The INI file the values were loaded from or saved to.
+
+    The cache is left alone if it already holds the same values and stamp, so loading an unchanged configuration does
+    not write to disk.
+
+    Returns:
+        bool:
+            True if the cache is up to date; False if the source file does not exist or the cache could not be written.
+    """
+    from inspy_hard_stat.config.utils import atomic_write_text
+
+    stamp = _source_stamp(source)
+
+    if stamp is None:
+        return False
+
+    cache_path = get_snapshot_cache_path(config_system)
+
+    try:
+        rendered = json.dumps(
+                {'source': str(source), 'stamp': stamp, 'values': snapshot.as_dict()},
+                default=_json_default,
+                )
+    except TypeError:
+        return False
+
+    try:
+        if cache_path.read_text(encoding='utf-8') == rendered:
+            return True
+    except (OSError, ValueError):
+        pass
+
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(cache_path, rendered)
+    except OSError:
+        return False
+
+    return True
+
+
+def read_snapshot_cache(config_system: str) -> Optional[dict]:
+    """
+    Read a configuration system's cached snapshot values, if the INI file they came from has not changed since.
+
+    Only :mod:`json` and :mod:`os` are needed; the configuration system itself is not loaded.
+
+    Parameters:
+        config_system (str):
+            The name of the configuration system.
+
+    Returns:
+        Optional[dict]:
+            The values, keyed by option name; None if there is no cache or it is out of date.
+    """
+    try:
+        with open(get_snapshot_cache_path(config_system), 'r', encoding='utf-8') as cache:
+            cached = json.load(cache)
+
+        if _source_stamp(cached['source']) != cached['stamp']:
+            return None
+
+        return cached['values']
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
@@ -1,6 +1,32 @@
+"""
+Configuration specifications, loaded on first use.
+
+Every spec file is compiled into one bundle (:data:`SPEC_BUNDLE_FILE_NAME`, in the user cache directory) holding the
+parsed specs with their defaults already extracted. The bundle is keyed by the size and modification time of each
+spec file, so it is rebuilt automatically when any of them changes, and otherwise loads every spec with a single read.
+No spec is touched until a configuration system asks for it.
+
+Classes:
+    ConfigSpec:
+        The specification for one configuration system.
+
+    LazyConfigSpecs:
+        A read-only mapping of system names to specs, building each spec when it is first looked up.
+
+Functions:
+    load_spec_bundle():
+        Load (building if needed) the compiled bundle of every spec.
+
+Since:
+    1.0.0
+"""
 import json
+import marshal
+import os
+from collections.abc import Mapping
 from dataclasses import dataclass, asdict
 from pathlib import Path
+from typing import Optional
 
 
 CONFIG_SYSTEM_NAMES = [
@@ -29,6 +55,124 @@ class SpecFiles:
 
 SPEC_FILE_PATHS = SpecFiles()
 
+SPEC_BUNDLE_FILE_NAME = 'config_specs.marshal'
+
+SPEC_BUNDLE_FORMAT = 1
+
+_SPEC_BUNDLE = None
+
+
+def extract_defaults(spec: dict) -> dict:
+    """
+    Extract the default values from a configuration specification, as the strings written to an INI file.
+
+    Parameters:
+        spec (dict):
+            The specification.
+
+    Returns:
+        dict:
+            The default values, keyed by option name.
+    """
+    defaults = {}
+
+    for key, value in spec.items():
+        default_value = value.get('default', '')
+        defaults[key] = str(default_value) if default_value is not None else ''
+
+    return defaults
+
+
+def get_spec_bundle_path() -> Path:
+    """
+    Get the path of the compiled spec bundle.
+
+    Returns:
+        Path
+    """
+    from inspy_hard_stat.config.constants import FILE_SYSTEM_DEFAULTS
+
+    return Path(FILE_SYSTEM_DEFAULTS['dirs']['cache']) / SPEC_BUNDLE_FILE_NAME
+
+
+def _spec_files_fingerprint() -> tuple:
+    fingerprint = [SPEC_BUNDLE_FORMAT]
+
+    for system, file_path in sorted(asdict(SPEC_FILE_PATHS).items()):
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            fingerprint.append((system, None, None))
+        else:
+            fingerprint.append((system, stat.st_size, stat.st_mtime_ns))
+
+    return tuple(fingerprint)
+
+
+def _compile_spec_bundle(fingerprint: tuple) -> dict:
+    systems = {}
+
+    for system, file_path in asdict(SPEC_FILE_PATHS).items():
+        try:
+            with open(file_path, 'r') as f:
+                spec = json.load(f)
+        except FileNotFoundError:
+            continue
+
+        systems[system] = {
+                'spec':     spec,
+                'defaults': extract_defaults(spec),
+                'types':    {key: value.get('type') for key, value in spec.items()},
+                }
+
+    return {'fingerprint': fingerprint, 'systems': systems}
+
+
+def load_spec_bundle(bundle_path: Optional[Path] = None) -> dict:
+    """
+    Load the compiled bundle of every configuration spec, building (and saving) it if it is missing or out of date.
+
+    The bundle is only read once per process.
+
+    Parameters:
+        bundle_path (Path):
+            Where the bundle is kept. Optional; default is :func:`get_spec_bundle_path`.
+
+    Returns:
+        dict:
+            ``{system: {'spec': dict, 'defaults': dict, 'types': dict}}``.
+    """
+    global _SPEC_BUNDLE
+
+    if _SPEC_BUNDLE is not None:
+        return _SPEC_BUNDLE
+
+    bundle_path = Path(bundle_path or get_spec_bundle_path())
+    fingerprint = _spec_files_fingerprint()
+    bundle = None
+
+    try:
+        with open(bundle_path, 'rb') as f:
+            bundle = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        bundle = None
+
+    if not isinstance(bundle, dict) or bundle.get('fingerprint') != fingerprint:
+        bundle = _compile_spec_bundle(fingerprint)
+
+        try:
+            from inspy_hard_stat.config.utils import atomic_write_bytes
+
+            bundle_path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_bytes(bundle_path, marshal.dumps(bundle))
+        except OSError:
+            # The bundle is only a cache; carry on without it.
+            pass
+
+    _SPEC_BUNDLE = bundle['systems']
+
+    return _SPEC_BUNDLE
+
 
 class ConfigSpec:
     SPEC_DIR = get_file_dir()
@@ -54,6 +198,7 @@ class ConfigSpec:
         if not hasattr(self, '_initialized'):
             self._initialized = True
             self.__config_system = None
+            self.__converters = None
             self.__defaults = None
             self.__file_path = None
             self.__spec = None
@@ -77,10 +222,26 @@ class ConfigSpec:
             raise InvalidConfigSystemError(new, CONFIG_SYSTEM_NAMES)
         self.__config_system = new
 
+    @property
+    def converters(self) -> dict:
+        """
+        The callables that convert each option's string value to its specified type.
+
+        Returns:
+            dict:
+                The converters, keyed by option name.
+        """
+        if self.__converters is None and self.spec is not None:
+            from inspy_hard_stat.config.utils import get_converter
+
+            self.__converters = {key: get_converter(value.get('type')) for key, value in self.spec.items()}
+
+        return self.__converters
+
     @property
     def defaults(self):
 
-        if not self.__defaults and self.__spec:
+        if not self.__defaults and self.spec:
             self.__defaults = self._extract_defaults()
 
         return self.__defaults
@@ -96,7 +257,13 @@ class ConfigSpec:
     def spec(self):
 
         if not self.__spec and self.file_path:
-            self.__spec = self._load_spec_from_file()
+            compiled = load_spec_bundle().get(self.config_system)
+
+            if compiled is not None:
+                self.__spec = compiled['spec']
+                self.__defaults = compiled['defaults']
+            else:
+                self.__spec = self._load_spec_from_file()
 
         return self.__spec
 
@@ -118,13 +285,7 @@ class ConfigSpec:
         Returns:
             dict: A dictionary of default values from the configuration specification.
         """
-        defaults = {}
-
-        for key, value in self.spec.items():
-            default_value = value.get('default', '')
-            defaults[key] = str(default_value) if default_value is not None else ''
-
-        return defaults
+        return extract_defaults(self.spec)
 
     def __str__(self):
 
@@ -135,26 +296,34 @@ class ConfigSpec:
         return f'<ConfigSpec: {self.config_system} | @{hex(id(self))}>'
 
 
-def are_specs_loaded():
-    return hasattr(globals(), 'CONFIG_SPECS')
+class LazyConfigSpecs(Mapping):
+    """
+    A read-only mapping of configuration system names to :class:`ConfigSpec` objects.
 
+    Each spec is only built when it is first looked up, so systems that are never used cost nothing.
+    """
 
-def get_config_specs():
-    if not are_specs_loaded():
-        globals()['CONFIG_SPECS'] = {}
-        for system in CONFIG_SYSTEM_NAMES:
-            globals()['CONFIG_SPECS'][system] = ConfigSpec(system)
+    def __getitem__(self, config_system: str) -> ConfigSpec:
+        if config_system.lower() not in CONFIG_SYSTEM_NAMES:
+            raise KeyError(config_system)
 
-    return globals()['CONFIG_SPECS']
+        return ConfigSpec(config_system)
 
+    def __iter__(self):
+        return iter(CONFIG_SYSTEM_NAMES)
 
-if not are_specs_loaded():
-    CONFIG_SPECS = get_config_specs()
-    del get_config_specs
-    del are_specs_loaded
+    def __len__(self):
+        return len(CONFIG_SYSTEM_NAMES)
+
+    def __repr__(self):
+        return f'<LazyConfigSpecs: {", ".join(CONFIG_SYSTEM_NAMES)}>'
+
+
+CONFIG_SPECS = LazyConfigSpecs()
 
 __all__ = [
         'ConfigSpec',
         'CONFIG_SPECS',
-
+        'LazyConfigSpecs',
+        'load_spec_bundle',
         ]
@@ -1,4 +1,8 @@
+import os
+import stat
+import tempfile
 from pathlib import Path
+from typing import Union
 
 BOOLEAN_VALUES = {
         'true': True,
@@ -47,6 +51,9 @@ def bool_lookup(value):
         bool:
             The boolean value that corresponds to the given value.
     """
+    if isinstance(value, str):
+        value = value.strip().lower()
+
     return BOOLEAN_VALUES.get(value)
 
 
@@ -65,6 +72,24 @@ def type_lookup(type_name: str):
     return TYPE_MAPPING.get(type_name)
 
 
+def get_converter(type_name: str):
+    """
+    Get the callable that converts a string to the given type.
+
+    Parameters:
+        type_name (str):
+            The name of the type.
+
+    Returns:
+        Callable:
+            The converter. For booleans this is :func:`bool_lookup`, so that ``'false'`` converts to False.
+    """
+    if type_name in ('bool', 'boolean'):
+        return bool_lookup
+
+    return type_lookup(type_name)
+
+
 def convert_str_to_type(value: str, type_name: str):
     """
     Converts a string to the given type.
@@ -102,3 +127,86 @@ def is_default_value(config, key, value):
         bool: True if the value is the default value for the key in the configuration, False otherwise.
     """
     return config.config.get('DEFAULT', key) == value
+
+
+def _read_umask() -> int:
+    # os.umask() can only be read by setting it, so this is done once, at import.
+    umask = os.umask(0o022)
+    os.umask(umask)
+
+    return umask
+
+
+_UMASK = _read_umask()
+
+
+def atomic_write_bytes(file_path: Union[str, Path], data: bytes) -> None:
+    """
+    Write bytes to a file so that readers (and a crash) only ever see the old contents or the new ones.
+
+    The data is written to a temporary file in the same directory, flushed to disk, and then moved over the target
+    with :func:`os.replace`. The file keeps the permissions it had; a new file gets the usual ones for this process's
+    umask, rather than the owner-only ones temporary files are created with.
+
+    Parameters:
+        file_path (Union[str, Path]):
+            The file to write.
+
+        data (bytes):
+            The new contents of the file.
+
+    Returns:
+        None
+    """
+    file_path = Path(file_path)
+
+    try:
+        mode = stat.S_IMODE(os.stat(file_path).st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+
+    fd, temp_path = tempfile.mkstemp(dir=file_path.parent, prefix=f'.{file_path.name}.', suffix='.tmp')
+
+    try:
+        with os.fdopen(fd, 'wb') as temp_file:
+            if hasattr(os, 'fchmod'):
+                os.fchmod(temp_file.fileno(), mode)
+
+            temp_file.write(data)
+            temp_file.flush()
+            os.fsync(temp_file.fileno())
+
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except FileNotFoundError:
+            pass
+
+        raise
+
+    if hasattr(os, 'O_DIRECTORY'):
+        # Make the rename itself durable.
+        dir_fd = os.open(file_path.parent, os.O_RDONLY | os.O_DIRECTORY)
+
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def atomic_write_text(file_path: Union[str, Path], text: str) -> None:
+    """
+    Write text to a file atomically; see :func:`atomic_write_bytes`.
+
+    Parameters:
+        file_path (Union[str, Path]):
+            The file to write.
+
+        text (str):
+            The new contents of the file.
+
+    Returns:
+        None
+    """
+    atomic_write_bytes(file_path, text.replace('\n', os.linesep).encode())
@@ -0,0 +1,273 @@
+"""
+Event-driven watching of configuration files.
+
+One :class:`ConfigWatcher` (normally the shared :data:`CONFIG_WATCHER`) runs a single :mod:`watchdog` observer, which
+uses inotify, FSEvents or ReadDirectoryChangesW as the platform provides; no thread polls any file. Directories are
+watched rather than files, because most editors save by writing a new file and renaming it over the old one.
+
+Callbacks for a file are only run when its contents actually change, judged by a hash of the contents; saves that
+write the same bytes, and touches, are ignored.
+
+Classes:
+    ConfigWatcher:
+        Watches files and calls back when their contents change.
+
+Functions:
+    file_digest(file_path):
+        Hash the contents of a file.
+
+Since:
+    1.0.0
+"""
+import hashlib
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+
+EMPTY_DIGEST = hashlib.sha256(b'').hexdigest()
+
+FileChangeCallback = Callable[[Path], None]
+
+
+def file_digest(file_path: Union[str, Path]) -> Optional[str]:
+    """
+    Hash the contents of a file.
+
+    Parameters:
+        file_path (Union[str, Path]):
+            The file to hash.
+
+    Returns:
+        Optional[str]:
+            The SHA-256 hex digest of the contents, or None if the file does not exist.
+    """
+    try:
+        with open(file_path, 'rb') as file:
+            return hashlib.sha256(file.read()).hexdigest()
+    except (FileNotFoundError, IsADirectoryError):
+        return None
+
+
+class _DirectoryHandler(FileSystemEventHandler):
+    def __init__(self, watcher: 'ConfigWatcher'):
+        self.watcher = watcher
+
+    def on_any_event(self, event):
+        if event.is_directory:
+            return
+
+        for path in (getattr(event, 'src_path', None), getattr(event, 'dest_path', None)):
+            if path:
+                self.watcher.check(path)
+
+
+class ConfigWatcher:
+    """
+    Watches files and calls back when their contents change.
+    """
+
+    def __init__(self):
+        self.__callbacks = {}
+        self.__digests = {}
+        self.__lock = threading.RLock()
+        self.__observer = None
+        self.__watches = {}
+
+    @property
+    def is_running(self) -> bool:
+        """
+        Whether the observer thread is running.
+
+        Returns:
+            bool
+        """
+        return self.__observer is not None and self.__observer.is_alive()
+
+    @property
+    def watched_files(self) -> list[Path]:
+        """
+        The files being watched.
+
+        Returns:
+            list[Path]
+        """
+        return [Path(path) for path in self.__callbacks]
+
+    @staticmethod
+    def _key(file_path: Union[str, Path]) -> str:
+        return str(Path(file_path).expanduser().resolve().absolute())
+
+    def _ensure_observer(self) -> Observer:
+        if self.__observer is None:
+            self.__observer = Observer()
+            self.__observer.daemon = True
+            self.__observer.start()
+
+        return self.__observer
+
+    def watch(self, file_path: Union[str, Path], callback: FileChangeCallback) -> None:
+        """
+        Call a callable whenever the contents of a file change.
+
+        Parameters:
+            file_path (Union[str, Path]):
+                The file to watch. Its directory must exist.
+
+            callback (Callable[[Path], None]):
+                Called with the path of the file, on the observer's thread.
+
+        Returns:
+            None
+        """
+        key = self._key(file_path)
+        directory = str(Path(key).parent)
+
+        with self.__lock:
+            callbacks = self.__callbacks.setdefault(key, [])
+
+            if callback not in callbacks:
+                callbacks.append(callback)
+
+            if key not in self.__digests:
+                self.__digests[key] = file_digest(key)
+
+            if directory not in self.__watches:
+                observer = self._ensure_observer()
+                self.__watches[directory] = observer.schedule(_DirectoryHandler(self), directory, recursive=False)
+
+    def unwatch(self, file_path: Union[str, Path], callback: Optional[FileChangeCallback] = None) -> None:
+        """
+        Stop calling back for a file.
+
+        Parameters:
+            file_path (Union[str, Path]):
+                The file.
+
+            callback (Callable[[Path], None]):
+                The callable to remove. Optional; if not provided, every callable for the file is removed.
+
+        Returns:
+            None
+        """
+        key = self._key(file_path)
+        directory = str(Path(key).parent)
+
+        with self.__lock:
+            callbacks = self.__callbacks.get(key, [])
+
+            if callback is None:
+                callbacks.clear()
+            elif callback in callbacks:
+                callbacks.remove(callback)
+
+            if callbacks:
+                return
+
+            self.__callbacks.pop(key, None)
+            self.__digests.pop(key, None)
+
+            if not any(str(Path(other).parent) == directory for other in self.__callbacks):
+                watch = self.__watches.pop(directory, None)
+
+                if watch is not None and self.__observer is not None:
+                    self.__observer.unschedule(watch)
+
+    def acknowledge(self, file_path: Union[str, Path], contents: Optional[bytes] = None) -> None:
+        """
+        Record the current contents of a watched file without calling back, e.g. after writing it ourselves.
+
+        Parameters:
+            file_path (Union[str, Path]):
+                The file.
+
+            contents (bytes):
+                The contents just written. Optional; the file is read if not provided.
+
+        Returns:
+            None
+        """
+        key = self._key(file_path)
+
+        with self.__lock:
+            if key in self.__callbacks:
+                self.__digests[key] = (
+                        hashlib.sha256(contents).hexdigest() if contents is not None else file_digest(key)
+                        )
+
+    @contextmanager
+    def writing(self, file_path: Union[str, Path]):
+        """
+        Hold off change checks while we write a watched file ourselves, then acknowledge what was written.
+
+        Parameters:
+            file_path (Union[str, Path]):
+                The file about to be written.
+        """
+        with self.__lock:
+            yield
+            self.acknowledge(file_path)
+
+    def check(self, file_path: Union[str, Path]) -> bool:
+        """
+        Check whether a watched file's contents have changed, and call back if they have.
+
+        Called by the observer; can also be called directly.
+
+        Parameters:
+            file_path (Union[str, Path]):
+                The file.
+
+        Returns:
+            bool:
+                True if the contents changed, False otherwise (or if the file is not being watched).
+        """
+        key = self._key(file_path)
+
+        with self.__lock:
+            if key not in self.__callbacks:
+                return False
+
+            digest = file_digest(key)
+
+            # An empty file is most likely an editor part-way through rewriting it in place; wait for the contents.
+            if digest is None or digest == EMPTY_DIGEST or digest == self.__digests.get(key):
+                return False
+
+            self.__digests[key] = digest
+            callbacks = list(self.__callbacks[key])
+
+        for callback in callbacks:
+            callback(Path(key))
+
+        return True
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop the observer thread and forget every watch.
+
+        Parameters:
+            timeout (float):
+                The longest time to wait for the thread to finish, in seconds. Optional.
+
+        Returns:
+            None
+        """
+        with self.__lock:
+            observer = self.__observer
+            self.__observer = None
+            self.__callbacks.clear()
+            self.__digests.clear()
+            self.__watches.clear()
+
+        if observer is not None:
+            observer.stop()
+            observer.join(timeout)
+
+
+CONFIG_WATCHER = ConfigWatcher()
+"""The watcher shared by every configuration object."""
@@ -1,14 +1,41 @@
-import requests
-from requests.auth import HTTPBasicAuth
-from inspy_hard_stat.ihs_lib.libre_hw_monitor.config import CONFIG
-from inspy_hard_stat.config.utils import is_default_value
-from prompt_toolkit.shortcuts.dialogs import input_dialog
+"""
+The hardware-statistics library.
 
+Importing this package is cheap: subpackages such as :mod:`~inspy_hard_stat.ihs_lib.process` can be imported without
+loading the LibreHardwareMonitor configuration, :mod:`requests` or :mod:`prompt_toolkit`. Those are imported the first
+time the helpers below need them; ``CONFIG`` and ``HOST`` are provided lazily (PEP 562).
 
-HOST = CONFIG.host
+Functions:
+    authentication_dialog():
+        Ask the user for credentials for the LibreHardwareMonitor web server.
+
+    authenticate_user(config=None):
+        Get credentials from the configuration, asking the user if they are not set.
+
+    request_data(url=None, port=None):
+        Request the sensor data from the LibreHardwareMonitor web server.
+
+Since:
+    1.0.0
+"""
+
+
+def __getattr__(name):
+    if name == 'CONFIG':
+        from inspy_hard_stat.ihs_lib.libre_hw_monitor.config import CONFIG
+
+        return CONFIG
+
+    if name == 'HOST':
+        return __getattr__('CONFIG').host
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 
 def authentication_dialog():
+    from prompt_toolkit.shortcuts.dialogs import input_dialog
+    from requests.auth import HTTPBasicAuth
+
     user_name = input_dialog(
         title="Authentication",
         text="Enter your username",
@@ -23,7 +50,11 @@ def authentication_dialog():
     return HTTPBasicAuth(user_name, password)
 
 
-def authenticate_user(config=CONFIG):
+def authenticate_user(config=None):
+    from inspy_hard_stat.config.utils import is_default_value
+
+    config = config or __getattr__('CONFIG')
+
     if is_default_value(config.user_name) or is_default_value(config.password):
         http_auth = authentication_dialog()
         config.user_name = http_auth.username
@@ -38,8 +69,10 @@ def authenticate_user(config=CONFIG):
 
 
 
-def request_data(url=HOST, port=CONFIG.port):
-    url = f'{url}:{port}/data.json'
+def request_data(url=None, port=None):
+    import requests
+
+    url = f'{url or __getattr__("HOST")}:{port or __getattr__("CONFIG").port}/data.json'
 
     http_auth = authentication_dialog()
 
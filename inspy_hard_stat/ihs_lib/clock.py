@@ -0,0 +1,259 @@
+"""
+A drift-free clock for periodic sampling.
+
+A loop that does ``sleep(interval)`` after its work runs a little slower than ``interval``, and drifts further every
+tick. :class:`TickClock` instead computes every tick's deadline up front, on :func:`time.monotonic`, so time spent
+working is absorbed rather than accumulated.
+
+By default ticks are aligned to wall-clock boundaries: with a 5 second interval they fall at :00, :05, :10 and so on,
+on every host. Each :class:`Tick` carries the boundary it belongs to as well as paired monotonic and wall-clock stamps
+of when it actually fired, so samples from different hosts can be joined on the boundary exactly, and how late each
+sample was is known.
+
+A tick that is a whole interval (or more) late does not cause the missed ticks to fire back to back; they are skipped,
+and counted.
+
+Classes:
+    Tick:
+        One tick of a :class:`TickClock`.
+
+    TickClock:
+        Ticks on monotonic deadlines, optionally aligned to wall-clock boundaries.
+
+Functions:
+    stamp():
+        Read the monotonic and wall clocks together.
+
+Since:
+    1.0.0
+"""
+import math
+import threading
+import time
+from typing import Iterator, NamedTuple, Optional
+
+
+WALL_STEP_THRESHOLD = 0.25
+"""
+Seconds by which the wall clock must jump relative to the monotonic clock (an NTP step, a manual change) for an aligned
+clock to realign its deadlines.
+"""
+
+
+class Tick(NamedTuple):
+    """
+    One tick of a :class:`TickClock`.
+
+    Attributes:
+        index (int):
+            The tick's number. For an aligned clock this is the boundary's number since the epoch
+            (``scheduled / interval``), the same on every host; otherwise it counts from 0.
+
+        scheduled (float):
+            The wall-clock time the tick was due at; for an aligned clock, an exact multiple of the interval (plus
+            the clock's offset).
+
+        mono (float):
+            The :func:`time.monotonic` time the tick fired.
+
+        wall (float):
+            The :func:`time.time` time the tick fired, read together with ``mono``.
+
+        lateness (float):
+            Seconds between the deadline and when the tick fired; always less than the interval.
+
+        skipped (int):
+            The number of ticks skipped, because they were missed, just before this one.
+    """
+    index: int
+    scheduled: float
+    mono: float
+    wall: float
+    lateness: float
+    skipped: int
+
+
+def stamp() -> tuple[float, float]:
+    """
+    Read the monotonic and wall clocks together.
+
+    Returns:
+        tuple[float, float]:
+            The :func:`time.monotonic` and :func:`time.time` readings.
+    """
+    return time.monotonic(), time.time()
+
+
+class TickClock:
+    """
+    Ticks on monotonic deadlines, optionally aligned to wall-clock boundaries.
+
+    :meth:`wait` blocks until the next tick; :attr:`next_deadline` and :meth:`tick` let a scheduler that waits on
+    several clocks at once do the waiting itself.
+
+    Example:
+        >>> clock = TickClock(5)
+        >>> for tick in clock:
+        ...     record = {'at': tick.scheduled, 'late': tick.lateness, **take_snapshot()}
+    """
+
+    def __init__(self, interval: float, align: bool = True, delay: float = 0.0, offset: float = 0.0):
+        """
+        Initialize the clock. The first tick is the first one due at least ``delay`` seconds from now.
+
+        Parameters:
+            interval (float):
+                Seconds between ticks.
+
+            align (bool):
+                If True, ticks fall on wall-clock multiples of ``interval`` (plus ``offset``); if False, the first
+                tick is due ``delay`` seconds from now. Optional; default is True.
+
+            delay (float):
+                Seconds before the first tick may be due. Optional; default is 0.
+
+            offset (float):
+                With ``align``, seconds to shift the boundaries by; e.g. 30 with a 60 second interval ticks at half
+                past every minute. Optional; default is 0.
+
+        Raises:
+            ValueError:
+                Raised when the interval is not positive.
+        """
+        if interval <= 0:
+            raise ValueError(f'The interval must be greater than 0 (got {interval}).')
+
+        self.__align = align
+        self.__interval = interval
+        self.__max_lateness = 0.0
+        self.__skipped = 0
+        self.__ticks = 0
+
+        anchor_mono, anchor_wall = stamp()
+        self.__anchor(anchor_mono, anchor_wall)
+
+        if align:
+            self.__base = offset
+            self.__index = math.ceil((anchor_wall + delay - offset) / interval)
+        else:
+            self.__base = anchor_wall + delay
+            self.__index = 0
+
+    def __anchor(self, mono: float, wall: float) -> None:
+        self.__anchor_mono = mono
+        self.__anchor_wall = wall
+
+    def __scheduled(self, index: int) -> float:
+        return self.__base + index * self.__interval
+
+    def __deadline(self, index: int) -> float:
+        return self.__anchor_mono + (self.__scheduled(index) - self.__anchor_wall)
+
+    @property
+    def interval(self) -> float:
+        """
+        Seconds between ticks.
+
+        Returns:
+            float
+        """
+        return self.__interval
+
+    @property
+    def max_lateness(self) -> float:
+        """
+        The greatest lateness of any tick so far, in seconds.
+
+        Returns:
+            float
+        """
+        return self.__max_lateness
+
+    @property
+    def next_deadline(self) -> float:
+        """
+        When the next tick is due, on the :func:`time.monotonic` clock.
+
+        Returns:
+            float
+        """
+        return self.__deadline(self.__index)
+
+    @property
+    def skipped(self) -> int:
+        """
+        The number of ticks skipped so far.
+
+        Returns:
+            int
+        """
+        return self.__skipped
+
+    @property
+    def ticks(self) -> int:
+        """
+        The number of ticks so far.
+
+        Returns:
+            int
+        """
+        return self.__ticks
+
+    def tick(self) -> Tick:
+        """
+        Take the next tick now, without waiting; call it once :attr:`next_deadline` has passed.
+
+        Returns:
+            Tick
+        """
+        mono, wall = stamp()
+        interval = self.__interval
+        index = self.__index
+        deadline = self.__deadline(index)
+        skipped = 0
+
+        if mono - deadline >= interval:
+            skipped = int((mono - deadline) // interval)
+            index += skipped
+            deadline = self.__deadline(index)
+
+        lateness = max(mono - deadline, 0.0)
+        tick = Tick(index, round(self.__scheduled(index), 6), mono, wall, lateness, skipped)
+
+        self.__index = index + 1
+        self.__max_lateness = max(self.__max_lateness, lateness)
+        self.__skipped += skipped
+        self.__ticks += 1
+
+        if self.__align and abs((wall - mono) - (self.__anchor_wall - self.__anchor_mono)) > WALL_STEP_THRESHOLD:
+            # The wall clock was stepped; keep the ticks on its boundaries.
+            self.__anchor(mono, wall)
+            self.__index = math.ceil((wall - self.__base) / interval)
+
+        return tick
+
+    def wait(self, stop_event: Optional[threading.Event] = None) -> Optional[Tick]:
+        """
+        Wait for the next tick and take it.
+
+        Parameters:
+            stop_event (threading.Event):
+                Stop waiting when set. Optional.
+
+        Returns:
+            Optional[Tick]:
+                The tick, or None if ``stop_event`` was set first.
+        """
+        remaining = self.next_deadline - time.monotonic()
+
+        if stop_event is None:
+            if remaining > 0:
+                time.sleep(remaining)
+        elif stop_event.wait(remaining) if remaining > 0 else stop_event.is_set():
+            return None
+
+        return self.tick()
+
+    def __iter__(self) -> Iterator[Tick]:
+        while True:
+            yield self.wait()
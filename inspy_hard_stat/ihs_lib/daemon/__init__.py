@@ -0,0 +1,16 @@
+from inspy_hard_stat.ihs_lib.daemon.daemon import Footprint, MonitorDaemon
+from inspy_hard_stat.ihs_lib.daemon.scheduler import Job, Scheduler
+from inspy_hard_stat.ihs_lib.daemon.sinks import CallbackSink, LatestSink, NdjsonSink, Sink, create_sink
+
+
+__all__ = [
+        'CallbackSink',
+        'Footprint',
+        'Job',
+        'LatestSink',
+        'MonitorDaemon',
+        'NdjsonSink',
+        'Scheduler',
+        'Sink',
+        'create_sink',
+        ]
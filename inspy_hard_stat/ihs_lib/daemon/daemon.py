@@ -0,0 +1,587 @@
+"""
+The monitoring daemon.
+
+:class:`MonitorDaemon` runs the collectors from :mod:`~inspy_hard_stat.ihs_lib.sampler` on a
+:class:`~inspy_hard_stat.ihs_lib.daemon.scheduler.Scheduler` and hands every reading to its sinks (see
+:mod:`~inspy_hard_stat.ihs_lib.daemon.sinks`). It holds a PID file (see :func:`~inspy_hard_stat.ihs_lib.pid.create_pid_file`)
+while it runs, so a second daemon refuses to start, and it shuts down cleanly on SIGTERM or SIGINT: the current job
+finishes, the sinks write out what they have buffered, and the PID file is removed.
+
+A sink that fails (a full disk, a closed pipe on ``ndjson:-``) does not stop the daemon: the error is counted in
+:attr:`MonitorDaemon.sink_errors` and the other sinks carry on.
+
+Nothing is printed while the daemon runs. Its own CPU use is tracked from the moment it starts sampling, is sent to
+the sinks every ``stats_interval`` seconds as a ``daemon`` record, and can be held to a budget.
+
+Classes:
+    Footprint:
+        The daemon's own resource use since it started sampling.
+
+    MonitorDaemon:
+        Runs collectors on a schedule and sends their readings to sinks.
+
+Functions:
+    add_daemon_arguments(parser):
+        Add the daemon options to an argument parser.
+
+    run_daemon(args):
+        Run the daemon as the parsed arguments ask.
+
+    main(argv=None):
+        Run the daemon.
+
+Since:
+    1.0.0
+"""
+import os
+import signal
+import sys
+import threading
+import time
+from argparse import ArgumentParser, ArgumentTypeError
+from pathlib import Path
+from typing import NamedTuple, Optional, Union
+
+from inspy_hard_stat.config.constants import FILE_SYSTEM_DEFAULTS
+from inspy_hard_stat.ihs_lib.clock import Tick
+from inspy_hard_stat.ihs_lib.daemon.scheduler import Scheduler
+from inspy_hard_stat.ihs_lib.daemon.sinks import SINKS, Sink, create_sink
+from inspy_hard_stat.ihs_lib.pid import create_pid_file, remove_pid_file
+from inspy_hard_stat.ihs_lib.sampler import (
+    COLLECTORS,
+    DEFAULT_INTERVAL,
+    DEFAULT_METRICS,
+    _metrics,
+    _positive_float,
+    create_collectors,
+    )
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+DEFAULT_PID_FILE = FILE_SYSTEM_DEFAULTS['dirs']['data'] / 'inspy-hard-stat.pid'
+
+DEFAULT_SINK = f"latest:{FILE_SYSTEM_DEFAULTS['dirs']['data'] / 'latest.json'}"
+
+DEFAULT_STATS_INTERVAL = 60.0
+"""Seconds between the daemon's reports on its own resource use."""
+
+SHUTDOWN_SIGNALS = tuple(
+        getattr(signal, name) for name in ('SIGTERM', 'SIGINT') if hasattr(signal, name)
+        )
+
+
+class Footprint(NamedTuple):
+    """
+    The daemon's own resource use since it started sampling.
+
+    Attributes:
+        cpu_seconds (float):
+            User and system CPU time used.
+
+        wall_seconds (float):
+            Time elapsed.
+
+        cpu_percent (float):
+            CPU time as a percentage of elapsed time (of one core).
+
+        max_rss_kb (Optional[int]):
+            The peak resident set size of the process, in KiB; None where it cannot be read.
+
+        records (int):
+            The number of records sent to the sinks.
+
+        sink_errors (int):
+            The number of times a sink raised an exception.
+    """
+    cpu_seconds: float
+    wall_seconds: float
+    cpu_percent: float
+    max_rss_kb: Optional[int]
+    records: int
+    sink_errors: int = 0
+
+
+def _max_rss_kb() -> Optional[int]:
+    if resource is None:
+        return None
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # ru_maxrss is in bytes on macOS and KiB elsewhere.
+    return max_rss // 1024 if sys.platform == 'darwin' else max_rss
+
+
+class MonitorDaemon:
+    """
+    Runs collectors on a schedule and sends their readings to sinks.
+
+    Every reading is sent as its own record, so metrics may be sampled at different rates::
+
+        {"ts": <wall time>, "mono": <monotonic time>, "at": <tick boundary>, "late": <seconds>, "seq": 0, <metric>: ...}
+
+    Readings are taken on :class:`~inspy_hard_stat.ihs_lib.clock.TickClock` ticks; with ``align`` (the default) ``at``
+    is a wall-clock multiple of the metric's interval, so readings from different hosts can be joined on it.
+
+    Example:
+        >>> daemon = MonitorDaemon(create_collectors(['cpu', 'mem']), [create_sink('ndjson:/tmp/ihs.ndjson')])
+        >>> daemon.run(duration=10)
+        0
+        >>> daemon.footprint()
+        Footprint(cpu_seconds=0.02, wall_seconds=10.0, cpu_percent=0.2, max_rss_kb=24576, records=20, sink_errors=0)
+    """
+
+    def __init__(
+            self,
+            collectors: list,
+            sinks: list[Sink],
+            interval: float = DEFAULT_INTERVAL,
+            intervals: Optional[dict[str, float]] = None,
+            pid_file: Optional[Union[str, Path]] = DEFAULT_PID_FILE,
+            stats_interval: float = DEFAULT_STATS_INTERVAL,
+            cpu_budget: Optional[float] = None,
+            align: bool = True,
+            ):
+        """
+        Initialize the daemon.
+
+        Parameters:
+            collectors (list):
+                The collectors; see :func:`~inspy_hard_stat.ihs_lib.sampler.create_collectors`. They are closed when
+                the daemon stops.
+
+            sinks (list[Sink]):
+                Where the records go. They are closed when the daemon stops.
+
+            interval (float):
+                Seconds between readings of each metric. Optional; default is
+                :data:`~inspy_hard_stat.ihs_lib.sampler.DEFAULT_INTERVAL`.
+
+            intervals (dict[str, float]):
+                Per-metric overrides of ``interval``, by metric name; each must name one of the collectors. Optional.
+
+            pid_file (Union[str, Path]):
+                The PID file to hold while running, or None for none. Optional; default is :data:`DEFAULT_PID_FILE`.
+
+            stats_interval (float):
+                Seconds between ``daemon`` records reporting the daemon's :class:`Footprint`; 0 for none. Optional;
+                default is :data:`DEFAULT_STATS_INTERVAL`.
+
+            cpu_budget (float):
+                The most CPU, as a percentage of one core, the daemon may use; see :attr:`over_budget`. Optional;
+                default is no budget.
+
+            align (bool):
+                If True, readings are taken on wall-clock multiples of their interval. Optional; default is True.
+
+        Raises:
+            ValueError:
+                Raised when ``intervals`` names a metric none of the collectors reads.
+        """
+        unknown = sorted(set(intervals or ()) - {collector.name for collector in collectors})
+
+        if unknown:
+            raise ValueError(f'Intervals given for metrics that are not collected: {", ".join(unknown)}')
+
+        self.__align = align
+        self.__collectors = collectors
+        self.__cpu_budget = cpu_budget
+        self.__interval = interval
+        self.__intervals = dict(intervals or {})
+        self.__last_sink_error = None
+        self.__over_budget = False
+        self.__pid_file = None if pid_file is None else Path(pid_file)
+        self.__records = 0
+        self.__scheduler = None
+        self.__sink_errors = 0
+        self.__sinks = sinks
+        self.__started_cpu = None
+        self.__started_wall = None
+        self.__stats_interval = stats_interval
+        self.__stop_event = threading.Event()
+
+    @property
+    def over_budget(self) -> bool:
+        """
+        Whether the daemon's CPU use has exceeded its budget at any check.
+
+        Returns:
+            bool
+        """
+        return self.__over_budget
+
+    @property
+    def last_sink_error(self) -> Optional[Exception]:
+        """
+        The last exception raised by a sink, if any.
+
+        Returns:
+            Optional[Exception]
+        """
+        return self.__last_sink_error
+
+    @property
+    def pid_file(self) -> Optional[Path]:
+        """
+        The PID file held while running.
+
+        Returns:
+            Optional[Path]
+        """
+        return self.__pid_file
+
+    @property
+    def records(self) -> int:
+        """
+        The number of records sent to the sinks so far.
+
+        Returns:
+            int
+        """
+        return self.__records
+
+    @property
+    def sink_errors(self) -> int:
+        """
+        The number of times a sink has raised an exception. The record (or flush) it failed on is lost to that sink
+        only.
+
+        Returns:
+            int
+        """
+        return self.__sink_errors
+
+    @property
+    def scheduler(self) -> Optional[Scheduler]:
+        """
+        The scheduler of the current (or last) run.
+
+        Returns:
+            Optional[Scheduler]
+        """
+        return self.__scheduler
+
+    def footprint(self) -> Footprint:
+        """
+        The daemon's resource use since it started sampling.
+
+        Returns:
+            Footprint
+        """
+        if self.__started_wall is None:
+            return Footprint(0.0, 0.0, 0.0, _max_rss_kb(), self.__records, self.__sink_errors)
+
+        cpu_seconds = time.process_time() - self.__started_cpu
+        wall_seconds = time.monotonic() - self.__started_wall
+
+        return Footprint(
+                round(cpu_seconds, 6),
+                round(wall_seconds, 6),
+                round(100 * cpu_seconds / wall_seconds, 3) if wall_seconds > 0 else 0.0,
+                _max_rss_kb(),
+                self.__records,
+                self.__sink_errors,
+                )
+
+    def stop(self) -> None:
+        """
+        Ask the daemon to stop. Safe to call from any thread or a signal handler.
+
+        Returns:
+            None
+        """
+        self.__stop_event.set()
+
+    def __emit(self, tick: Tick, name: str, reading) -> None:
+        record = {
+                'ts':   tick.wall,
+                'mono': tick.mono,
+                'at':   tick.scheduled,
+                'late': round(tick.lateness, 6),
+                'seq':  self.__records,
+                name:   reading,
+                }
+        self.__records += 1
+
+        for sink in self.__sinks:
+            try:
+                sink.emit(record)
+            except Exception as e:
+                self.__sink_failed(e)
+
+    def __sink_failed(self, error: Exception) -> None:
+        self.__sink_errors += 1
+        self.__last_sink_error = error
+
+    def __collect_job(self, collector):
+        def job(tick):
+            self.__emit(tick, collector.name, collector.collect())
+
+        return job
+
+    def __report_footprint(self, tick: Tick) -> None:
+        footprint = self.__check_budget()
+        self.__emit(tick, 'daemon', footprint._asdict())
+
+    def __check_budget(self) -> Footprint:
+        footprint = self.footprint()
+
+        if self.__cpu_budget is not None and footprint.cpu_percent > self.__cpu_budget and not self.__over_budget:
+            self.__over_budget = True
+            print(
+                    f'inspy-hard-stat: CPU use {footprint.cpu_percent}% is over the budget of {self.__cpu_budget}%.',
+                    file=sys.stderr,
+                    )
+
+        return footprint
+
+    def __flush_sinks_if_due(self) -> None:
+        for sink in self.__sinks:
+            try:
+                sink.flush_if_due()
+            except Exception as e:
+                self.__sink_failed(e)
+
+    def __sink_flush_deadline(self) -> Optional[float]:
+        deadlines = [deadline for deadline in (sink.flush_deadline for sink in self.__sinks) if deadline is not None]
+
+        return min(deadlines) if deadlines else None
+
+    def __handle_signal(self, signum, frame) -> None:
+        self.stop()
+
+    def __install_signal_handlers(self) -> dict:
+        if threading.current_thread() is not threading.main_thread():
+            return {}
+
+        return {signum: signal.signal(signum, self.__handle_signal) for signum in SHUTDOWN_SIGNALS}
+
+    def __close(self) -> None:
+        try:
+            for sink in self.__sinks:
+                try:
+                    sink.close()
+                except Exception as e:
+                    self.__sink_failed(e)
+        finally:
+            for collector in self.__collectors:
+                collector.close()
+
+    def run(self, duration: Optional[float] = None) -> int:
+        """
+        Run until stopped (by :meth:`stop`, SIGTERM or SIGINT), or for ``duration`` seconds.
+
+        Parameters:
+            duration (float):
+                Seconds to run for. Optional; default is until stopped.
+
+        Returns:
+            int:
+                The exit status: 0, or 1 if the daemon went over its CPU budget.
+
+        Raises:
+            FileExistsError:
+                Raised when the PID file is held by another running daemon.
+        """
+        if self.__pid_file is not None:
+            self.__pid_file.parent.mkdir(parents=True, exist_ok=True)
+
+            try:
+                create_pid_file(os.getpid(), self.__pid_file)
+            except FileExistsError:
+                self.__close()
+                raise
+
+        previous_handlers = self.__install_signal_handlers()
+
+        try:
+            scheduler = self.__scheduler = Scheduler(self.__stop_event)
+
+            for collector in self.__collectors:
+                scheduler.add(
+                        collector.name,
+                        self.__collect_job(collector),
+                        self.__intervals.get(collector.name, self.__interval),
+                        align=self.__align,
+                        )
+
+            if self.__stats_interval:
+                scheduler.add(
+                        'daemon',
+                        self.__report_footprint,
+                        self.__stats_interval,
+                        delay=self.__stats_interval,
+                        align=self.__align,
+                        )
+
+            self.__started_cpu = time.process_time()
+            self.__started_wall = time.monotonic()
+
+            scheduler.run(
+                    until=None if duration is None else self.__started_wall + duration,
+                    after_each=self.__flush_sinks_if_due,
+                    wake_at=self.__sink_flush_deadline,
+                    )
+        finally:
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+
+            try:
+                self.__close()
+            finally:
+                if self.__pid_file is not None:
+                    remove_pid_file(self.__pid_file)
+
+        self.__check_budget()
+
+        return 1 if self.__over_budget else 0
+
+
+def _metric_interval(value: str) -> tuple[str, float]:
+    name, _, seconds = value.partition('=')
+
+    if name not in COLLECTORS:
+        raise ArgumentTypeError(f'choose a metric from {", ".join(COLLECTORS)} (got {name!r})')
+
+    return name, _positive_float(seconds)
+
+
+def _sink(value: str) -> str:
+    kind, _, target = value.partition(':')
+
+    if kind not in SINKS or not target:
+        raise ArgumentTypeError(f'use KIND:TARGET, with KIND one of {", ".join(SINKS)} (got {value!r})')
+
+    return value
+
+
+def add_daemon_arguments(parser: ArgumentParser) -> ArgumentParser:
+    """
+    Add the daemon options to an argument parser.
+
+    Parameters:
+        parser (ArgumentParser):
+            The parser.
+
+    Returns:
+        ArgumentParser:
+            The same parser.
+    """
+    parser.add_argument(
+            '--interval',
+            type=_positive_float,
+            default=DEFAULT_INTERVAL,
+            help='Seconds between readings of each metric. Default: %(default)s'
+            )
+    parser.add_argument(
+            '--every',
+            type=_metric_interval,
+            action='append',
+            default=[],
+            metavar='METRIC=SECONDS',
+            help='Read one metric at its own interval, e.g. gpu=5. May be repeated.'
+            )
+    parser.add_argument(
+            '--metrics',
+            type=_metrics,
+            default=list(DEFAULT_METRICS),
+            help=f'Comma-separated metrics to collect, from: {", ".join(COLLECTORS)}. '
+                 f'Default: {",".join(DEFAULT_METRICS)}'
+            )
+    parser.add_argument(
+            '--sink',
+            type=_sink,
+            action='append',
+            default=None,
+            metavar='KIND:TARGET',
+            help=f'Where to send readings, with KIND one of {", ".join(SINKS)}; ndjson:- writes to standard output. '
+                 f'May be repeated. Default: {DEFAULT_SINK}'
+            )
+    parser.add_argument(
+            '--no-align',
+            dest='align',
+            action='store_false',
+            default=True,
+            help='Take readings every interval from start-up, rather than on wall-clock multiples of the interval.'
+            )
+    parser.add_argument(
+            '--pid-file',
+            default=str(DEFAULT_PID_FILE),
+            help='The PID file to hold while running. Default: %(default)s'
+            )
+    parser.add_argument(
+            '--duration',
+            type=_positive_float,
+            default=None,
+            help='Stop after this many seconds. Default: run until SIGTERM or SIGINT.'
+            )
+    parser.add_argument(
+            '--stats-interval',
+            type=float,
+            default=DEFAULT_STATS_INTERVAL,
+            help="Seconds between reports of the daemon's own CPU and memory use; 0 for none. Default: %(default)s"
+            )
+    parser.add_argument(
+            '--cpu-budget',
+            type=_positive_float,
+            default=None,
+            metavar='PERCENT',
+            help='Warn, and exit with status 1, if the daemon uses more than this much CPU (percent of one core).'
+            )
+
+    return parser
+
+
+def run_daemon(args) -> int:
+    """
+    Run the daemon as the parsed arguments ask.
+
+    Parameters:
+        args (Namespace):
+            Arguments parsed by a parser set up with :func:`add_daemon_arguments`.
+
+    Returns:
+        int:
+            The exit status: 2 if ``--every`` names a metric not in ``--metrics``.
+    """
+    unknown = sorted({name for name, _ in args.every} - set(args.metrics))
+
+    if unknown:
+        print(f'inspy-hard-stat: --every names metrics not in --metrics: {", ".join(unknown)}', file=sys.stderr)
+        return 2
+
+    sinks = [create_sink(spec) for spec in args.sink or [DEFAULT_SINK]]
+    daemon = MonitorDaemon(
+            create_collectors(args.metrics),
+            sinks,
+            interval=args.interval,
+            intervals=dict(args.every),
+            pid_file=args.pid_file,
+            stats_interval=args.stats_interval,
+            cpu_budget=args.cpu_budget,
+            align=args.align,
+            )
+
+    try:
+        return daemon.run(args.duration)
+    except FileExistsError as e:
+        print(f'inspy-hard-stat: {e}', file=sys.stderr)
+        return 1
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = add_daemon_arguments(
+            ArgumentParser(
+                    prog='inspy-hard-stat daemon',
+                    description='Run the monitoring daemon, sending readings to sinks until stopped.',
+                    )
+            )
+
+    return run_daemon(parser.parse_args(argv))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
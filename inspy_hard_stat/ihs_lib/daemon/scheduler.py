@@ -0,0 +1,205 @@
+"""
+A single-threaded scheduler for periodic jobs.
+
+Each job has its own :class:`~inspy_hard_stat.ihs_lib.clock.TickClock`, and the jobs are kept in a heap keyed by their
+clocks' next deadlines. Between jobs the scheduler waits on a :class:`threading.Event`, so setting the event (from a
+signal handler, say) wakes it at once.
+
+Classes:
+    Job:
+        A function run on an interval.
+
+    Scheduler:
+        Runs jobs on their intervals until stopped.
+
+Since:
+    1.0.0
+"""
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, Optional
+
+from inspy_hard_stat.ihs_lib.clock import Tick, TickClock
+
+
+class Job:
+    """
+    A function run on the ticks of a clock.
+    """
+    __slots__ = ('name', 'func', 'clock', 'runs', 'errors', 'last_error')
+
+    def __init__(self, name: str, func: Callable[[Tick], None], clock: TickClock):
+        self.name = name
+        self.func = func
+        self.clock = clock
+        self.runs = 0
+        self.errors = 0
+        self.last_error = None
+
+    @property
+    def interval(self) -> float:
+        return self.clock.interval
+
+    @property
+    def skipped(self) -> int:
+        return self.clock.skipped
+
+
+class Scheduler:
+    """
+    Runs jobs on their intervals until stopped.
+
+    A job that runs a whole interval late is run once, and the runs it missed are skipped (and counted in
+    :attr:`Job.skipped`) rather than run back to back. An exception raised by a job is counted in :attr:`Job.errors`
+    and does not stop the scheduler.
+    """
+
+    def __init__(self, stop_event: Optional[threading.Event] = None):
+        """
+        Initialize the scheduler.
+
+        Parameters:
+            stop_event (threading.Event):
+                Set to stop :meth:`run`. Optional; one is created if not given.
+        """
+        self.__counter = itertools.count()
+        self.__heap = []
+        self.__jobs = {}
+        self.__stop_event = stop_event or threading.Event()
+
+    @property
+    def jobs(self) -> dict[str, Job]:
+        """
+        The scheduled jobs, by name.
+
+        Returns:
+            dict[str, Job]
+        """
+        return dict(self.__jobs)
+
+    @property
+    def stop_event(self) -> threading.Event:
+        """
+        The event that stops :meth:`run` when set.
+
+        Returns:
+            threading.Event
+        """
+        return self.__stop_event
+
+    def add(
+            self,
+            name: str,
+            func: Callable[[Tick], None],
+            interval: float,
+            delay: float = 0.0,
+            align: bool = True,
+            ) -> Job:
+        """
+        Schedule a function to run every ``interval`` seconds.
+
+        Parameters:
+            name (str):
+                The job's name; must be unique.
+
+            func (Callable[[Tick], None]):
+                The function; it is passed the :class:`~inspy_hard_stat.ihs_lib.clock.Tick` it runs for.
+
+            interval (float):
+                Seconds between runs.
+
+            delay (float):
+                Seconds to wait, at least, before the first run. Optional; default is 0.
+
+            align (bool):
+                If True, runs fall on wall-clock multiples of ``interval``; see
+                :class:`~inspy_hard_stat.ihs_lib.clock.TickClock`. Optional; default is True.
+
+        Returns:
+            Job
+
+        Raises:
+            ValueError:
+                Raised when a job of that name is already scheduled, or the interval is not positive.
+        """
+        if name in self.__jobs:
+            raise ValueError(f'A job named {name!r} is already scheduled.')
+
+        job = self.__jobs[name] = Job(name, func, TickClock(interval, align=align, delay=delay))
+        heapq.heappush(self.__heap, (job.clock.next_deadline, next(self.__counter), job))
+
+        return job
+
+    def stop(self) -> None:
+        """
+        Stop :meth:`run`. Safe to call from any thread or a signal handler.
+
+        Returns:
+            None
+        """
+        self.__stop_event.set()
+
+    def run(
+            self,
+            until: Optional[float] = None,
+            after_each: Optional[Callable[[], None]] = None,
+            wake_at: Optional[Callable[[], Optional[float]]] = None,
+            ) -> None:
+        """
+        Run jobs as they fall due, until stopped.
+
+        Parameters:
+            until (float):
+                A :func:`time.monotonic` time at which to stop. Optional; default is to run until stopped.
+
+            after_each (Callable[[], None]):
+                Called once the jobs due at the same time have all run, and at the times given by ``wake_at``.
+                Optional.
+
+            wake_at (Callable[[], Optional[float]]):
+                Returns the :func:`time.monotonic` time by which ``after_each`` must next be called even if no job is
+                due then, or None. Optional.
+
+        Returns:
+            None
+        """
+        heap = self.__heap
+        stop_event = self.__stop_event
+
+        while heap and not stop_event.is_set():
+            due, _, job = heap[0]
+            now = time.monotonic()
+
+            if until is not None and now >= until:
+                break
+
+            if due > now:
+                wake = due if until is None else min(due, until)
+                pending = wake_at() if wake_at is not None and after_each is not None else None
+
+                if pending is not None and pending <= now:
+                    after_each()
+                    continue
+
+                if pending is not None:
+                    wake = min(wake, pending)
+
+                stop_event.wait(wake - now)
+                continue
+
+            heapq.heappop(heap)
+
+            try:
+                job.func(job.clock.tick())
+            except Exception as e:
+                job.errors += 1
+                job.last_error = e
+
+            job.runs += 1
+            heapq.heappush(heap, (job.clock.next_deadline, next(self.__counter), job))
+
+            # Let jobs due at the same tick all run before after_each sees their results.
+            if after_each is not None and heap[0][0] > time.monotonic():
+                after_each()
@@ -0,0 +1,332 @@
+"""
+Where the monitoring daemon sends its samples.
+
+A sink receives every record the daemon produces, one at a time, through :meth:`Sink.emit`. Sinks must not block for
+long, as they run on the daemon's only thread; the file sinks below buffer their output and write it out in batches.
+
+Classes:
+    Sink:
+        Base class for sinks.
+
+    NdjsonSink:
+        Appends records to a file (or standard output) as NDJSON.
+
+    LatestSink:
+        Keeps a JSON file holding the latest reading of every metric.
+
+    CallbackSink:
+        Passes records to a function.
+
+Functions:
+    create_sink(spec):
+        Create a sink from a ``'kind:target'`` string.
+
+Since:
+    1.0.0
+"""
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+from inspy_hard_stat.ihs_lib.sampler import DEFAULT_FLUSH_BYTES, DEFAULT_FLUSH_INTERVAL, BufferedLineWriter
+
+
+DEFAULT_LATEST_INTERVAL = 1.0
+"""Rewrite the latest-readings file at most this often, in seconds."""
+
+
+def _dumps(record: dict) -> str:
+    return json.dumps(record, separators=(',', ':'))
+
+
+class Sink:
+    """
+    Base class for sinks.
+
+    Subclasses implement :meth:`emit`; the other methods do nothing by default.
+    """
+
+    def emit(self, record: dict) -> None:
+        """
+        Accept one record.
+
+        Parameters:
+            record (dict):
+                The record; every value is JSON-serializable.
+
+        Returns:
+            None
+        """
+        raise NotImplementedError("Subclasses must implement this method.")
+
+    @property
+    def flush_deadline(self) -> Optional[float]:
+        """
+        When, on the :func:`time.monotonic` clock, :meth:`flush_if_due` next has something to write; None if nothing
+        is waiting. The daemon wakes by then even if no record is due.
+
+        Returns:
+            Optional[float]
+        """
+        return None
+
+    def flush_if_due(self) -> None:
+        """
+        Write out anything that has waited long enough. Called by the daemon after each batch of records, and at
+        :attr:`flush_deadline`.
+
+        Returns:
+            None
+        """
+
+    def flush(self) -> None:
+        """
+        Write out anything waiting now.
+
+        Returns:
+            None
+        """
+
+    def close(self) -> None:
+        """
+        Write out anything waiting and release the sink's resources.
+
+        Returns:
+            None
+        """
+        self.flush()
+
+
+class NdjsonSink(Sink):
+    """
+    Appends records to a file, one JSON object per line, through a
+    :class:`~inspy_hard_stat.ihs_lib.sampler.BufferedLineWriter`.
+
+    If the reader of standard output goes away, the :class:`BrokenPipeError` is raised once, and standard output is
+    then pointed at the null device, so later records are dropped quietly and nothing fails at exit.
+    """
+
+    def __init__(
+            self,
+            path: Union[str, Path] = '-',
+            max_bytes: int = DEFAULT_FLUSH_BYTES,
+            max_delay: float = DEFAULT_FLUSH_INTERVAL,
+            ):
+        """
+        Initialize the sink; the file is opened straight away.
+
+        Parameters:
+            path (Union[str, Path]):
+                The file to append to, or ``'-'`` for standard output. Optional; default is ``'-'``.
+
+            max_bytes (int):
+                Write out once this many bytes are waiting. Optional.
+
+            max_delay (float):
+                Write out once the oldest waiting record has waited this many seconds. Optional.
+        """
+        if str(path) == '-':
+            self.__stream = sys.stdout.buffer
+            self.__owns_stream = False
+        else:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self.__stream = open(path, 'ab')
+            self.__owns_stream = True
+
+        self.__writer = BufferedLineWriter(self.__stream, max_bytes=max_bytes, max_delay=max_delay)
+
+    @property
+    def writer(self) -> BufferedLineWriter:
+        """
+        The writer the records go through.
+
+        Returns:
+            BufferedLineWriter
+        """
+        return self.__writer
+
+    @property
+    def flush_deadline(self) -> Optional[float]:
+        return self.__writer.flush_deadline
+
+    def __stdout_closed(self) -> None:
+        devnull = os.open(os.devnull, os.O_WRONLY)
+
+        try:
+            os.dup2(devnull, self.__stream.fileno())
+        finally:
+            os.close(devnull)
+
+    def __write(self, method, *args) -> None:
+        try:
+            method(*args)
+        except BrokenPipeError:
+            if not self.__owns_stream:
+                self.__stdout_closed()
+
+            raise
+
+    def emit(self, record: dict) -> None:
+        self.__write(self.__writer.write, (_dumps(record) + '\n').encode())
+
+    def flush_if_due(self) -> None:
+        self.__write(self.__writer.flush_if_due)
+
+    def flush(self) -> None:
+        self.__write(self.__writer.flush)
+
+    def close(self) -> None:
+        try:
+            self.__write(self.__writer.close)
+        finally:
+            if self.__owns_stream:
+                self.__stream.close()
+
+
+class LatestSink(Sink):
+    """
+    Keeps a JSON file holding the latest reading of every metric, for shell prompts and status bars to read.
+
+    The file is replaced atomically, and at most once every ``min_interval`` seconds however often records arrive, so
+    readers never see a partial file and the daemon does not rewrite it on every tick. Records are only merged in by
+    :meth:`emit`; the file is written by :meth:`flush_if_due`, which the daemon calls once all the records due at a
+    tick have been emitted, so the file never mixes readings from different ticks.
+    """
+
+    def __init__(self, path: Union[str, Path], min_interval: float = DEFAULT_LATEST_INTERVAL):
+        """
+        Initialize the sink.
+
+        Parameters:
+            path (Union[str, Path]):
+                The file to keep up to date.
+
+            min_interval (float):
+                Rewrite the file at most this often, in seconds. Optional; default is
+                :data:`DEFAULT_LATEST_INTERVAL`.
+        """
+        self.__dirty = False
+        self.__latest = {}
+        self.__min_interval = min_interval
+        self.__path = Path(path)
+        self.__written_at = None
+
+        self.__path.parent.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def latest(self) -> dict:
+        """
+        The latest reading of every metric seen so far.
+
+        Returns:
+            dict
+        """
+        return dict(self.__latest)
+
+    @property
+    def path(self) -> Path:
+        """
+        The file kept up to date.
+
+        Returns:
+            Path
+        """
+        return self.__path
+
+    @property
+    def flush_deadline(self) -> Optional[float]:
+        if not self.__dirty:
+            return None
+
+        if self.__written_at is None:
+            return time.monotonic()
+
+        return self.__written_at + self.__min_interval
+
+    def emit(self, record: dict) -> None:
+        self.__latest.update(record)
+        self.__dirty = True
+
+    def flush_if_due(self) -> None:
+        flush_deadline = self.flush_deadline
+
+        if flush_deadline is not None and time.monotonic() >= flush_deadline:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.__dirty:
+            return
+
+        temp_path = self.__path.with_name(f'.{self.__path.name}.{os.getpid()}.tmp')
+
+        try:
+            temp_path.write_text(_dumps(self.__latest) + '\n')
+            os.replace(temp_path, self.__path)
+        except OSError:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+            raise
+        finally:
+            # Counted as a write even if it failed, so a failing disk is retried every min_interval, not in a loop.
+            self.__written_at = time.monotonic()
+
+        self.__dirty = False
+
+
+class CallbackSink(Sink):
+    """
+    Passes every record to a function; for embedding the daemon in another program.
+    """
+
+    def __init__(self, callback: Callable[[dict], None]):
+        """
+        Initialize the sink.
+
+        Parameters:
+            callback (Callable[[dict], None]):
+                Called with each record.
+        """
+        self.__callback = callback
+
+    def emit(self, record: dict) -> None:
+        self.__callback(record)
+
+
+SINKS = {
+        'ndjson': NdjsonSink,
+        'latest': LatestSink,
+        }
+"""The sinks that can be named on the command line, by kind."""
+
+
+def create_sink(spec: str) -> Sink:
+    """
+    Create a sink from a ``'kind:target'`` string, such as ``'ndjson:/var/log/ihs.ndjson'``, ``'ndjson:-'`` or
+    ``'latest:~/.cache/ihs/latest.json'``.
+
+    Parameters:
+        spec (str):
+            The sink's kind (see :data:`SINKS`) and target, separated by the first colon.
+
+    Returns:
+        Sink
+
+    Raises:
+        ValueError:
+            Raised when the kind is unknown or the target is missing.
+    """
+    kind, _, target = spec.partition(':')
+
+    if kind not in SINKS:
+        raise ValueError(f'Unknown sink {kind!r}; choose from {", ".join(SINKS)}')
+
+    if not target:
+        raise ValueError(f'Sink {spec!r} has no target; use {kind}:<path>')
+
+    return SINKS[kind](target if target == '-' else Path(target).expanduser())
@@ -183,9 +183,10 @@ def start_libre_hw_monitor(exe_path: str = CONFIG.executable_path) -> Union[int,
     pid = None
     pid = load_and_validate_pid(DEFAULT_PID_FP)
 
-    if pid is not None and pid and find_process_by_pid(pid):
-            print(f"Libre Hardware Monitor is already running with PID: {pid}")
-            return pid
+    # load_and_validate_pid has already confirmed the process is the one recorded in the PID file.
+    if pid:
+        print(f"Libre Hardware Monitor is already running with PID: {pid}")
+        return pid
 
     pid = is_lhwmon_running(exe_path, return_pid=True) if is_lhwmon_running(exe_path) else None
 
@@ -255,12 +256,11 @@ def start_libre_hw_monitor(exe_path: str = CONFIG.executable_path) -> Union[int,
             print(f"Failed to start Libre Hardware Monitor: {e}")
 
     if pid:
+        # create_pid_file() arranges for the PID file to be removed at exit.
         create_pid_file(pid)
 
         if CONFIG.kill_on_exit:
             from atexit import register
-            from inspy_hard_stat.ihs_lib.pid import remove_pid_file_and_unregister
-            register(remove_pid_file_and_unregister)
             register(kill_by_pid, pid=pid)
 
     return pid
@@ -1,5 +1,4 @@
 import psutil
-from inspyre_toolbox.conversions.bytes import ByteConverter
 
 
 def get_memory_stats():
@@ -19,11 +18,16 @@ def get_memory_stat_dict():
 
 
 def get_used_string(stat_dict, round_to=2):
+    # Imported here; inspyre_toolbox is slow to import and the samplers only need the raw numbers.
+    from inspyre_toolbox.conversions.bytes import ByteConverter
+
     used = ByteConverter(stat_dict['used'], 'byte').get_lowest_safe_conversion()
     return f"Used: {round(used[1], round_to)} {used[0]}s"
 
 
 def get_free_string(stat_dict, round_to=2):
+    from inspyre_toolbox.conversions.bytes import ByteConverter
+
     free = ByteConverter(stat_dict['free'], 'byte').get_lowest_safe_conversion()
     return f"Free: {round(free[1], round_to)} {free[0]}s"
 
@@ -2,17 +2,32 @@ import os
 import psutil
 from typing import Optional
 from inspy_hard_stat.config.constants import FILE_SYSTEM_DEFAULTS
-from atexit import register, unregister
+from inspy_hard_stat.ihs_lib.process.stats import PROCESS_STATS_CACHE
+from atexit import register
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 
 
 DEFAULT_PID_FP = FILE_SYSTEM_DEFAULTS['dirs']['data'] / 'lhm.pid'
 DEFAULT_PROC_NAME = 'LibreHardwareMonitor.exe'
 
+# Open, exclusively locked descriptors for the PID files this process has written, keyed by path.
+HELD_PID_FILES = {}
+
+# Whether remove_held_pid_files() has been registered to run at exit; it only ever is once.
+_EXIT_HANDLER_REGISTERED = False
+
 
 def find_process_by_pid(pid: int) -> Optional[dict]:
     """
     Find a process by its PID.
 
+    CPU usage is computed from the CPU time recorded the last time this process was looked up (see
+    :class:`inspy_hard_stat.ihs_lib.process.stats.ProcessStatsCache`), so this call does not block.
+
     Parameters:
         pid (int):
             The PID of the process.
@@ -21,20 +36,21 @@ def find_process_by_pid(pid: int) -> Optional[dict]:
         Optional[dict]:
             The process if found, otherwise None.
     """
-    try:
-        process = psutil.Process(pid)
-        process_info = {
-            'pid': process.pid,
-            'name': process.name(),
-            'status': process.status(),
-            'create_time': process.create_time(),
-            'cpu_usage': process.cpu_percent(interval=0.1),
-            'memory_usage': process.memory_info().rss
-        }
-        return process_info
-    except psutil.NoSuchProcess:
+    stats = PROCESS_STATS_CACHE.sample(pid)
+
+    if stats is None:
         return None
 
+    process_info = {
+        'pid': stats.pid,
+        'name': stats.name,
+        'status': stats.status,
+        'create_time': stats.create_time,
+        'cpu_usage': stats.cpu_percent,
+        'memory_usage': stats.rss
+    }
+    return process_info
+
 
 def find_pids_by_name(name: str, strict_case: bool = False) -> list:
     """
@@ -63,6 +79,66 @@ def find_pids_by_name(name: str, strict_case: bool = False) -> list:
     return pids
 
 
+def get_process_start_time(pid: int) -> Optional[str]:
+    """
+    Get the start time of a process, in a form suitable for storing in a PID file.
+
+    On Linux this is a single read of ``/proc/<pid>/stat`` (the start time, in clock ticks since boot); elsewhere it
+    is the creation time reported by psutil. Either way, two different processes that have had the same PID will not
+    have the same start time.
+
+    Parameters:
+        pid (int):
+            The PID of the process.
+
+    Returns:
+        Optional[str]:
+            The start time, or None if no process with that PID is running.
+    """
+    try:
+        with open(f'/proc/{pid}/stat', 'rb') as stat_file:
+            stat = stat_file.read()
+    except FileNotFoundError:
+        if os.path.isdir('/proc/self'):
+            return None
+    except (ProcessLookupError, PermissionError):
+        return None
+    else:
+        # The process name is wrapped in parentheses and may itself contain spaces or parentheses, so count fields
+        # from the last closing parenthesis. The start time is field 22; the field after the name is field 3.
+        return stat[stat.rfind(b')') + 2:].split()[19].decode()
+
+    try:
+        return repr(psutil.Process(pid).create_time())
+    except psutil.NoSuchProcess:
+        return None
+
+
+def read_pid_file(pid_file_path: str) -> Optional[tuple[int, Optional[str]]]:
+    """
+    Read the PID and recorded start time from a PID file.
+
+    Parameters:
+        pid_file_path (str):
+            The path to the PID file.
+
+    Returns:
+        Optional[tuple[int, Optional[str]]]:
+            The PID and the start time recorded with it (None for PID files written before start times were
+            recorded), or None if the file does not exist or does not start with a valid PID.
+    """
+    try:
+        with open(pid_file_path, 'r') as pid_file:
+            lines = pid_file.read().split()
+    except FileNotFoundError:
+        return None
+
+    if not lines or not lines[0].isdigit():
+        return None
+
+    return int(lines[0]), lines[1] if len(lines) > 1 else None
+
+
 def load_pid_from_file(pid_file_path: str) -> Optional[int]:
     """
     Load a PID from a file.
@@ -77,7 +153,7 @@ def load_pid_from_file(pid_file_path: str) -> Optional[int]:
     """
     try:
         with open(pid_file_path, 'r') as pid_file:
-            pid_str = pid_file.read().strip()
+            pid_str = pid_file.readline().strip()
             if pid_str.isdigit():
                 return int(pid_str)
             else:
@@ -88,6 +164,40 @@ def load_pid_from_file(pid_file_path: str) -> Optional[int]:
         return None
 
 
+def is_pid_file_locked(pid_file_path: str) -> bool:
+    """
+    Check whether a PID file is locked by a running process (this one included).
+
+    The process that writes a PID file holds an exclusive :func:`fcntl.flock` on it until it removes the file or
+    exits, so an unlocked PID file was left behind by a process that has gone away.
+
+    Parameters:
+        pid_file_path (str):
+            The path to the PID file.
+
+    Returns:
+        bool:
+            True if the file is locked; False if it is not, does not exist, or locking is not supported on this
+            platform.
+    """
+    if fcntl is None:
+        return False
+
+    try:
+        fd = os.open(pid_file_path, os.O_RDONLY)
+    except FileNotFoundError:
+        return False
+
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return True
+    finally:
+        os.close(fd)
+
+    return False
+
+
 def load_and_validate_pid(
         pid_file_path: str         = DEFAULT_PID_FP,
         expected_process_name: str = DEFAULT_PROC_NAME,
@@ -97,6 +207,12 @@ def load_and_validate_pid(
     Load a PID from a file, verify if the process exists and matches the expected name.
     If valid, return the PID. Otherwise, delete the PID file.
 
+    PID files that record the process's start time are validated by comparing it with the start time of the running
+    process (see :func:`get_process_start_time`), which is cheap and cannot be fooled by PID reuse; the process name
+    is not checked. PID files without a start time are validated by process name.
+
+    A PID file is only deleted if no running process holds its lock (see :func:`is_pid_file_locked`).
+
     Parameters:
         pid_file_path (str): The path to the PID file.
         expected_process_name (str): The expected name of the process.
@@ -105,15 +221,24 @@ def load_and_validate_pid(
     Returns:
         Optional[int]: The PID if valid, otherwise None.
     """
-    pid = None
-
     if not strict_case:
         expected_process_name = expected_process_name.lower()
 
-    pid = load_pid_from_file(pid_file_path)
+    pid_record = read_pid_file(pid_file_path)
 
-    if pid is None:
-        return False
+    if pid_record is None:
+        return None
+
+    pid, start_time = pid_record
+
+    if start_time is not None:
+        if get_process_start_time(pid) == start_time:
+            hold_pid_file(pid_file_path)
+            return pid
+
+        print(f"No process with PID {pid} and start time {start_time} is running.")
+        remove_stale_pid_file(pid_file_path)
+        return None
 
     pid_proc = find_process_by_pid(pid)
 
@@ -121,16 +246,30 @@ def load_and_validate_pid(
         pid_proc_name = pid_proc['name'].lower() if not strict_case else pid_proc['name']
 
         if pid_proc_name == expected_process_name:
-            from atexit import register
-            register(remove_pid_file_and_unregister)
+            hold_pid_file(pid_file_path)
             return pid
         else:
             print(f"Process name '{pid_proc['name']}' does not match expected '{expected_process_name}'.")
-            remove_pid_file(pid_file_path)
+            remove_stale_pid_file(pid_file_path)
             return None
     else:
         print(f"No process with PID {pid} is running.")
-        remove_pid_file(pid_file_path)
+        remove_stale_pid_file(pid_file_path)
+        return None
+
+
+def release_pid_file_lock(file_path: str = DEFAULT_PID_FP):
+    """
+    Release the lock this process holds on a PID file, if any.
+
+    Parameters:
+        file_path (str):
+            The path to the PID file.
+    """
+    fd = HELD_PID_FILES.pop(str(file_path), None)
+
+    if fd is not None:
+        os.close(fd)
 
 
 def remove_pid_file(file_path: str = DEFAULT_PID_FP):
@@ -145,28 +284,139 @@ def remove_pid_file(file_path: str = DEFAULT_PID_FP):
         os.remove(file_path)
     except FileNotFoundError:
         pass
+    finally:
+        release_pid_file_lock(file_path)
 
 
-
-def remove_pid_file_and_unregister(file_path: str = DEFAULT_PID_FP):
+def remove_stale_pid_file(file_path: str = DEFAULT_PID_FP) -> bool:
     """
-    Remove the PID file and unregister the cleanup function.
+    Remove a PID file, unless a running process holds its lock.
+
+    The lock is taken before the file is removed, so a process cannot write a fresh PID file in between the check and
+    the removal.
 
     Parameters:
         file_path (str):
             The path to the PID file.
+
+    Returns:
+        bool:
+            True if the file was removed (or did not exist), False if it is held by a running process.
     """
+    if fcntl is None or str(file_path) in HELD_PID_FILES:
+        remove_pid_file(file_path)
+        return True
+
     try:
-        os.remove(file_path)
+        fd = os.open(file_path, os.O_RDONLY)
+    except FileNotFoundError:
+        return True
+
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+        # Only remove the file if it is still the one we locked, and not a replacement written in the meantime.
+        if os.path.samestat(os.fstat(fd), os.stat(file_path)):
+            os.remove(file_path)
+    except BlockingIOError:
+        return False
     except FileNotFoundError:
         pass
     finally:
-        unregister(remove_pid_file_and_unregister)
+        os.close(fd)
+
+    return True
+
+
+def remove_held_pid_files():
+    """
+    Remove every PID file this process holds (see :data:`HELD_PID_FILES`).
+
+    Registered with :mod:`atexit` once, the first time this process takes hold of a PID file.
+    """
+    for file_path in list(HELD_PID_FILES):
+        remove_pid_file(file_path)
+
+
+def remove_pid_file_and_unregister(file_path: str = DEFAULT_PID_FP):
+    """
+    Remove the PID file, so it is no longer removed at exit; the same as :func:`remove_pid_file`.
+
+    Parameters:
+        file_path (str):
+            The path to the PID file.
+    """
+    remove_pid_file(file_path)
+
+
+def _hold(key: str, fd: int) -> None:
+    global _EXIT_HANDLER_REGISTERED
 
+    HELD_PID_FILES[key] = fd
 
-def create_pid_file(pid: int, file_path: str = DEFAULT_PID_FP):
+    if not _EXIT_HANDLER_REGISTERED:
+        register(remove_held_pid_files)
+        _EXIT_HANDLER_REGISTERED = True
+
+
+def _lock_pid_file(file_path: str, flags: int) -> Optional[int]:
+    """
+    Open a PID file and lock it exclusively.
+
+    Returns:
+        Optional[int]:
+            The open descriptor, or None if another running process holds the lock.
+    """
+    fd = os.open(file_path, flags, 0o644)
+
+    if fcntl is not None:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return None
+
+    return fd
+
+
+def hold_pid_file(file_path: str = DEFAULT_PID_FP) -> bool:
+    """
+    Take hold of an existing PID file, so this process removes it at exit, unless another running process holds it.
+
+    Parameters:
+        file_path (str):
+            The path to the PID file.
+
+    Returns:
+        bool:
+            True if this process now holds the file (or already did); False if it does not exist or is held by another
+            running process.
     """
-    Create a PID file containing the given PID.
+    key = str(file_path)
+
+    if key in HELD_PID_FILES:
+        return True
+
+    try:
+        fd = _lock_pid_file(file_path, os.O_RDONLY)
+    except FileNotFoundError:
+        return False
+
+    if fd is None:
+        return False
+
+    _hold(key, fd)
+
+    return True
+
+
+def create_pid_file(pid: int, file_path: str = DEFAULT_PID_FP, start_time: Optional[str] = None):
+    """
+    Create a PID file containing the given PID and the start time of its process.
+
+    The file stays exclusively locked (with :func:`fcntl.flock`, where available) until it is removed or this process
+    exits, so other processes can tell a live PID file from a stale one. It is removed at exit by
+    :func:`remove_held_pid_files`.
 
     Parameters:
         pid (int):
@@ -174,8 +424,29 @@ def create_pid_file(pid: int, file_path: str = DEFAULT_PID_FP):
 
         file_path (str):
             The path to the file to write the PID to.
+
+        start_time (str):
+            The start time of the process, as returned by :func:`get_process_start_time`. Optional; it is looked up
+            if not provided.
+
+    Raises:
+        FileExistsError:
+            Raised when the PID file is locked by another running process.
     """
-    with open(file_path, 'w') as f:
-        f.write(str(pid))
+    if start_time is None:
+        start_time = get_process_start_time(pid)
+
+    key = str(file_path)
+    fd = HELD_PID_FILES.get(key)
+
+    if fd is None:
+        fd = _lock_pid_file(file_path, os.O_RDWR | os.O_CREAT)
+
+        if fd is None:
+            raise FileExistsError(f"PID file is locked by another running process: {file_path}")
+
+        _hold(key, fd)
 
-    register(remove_pid_file_and_unregister)
+    os.ftruncate(fd, 0)
+    os.lseek(fd, 0, os.SEEK_SET)
+    os.write(fd, f'{pid}\n{start_time or ""}\n'.encode())
@@ -0,0 +1,26 @@
+from inspy_hard_stat.ihs_lib.process.events import ProcessEvent, ProcessEventKind, ProcessEventStream, scan_pids
+from inspy_hard_stat.ihs_lib.process.monitor import ProcessColumns, ProcessHistory, WatchedProcessMonitor
+from inspy_hard_stat.ihs_lib.process.ranking import ProcessRanking, RankedProcess
+from inspy_hard_stat.ihs_lib.process.stats import PROCESS_STATS_CACHE, ProcessStats, ProcessStatsCache
+from inspy_hard_stat.ihs_lib.process.table import ProcessEntry, ProcessTable
+from inspy_hard_stat.ihs_lib.process.tree import ProcessTree, TreeTotals
+
+
+__all__ = [
+        'PROCESS_STATS_CACHE',
+        'ProcessColumns',
+        'ProcessEntry',
+        'ProcessEvent',
+        'ProcessEventKind',
+        'ProcessEventStream',
+        'ProcessHistory',
+        'ProcessRanking',
+        'ProcessStats',
+        'ProcessStatsCache',
+        'ProcessTable',
+        'ProcessTree',
+        'RankedProcess',
+        'TreeTotals',
+        'WatchedProcessMonitor',
+        'scan_pids',
+        ]
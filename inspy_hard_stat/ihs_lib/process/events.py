@@ -0,0 +1,271 @@
+"""
+"Process started" and "process exited" events, from diffing the set of running PIDs between polls.
+
+On Linux the PIDs are read with a single :func:`os.scandir` of ``/proc``; no :class:`psutil.Process` is created for
+any of them. Elsewhere :func:`psutil.pids` is used.
+
+Anything that needs to know when processes come and go (the LHM watchdog, job accounting, the
+:class:`~inspy_hard_stat.ihs_lib.process.table.ProcessTable`) can subscribe to one shared
+:class:`ProcessEventStream` instead of rescanning the process list itself.
+
+Classes:
+    ProcessEventKind:
+        The kinds of process event.
+
+    ProcessEvent:
+        A single process event.
+
+    ProcessEventStream:
+        Polls the set of running PIDs and notifies subscribers of changes.
+
+Functions:
+    scan_pids():
+        Get the set of running PIDs as cheaply as the platform allows.
+
+Since:
+    1.0.0
+"""
+import os
+import threading
+import time
+from enum import Enum
+from typing import Callable, Iterable, NamedTuple, Optional
+
+import psutil
+
+
+PROC_DIR = '/proc'
+
+HAS_PROC_DIR = os.path.isdir(os.path.join(PROC_DIR, 'self'))
+
+
+def scan_pids() -> set[int]:
+    """
+    Get the set of running PIDs as cheaply as the platform allows.
+
+    Returns:
+        set[int]:
+            The PIDs of every running process.
+    """
+    if HAS_PROC_DIR:
+        with os.scandir(PROC_DIR) as entries:
+            return {int(entry.name) for entry in entries if entry.name.isdigit()}
+
+    return set(psutil.pids())
+
+
+class ProcessEventKind(str, Enum):
+    """
+    The kinds of process event.
+
+    Members:
+        STARTED:
+            A process appeared since the previous poll.
+
+        EXITED:
+            A process disappeared since the previous poll.
+    """
+    STARTED = 'started'
+    EXITED = 'exited'
+
+
+class ProcessEvent(NamedTuple):
+    """
+    A single process event.
+
+    Attributes:
+        kind (ProcessEventKind):
+            Whether the process started or exited.
+
+        pid (int):
+            The PID of the process.
+
+        timestamp (float):
+            The UNIX timestamp of the poll that noticed the change. The change itself happened at some point since
+            the previous poll.
+    """
+    kind: ProcessEventKind
+    pid: int
+    timestamp: float
+
+
+ProcessEventCallback = Callable[[ProcessEvent], None]
+
+
+class ProcessEventStream:
+    """
+    Polls the set of running PIDs and notifies subscribers of processes that started or exited.
+
+    The first poll only records a baseline; no events are sent for processes that were already running. A process
+    that starts and exits between two polls is never seen.
+
+    An exception raised by a callback is counted in :attr:`callback_errors` and does not stop the other subscribers
+    (or the polling thread) from receiving events.
+    """
+
+    def __init__(self):
+        self.__callback_errors = 0
+        self.__last_callback_error = None
+        self.__lock = threading.Lock()
+        self.__pids = None
+        self.__stopped = threading.Event()
+        self.__subscribers = []
+        self.__thread = None
+
+    @property
+    def callback_errors(self) -> int:
+        """
+        The number of times a subscriber's callback has raised an exception.
+
+        Returns:
+            int
+        """
+        return self.__callback_errors
+
+    @property
+    def last_callback_error(self) -> Optional[Exception]:
+        """
+        The last exception raised by a subscriber's callback, if any.
+
+        Returns:
+            Optional[Exception]
+        """
+        return self.__last_callback_error
+
+    @property
+    def pids(self) -> set[int]:
+        """
+        The PIDs that were running at the last poll. The returned set must not be modified.
+
+        Returns:
+            set[int]
+        """
+        return self.__pids if self.__pids is not None else set()
+
+    @property
+    def polled(self) -> bool:
+        """
+        Whether the stream has been polled at least once.
+
+        Returns:
+            bool
+        """
+        return self.__pids is not None
+
+    def subscribe(self, callback: ProcessEventCallback, kinds: Optional[Iterable[ProcessEventKind]] = None) -> None:
+        """
+        Register a callable to be called with each event.
+
+        Callbacks run on whichever thread polls the stream, so they should be quick.
+
+        Parameters:
+            callback (Callable[[ProcessEvent], None]):
+                The callable.
+
+            kinds (Iterable[ProcessEventKind]):
+                The kinds of event to receive. Optional; default is every kind.
+
+        Returns:
+            None
+        """
+        kinds = frozenset(kinds) if kinds is not None else frozenset(ProcessEventKind)
+
+        with self.__lock:
+            self.__subscribers = [(cb, k) for cb, k in self.__subscribers if cb != callback] + [(callback, kinds)]
+
+    def unsubscribe(self, callback: ProcessEventCallback) -> None:
+        """
+        Stop sending events to a callable previously passed to :meth:`subscribe`.
+
+        Parameters:
+            callback (Callable[[ProcessEvent], None]):
+                The callable.
+
+        Returns:
+            None
+        """
+        with self.__lock:
+            self.__subscribers = [(cb, k) for cb, k in self.__subscribers if cb != callback]
+
+    def poll(self) -> tuple[set[int], set[int]]:
+        """
+        Compare the running PIDs with those seen at the previous poll, and notify subscribers of the differences.
+
+        Returns:
+            tuple[set[int], set[int]]:
+                The PIDs that started, and the PIDs that exited, since the previous poll. Both are empty on the first
+                poll.
+        """
+        current = scan_pids()
+
+        with self.__lock:
+            previous = self.__pids
+            self.__pids = current
+            subscribers = self.__subscribers
+
+        if previous is None:
+            return set(), set()
+
+        started = current - previous
+        exited = previous - current
+
+        if subscribers and (started or exited):
+            timestamp = time.time()
+
+            for kind, pids in ((ProcessEventKind.EXITED, exited), (ProcessEventKind.STARTED, started)):
+                for pid in sorted(pids):
+                    event = ProcessEvent(kind, pid, timestamp)
+
+                    for callback, kinds in subscribers:
+                        if kind in kinds:
+                            try:
+                                callback(event)
+                            except Exception as e:
+                                with self.__lock:
+                                    self.__callback_errors += 1
+                                    self.__last_callback_error = e
+
+        return started, exited
+
+    def start(self, interval: float = 1.0) -> threading.Thread:
+        """
+        Poll the stream on a background (daemon) thread.
+
+        Parameters:
+            interval (float):
+                Seconds between polls. Optional; default is 1.0.
+
+        Returns:
+            threading.Thread:
+                The polling thread.
+        """
+        if self.__thread is None or not self.__thread.is_alive():
+            self.__stopped.clear()
+            self.__thread = threading.Thread(
+                    target=self._run, args=(interval,), name='ihs-process-events', daemon=True
+                    )
+            self.__thread.start()
+
+        return self.__thread
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop the polling thread started by :meth:`start`.
+
+        Parameters:
+            timeout (float):
+                The longest time to wait for the thread to finish, in seconds. Optional.
+
+        Returns:
+            None
+        """
+        self.__stopped.set()
+
+        if self.__thread is not None and self.__thread is not threading.current_thread():
+            self.__thread.join(timeout)
+
+    def _run(self, interval: float) -> None:
+        self.poll()
+
+        while not self.__stopped.wait(interval):
+            self.poll()
@@ -0,0 +1,701 @@
+"""
+Continuous resource monitoring for a watched set of processes.
+
+A :class:`WatchedProcessMonitor` samples every watched process in a single batched pass, reading each one inside
+:meth:`psutil.Process.oneshot`, and writes the results into per-field arrays (:class:`ProcessColumns`) rather than
+building a dictionary per process.
+
+Processes can be watched by PID or by name pattern. Name patterns are matched against a shared
+:class:`~inspy_hard_stat.ihs_lib.process.table.ProcessTable`, so processes that come and go under a pattern (render
+workers, for instance) are picked up as they start without rescanning the whole process table.
+
+I/O, syscall and context-switch rates are worked out from the change in each process's counters since the previous
+pass, so they cost nothing beyond the counters already read in that pass. Passes can be kept in a fixed-size
+:class:`ProcessHistory`, so a spike can be lined up with what the other watched processes were doing at the time.
+
+Classes:
+    ProcessColumns:
+        Per-field arrays holding the result of one sampling pass.
+
+    ProcessHistory:
+        A ring buffer of recent sampling passes.
+
+    WatchedProcessMonitor:
+        Samples the watched processes.
+
+Since:
+    1.0.0
+"""
+import time
+from array import array
+from collections import deque
+from fnmatch import fnmatchcase
+from typing import Iterable, Optional
+
+import psutil
+
+from inspy_hard_stat.ihs_lib.process.stats import ProcessStatsCache
+from inspy_hard_stat.ihs_lib.process.table import ProcessTable
+
+
+UNAVAILABLE = -1
+"""The value stored in a column when the platform (or permissions) does not provide it, or, for a rate, on the first
+pass that sees a process."""
+
+
+class ProcessColumns:
+    """
+    Per-field arrays holding the result of one sampling pass.
+
+    Row ``i`` of every column belongs to the same process. Columns hold :data:`UNAVAILABLE` where a value could not be
+    read. Rates are per second, over the time since the previous pass.
+
+    Attributes:
+        timestamp (float):
+            The UNIX timestamp at which the pass started.
+
+        pid (array):
+            The PIDs of the sampled processes.
+
+        cpu_percent (array):
+            CPU usage since the previous pass, as a percentage of one CPU.
+
+        rss (array):
+            Resident set size, in bytes.
+
+        num_threads (array):
+            Number of threads.
+
+        num_fds (array):
+            Number of open file descriptors (handles, on Windows).
+
+        read_bytes (array):
+            Total bytes read.
+
+        write_bytes (array):
+            Total bytes written.
+
+        read_rate (array):
+            Bytes read per second.
+
+        write_rate (array):
+            Bytes written per second.
+
+        read_syscall_rate (array):
+            Read calls per second (read operations, on Windows).
+
+        write_syscall_rate (array):
+            Write calls per second (write operations, on Windows).
+
+        ctx_voluntary_rate (array):
+            Voluntary context switches per second; mostly the process blocking on I/O or locks.
+
+        ctx_involuntary_rate (array):
+            Involuntary context switches per second; the process being preempted. Always 0 on Windows.
+    """
+    FLOAT_FIELDS = (
+            'cpu_percent',
+            'read_rate',
+            'write_rate',
+            'read_syscall_rate',
+            'write_syscall_rate',
+            'ctx_voluntary_rate',
+            'ctx_involuntary_rate',
+            )
+    INT_FIELDS = ('pid', 'rss', 'num_threads', 'num_fds', 'read_bytes', 'write_bytes')
+    FIELDS = (
+            'pid',
+            'cpu_percent',
+            'rss',
+            'num_threads',
+            'num_fds',
+            'read_bytes',
+            'write_bytes',
+            'read_rate',
+            'write_rate',
+            'read_syscall_rate',
+            'write_syscall_rate',
+            'ctx_voluntary_rate',
+            'ctx_involuntary_rate',
+            )
+
+    __slots__ = FIELDS + ('timestamp',)
+
+    def __init__(self):
+        self.timestamp = None
+
+        for field in self.FIELDS:
+            setattr(self, field, array('d' if field in self.FLOAT_FIELDS else 'q'))
+
+    def append(self, *values) -> None:
+        """
+        Append one row. Values must be given in the order of :attr:`FIELDS`.
+
+        Returns:
+            None
+        """
+        for field, value in zip(self.FIELDS, values):
+            getattr(self, field).append(value)
+
+    def copy(self) -> 'ProcessColumns':
+        """
+        Copy the columns, so they survive the next pass.
+
+        Returns:
+            ProcessColumns
+        """
+        columns = ProcessColumns()
+        columns.timestamp = self.timestamp
+
+        for field in self.FIELDS:
+            getattr(columns, field).extend(getattr(self, field))
+
+        return columns
+
+    def clear(self) -> None:
+        """
+        Empty every column, keeping the arrays themselves.
+
+        Returns:
+            None
+        """
+        for field in self.FIELDS:
+            del getattr(self, field)[:]
+
+    def index_of(self, pid: int) -> Optional[int]:
+        """
+        Find the row holding the given PID.
+
+        Parameters:
+            pid (int):
+                The PID to look for.
+
+        Returns:
+            Optional[int]:
+                The row index, or None if the PID was not sampled.
+        """
+        try:
+            return self.pid.index(pid)
+        except ValueError:
+            return None
+
+    def row(self, index: int) -> dict:
+        """
+        Build a dictionary for a single row. Intended for display and debugging, not for hot paths.
+
+        Parameters:
+            index (int):
+                The row index.
+
+        Returns:
+            dict:
+                The row, keyed by field name.
+        """
+        return {field: getattr(self, field)[index] for field in self.FIELDS}
+
+    def __len__(self):
+        return len(self.pid)
+
+
+class ProcessHistory:
+    """
+    A ring buffer of recent sampling passes.
+
+    Once full, each new pass pushes out the oldest one, so the memory used stays fixed however long the monitor runs.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Initialize the history.
+
+        Parameters:
+            capacity (int):
+                The number of passes to keep.
+
+        Raises:
+            ValueError:
+                Raised when the capacity is less than 1.
+        """
+        if capacity < 1:
+            raise ValueError(f'History capacity must be at least 1, not {capacity}')
+
+        self.__passes = deque(maxlen=capacity)
+
+    @property
+    def capacity(self) -> int:
+        """
+        The number of passes kept.
+
+        Returns:
+            int
+        """
+        return self.__passes.maxlen
+
+    @property
+    def latest(self) -> Optional[ProcessColumns]:
+        """
+        The most recent pass, if any.
+
+        Returns:
+            Optional[ProcessColumns]
+        """
+        return self.__passes[-1] if self.__passes else None
+
+    def append(self, columns: ProcessColumns) -> None:
+        """
+        Add a pass, pushing out the oldest one if the history is full.
+
+        Parameters:
+            columns (ProcessColumns):
+                The pass. It is stored as-is, so it must not be reused afterwards.
+
+        Returns:
+            None
+        """
+        self.__passes.append(columns)
+
+    def clear(self) -> None:
+        """
+        Forget every pass.
+
+        Returns:
+            None
+        """
+        self.__passes.clear()
+
+    def series(self, pid: int, field: str) -> list[tuple[float, float]]:
+        """
+        Get the values of one field for one process, across every pass in which it was sampled.
+
+        Parameters:
+            pid (int):
+                The PID of the process.
+
+            field (str):
+                The field name; one of :attr:`ProcessColumns.FIELDS`.
+
+        Returns:
+            list[tuple[float, float]]:
+                ``(timestamp, value)`` pairs, oldest first.
+
+        Raises:
+            ValueError:
+                Raised when the field name is not known.
+        """
+        if field not in ProcessColumns.FIELDS:
+            raise ValueError(f"Unknown field '{field}'. Valid fields: {ProcessColumns.FIELDS}")
+
+        series = []
+
+        for columns in self.__passes:
+            index = columns.index_of(pid)
+
+            if index is not None:
+                series.append((columns.timestamp, getattr(columns, field)[index]))
+
+        return series
+
+    def since(self, timestamp: float) -> list[ProcessColumns]:
+        """
+        Get the passes taken at or after the given time.
+
+        Parameters:
+            timestamp (float):
+                A UNIX timestamp.
+
+        Returns:
+            list[ProcessColumns]:
+                The passes, oldest first.
+        """
+        return [columns for columns in self.__passes if columns.timestamp >= timestamp]
+
+    def __iter__(self):
+        return iter(self.__passes)
+
+    def __len__(self):
+        return len(self.__passes)
+
+
+class WatchedProcessMonitor:
+    """
+    Samples CPU, memory, thread, file-descriptor, I/O and context-switch figures for a watched set of processes.
+
+    The columns returned by :meth:`sample` are reused by the next pass; copy them if you need to keep them, or give
+    the monitor a ``history`` size to have it keep copies of recent passes.
+    """
+
+    def __init__(
+            self,
+            pids: Optional[Iterable[int]] = None,
+            names: Optional[Iterable[str]] = None,
+            strict_case: bool = False,
+            table: Optional[ProcessTable] = None,
+            stats_cache: Optional[ProcessStatsCache] = None,
+            history: int = 0,
+            ):
+        """
+        Initialize the monitor.
+
+        Parameters:
+            pids (Iterable[int]):
+                PIDs to watch. Optional.
+
+            names (Iterable[str]):
+                Process names, or shell-style patterns (e.g. ``'blender*'``), to watch. Optional.
+
+            strict_case (bool):
+                If True, name patterns are matched case-sensitively. Optional; default is False.
+
+            table (ProcessTable):
+                The process table used to resolve name patterns. Optional; a new table is created if not provided.
+                A table can be shared with other consumers (such as
+                :class:`~inspy_hard_stat.ihs_lib.process.tree.ProcessTree`) so the processes are only tracked once.
+
+            stats_cache (ProcessStatsCache):
+                The cache holding CPU-time samples between passes. Optional; a new cache is created if not provided.
+
+            history (int):
+                The number of recent passes to keep in :attr:`history`. Optional; default is 0 (none).
+        """
+        self.__counters = {}
+        self.__history = ProcessHistory(history) if history else None
+        self.__pids = set(pids or ())
+        self.__patterns = []
+        self.__strict_case = strict_case
+        self.__name_matches = set()
+        self.__processes = {}
+        self.__table = table if table is not None else ProcessTable()
+        self.__stats_cache = stats_cache if stats_cache is not None else ProcessStatsCache()
+        self.__columns = ProcessColumns()
+
+        self.__table.subscribe(self._on_table_refresh)
+
+        for name in names or ():
+            self.watch_name(name)
+
+    @classmethod
+    def for_lhm(cls, names: Optional[Iterable[str]] = None, **kwargs) -> 'WatchedProcessMonitor':
+        """
+        Create a monitor that watches Libre Hardware Monitor, along with any other given process names.
+
+        Parameters:
+            names (Iterable[str]):
+                Additional process names, or patterns, to watch. Optional.
+
+            **kwargs:
+                Passed on to :class:`WatchedProcessMonitor`.
+
+        Returns:
+            WatchedProcessMonitor
+        """
+        from inspy_hard_stat.ihs_lib.pid import DEFAULT_PROC_NAME
+
+        return cls(names=[DEFAULT_PROC_NAME, *(names or ())], **kwargs)
+
+    @property
+    def columns(self) -> ProcessColumns:
+        """
+        The columns filled by the most recent call to :meth:`sample`.
+
+        Returns:
+            ProcessColumns
+        """
+        return self.__columns
+
+    @property
+    def history(self) -> Optional[ProcessHistory]:
+        """
+        The recent passes, if the monitor was asked to keep them.
+
+        Returns:
+            Optional[ProcessHistory]
+        """
+        return self.__history
+
+    @property
+    def patterns(self) -> list[str]:
+        """
+        The name patterns being watched.
+
+        Returns:
+            list[str]
+        """
+        return list(self.__patterns)
+
+    @property
+    def table(self) -> ProcessTable:
+        """
+        The process table used to resolve name patterns.
+
+        Returns:
+            ProcessTable
+        """
+        return self.__table
+
+    @property
+    def watched_pids(self) -> set[int]:
+        """
+        The PIDs currently being watched, whether given explicitly or matched by a name pattern.
+
+        Returns:
+            set[int]
+        """
+        return self.__pids | self.__name_matches
+
+    def _matches(self, name: str) -> bool:
+        if not self.__strict_case:
+            name = name.lower()
+
+        return any(fnmatchcase(name, pattern) for pattern in self.__patterns)
+
+    def watch_pid(self, pid: int) -> None:
+        """
+        Start watching a process by PID.
+
+        Parameters:
+            pid (int):
+                The PID to watch.
+
+        Returns:
+            None
+        """
+        self.__pids.add(pid)
+
+    def unwatch_pid(self, pid: int) -> None:
+        """
+        Stop watching a process by PID.
+
+        Parameters:
+            pid (int):
+                The PID to stop watching.
+
+        Returns:
+            None
+        """
+        self.__pids.discard(pid)
+        self.__processes.pop(pid, None)
+        self.__counters.pop(pid, None)
+
+    def watch_name(self, pattern: str) -> None:
+        """
+        Start watching every process whose name matches the given pattern, including ones that start later.
+
+        Parameters:
+            pattern (str):
+                A process name or shell-style pattern.
+
+        Returns:
+            None
+        """
+        if not self.__strict_case:
+            pattern = pattern.lower()
+
+        if pattern in self.__patterns:
+            return
+
+        self.__patterns.append(pattern)
+
+        if self.__table.refreshed:
+            self.__name_matches.update(entry.pid for entry in self.__table if self._matches(entry.name))
+
+    def unwatch_name(self, pattern: str) -> None:
+        """
+        Stop watching processes matched by the given pattern.
+
+        Parameters:
+            pattern (str):
+                The pattern previously passed to :meth:`watch_name`.
+
+        Returns:
+            None
+        """
+        if not self.__strict_case:
+            pattern = pattern.lower()
+
+        if pattern in self.__patterns:
+            self.__patterns.remove(pattern)
+            matches = set()
+
+            for pid in self.__name_matches:
+                entry = self.__table.get(pid)
+
+                # A process the table no longer knows has exited; it is dropped rather than rechecked.
+                if entry is not None and self._matches(entry.name):
+                    matches.add(pid)
+
+            self.__name_matches = matches
+
+    def _on_table_refresh(self, started: set[int], exited: set[int]) -> None:
+        """
+        Update the set of processes matched by name after the process table is refreshed.
+
+        Only processes that started since the last refresh are checked against the patterns.
+
+        Parameters:
+            started (set[int]):
+                The PIDs that started.
+
+            exited (set[int]):
+                The PIDs that exited.
+
+        Returns:
+            None
+        """
+        self.__name_matches.difference_update(exited)
+
+        if self.__patterns:
+            self.__name_matches.update(pid for pid in started if self._matches(self.__table.get(pid).name))
+
+        for pid in exited:
+            self.__processes.pop(pid, None)
+            self.__counters.pop(pid, None)
+            self.__stats_cache.forget(pid)
+
+    def _get_process(self, pid: int) -> Optional[psutil.Process]:
+        entry = self.__table.get(pid)
+
+        if entry is not None:
+            return entry.process
+
+        process = self.__processes.get(pid)
+
+        if process is None:
+            try:
+                process = self.__processes[pid] = psutil.Process(pid)
+            except psutil.NoSuchProcess:
+                return None
+
+        return process
+
+    def _drop(self, pid: int) -> None:
+        self.__pids.discard(pid)
+        self.__name_matches.discard(pid)
+        self.__processes.pop(pid, None)
+        self.__counters.pop(pid, None)
+        self.__stats_cache.forget(pid)
+
+    @staticmethod
+    def _num_fds(process: psutil.Process) -> int:
+        try:
+            if hasattr(process, 'num_fds'):
+                return process.num_fds()
+
+            return process.num_handles()
+        except psutil.AccessDenied:
+            return UNAVAILABLE
+
+    @staticmethod
+    def _io_counters(process: psutil.Process):
+        try:
+            return process.io_counters()
+        except (psutil.AccessDenied, AttributeError):
+            return None
+
+    @staticmethod
+    def _num_ctx_switches(process: psutil.Process):
+        try:
+            return process.num_ctx_switches()
+        except psutil.AccessDenied:
+            return None
+
+    def _rates(self, key: tuple[int, float], now: float, io, ctx) -> tuple[float, ...]:
+        """
+        Work out the per-second rates for a process from the change in its counters since the previous pass.
+
+        Parameters:
+            key (tuple[int, float]):
+                The ``(pid, create_time)`` key of the process.
+
+            now (float):
+                The monotonic time of this pass.
+
+            io:
+                The process's I/O counters, or None if they could not be read.
+
+            ctx:
+                The process's context-switch counters, or None if they could not be read.
+
+        Returns:
+            tuple[float, ...]:
+                The read, write, read-syscall, write-syscall, voluntary and involuntary context-switch rates, each
+                :data:`UNAVAILABLE` if it cannot be worked out yet.
+        """
+        counters = (
+                io.read_bytes if io else None,
+                io.write_bytes if io else None,
+                io.read_count if io else None,
+                io.write_count if io else None,
+                ctx.voluntary if ctx else None,
+                ctx.involuntary if ctx else None,
+                )
+
+        pid = key[0]
+        previous = self.__counters.get(pid)
+        self.__counters[pid] = (key, now, counters)
+
+        if previous is None or previous[0] != key or now <= previous[1]:
+            return (UNAVAILABLE,) * len(counters)
+
+        elapsed = now - previous[1]
+
+        return tuple(
+                UNAVAILABLE if current is None or last is None else max(current - last, 0) / elapsed
+                for current, last in zip(counters, previous[2])
+                )
+
+    def sample(self) -> ProcessColumns:
+        """
+        Sample every watched process in one pass.
+
+        Processes that have exited are dropped from the watch list (a PID that is reused later is not silently picked
+        up again, unless it matches a name pattern).
+
+        Returns:
+            ProcessColumns:
+                The result of the pass.
+        """
+        if self.__patterns:
+            self.__table.refresh()
+
+        columns = self.__columns
+        columns.clear()
+        columns.timestamp = time.time()
+        now = time.monotonic()
+
+        for pid in self.watched_pids:
+            process = self._get_process(pid)
+
+            if process is None:
+                self._drop(pid)
+                continue
+
+            try:
+                with process.oneshot():
+                    cpu_times = process.cpu_times()
+                    rss = process.memory_info().rss
+                    num_threads = process.num_threads()
+                    num_fds = self._num_fds(process)
+                    io = self._io_counters(process)
+                    ctx = self._num_ctx_switches(process)
+                    key = (pid, process.create_time())
+            except psutil.NoSuchProcess:
+                self._drop(pid)
+                continue
+            except psutil.AccessDenied:
+                continue
+
+            columns.append(
+                    pid,
+                    self.__stats_cache.cpu_percent(key, cpu_times.user + cpu_times.system, now),
+                    rss,
+                    num_threads,
+                    num_fds,
+                    io.read_bytes if io else UNAVAILABLE,
+                    io.write_bytes if io else UNAVAILABLE,
+                    *self._rates(key, now, io, ctx),
+                    )
+
+        if self.__history is not None:
+            self.__history.append(columns.copy())
+
+        return columns
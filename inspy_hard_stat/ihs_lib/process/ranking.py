@@ -0,0 +1,218 @@
+"""
+Top-N process rankings by CPU and memory usage.
+
+A :class:`ProcessRanking` follows every process in a
+:class:`~inspy_hard_stat.ihs_lib.process.table.ProcessTable`. On each :meth:`~ProcessRanking.update` it samples each
+process through the :class:`psutil.Process` objects the table already holds, with
+:meth:`~inspy_hard_stat.ihs_lib.process.stats.ProcessStatsCache.sample`, which works out CPU usage from the change since
+the process was last sampled. Rankings are then taken with a
+bounded heap (:func:`heapq.nlargest`), so finding the top 10 of 10,000 processes is a partial sort, and only the
+processes that make the cut are turned into result objects.
+
+Classes:
+    RankedProcess:
+        One entry in a ranking.
+
+    ProcessRanking:
+        Keeps per-process CPU and memory figures and ranks them.
+
+Since:
+    1.0.0
+"""
+import heapq
+from typing import Iterable, NamedTuple, Optional
+
+import psutil
+
+from inspy_hard_stat.ihs_lib.process.stats import ProcessStatsCache
+from inspy_hard_stat.ihs_lib.process.table import ProcessTable
+
+
+RANK_KEYS = ('cpu', 'rss')
+
+
+class RankedProcess(NamedTuple):
+    """
+    One entry in a ranking.
+
+    Attributes:
+        pid (int):
+            The PID of the process.
+
+        name (str):
+            The name of the process.
+
+        cpu_percent (Optional[float]):
+            CPU usage since the process was last sampled, as a percentage of one CPU, or None if CPU usage is not
+            tracked.
+
+        rss (Optional[int]):
+            Resident set size, in bytes, or None if memory usage is not tracked.
+    """
+    pid: int
+    name: str
+    cpu_percent: Optional[float]
+    rss: Optional[int]
+
+
+class ProcessRanking:
+    """
+    Keeps per-process CPU and memory figures for every running process and ranks them.
+
+    Call :meth:`update` once per tick, then :meth:`top` as often as needed; rankings are cached until the next update.
+    """
+
+    def __init__(
+            self,
+            table: Optional[ProcessTable] = None,
+            track: Iterable[str] = RANK_KEYS,
+            stats_cache: Optional[ProcessStatsCache] = None,
+            ):
+        """
+        Initialize the ranking.
+
+        Parameters:
+            table (ProcessTable):
+                The process table to follow. Optional; a new table is created if not provided.
+
+            track (Iterable[str]):
+                Which figures to keep: any of ``'cpu'`` and ``'rss'``. Tracking fewer figures means fewer reads per
+                process per update. Optional; default is both.
+
+            stats_cache (ProcessStatsCache):
+                The cache holding CPU-time samples between updates. Optional; a new cache is created if not provided.
+                Pass one explicitly to share samples with other readers.
+
+        Raises:
+            ValueError:
+                Raised when an unknown figure is requested.
+        """
+        track = tuple(track)
+
+        for key in track:
+            if key not in RANK_KEYS:
+                raise ValueError(f"Cannot rank by '{key}'. Valid keys: {RANK_KEYS}")
+
+        self.__cpu_percent = {}
+        self.__rankings = {}
+        self.__rss = {}
+        self.__stats_cache = stats_cache if stats_cache is not None else ProcessStatsCache()
+        self.__table = table if table is not None else ProcessTable()
+        self.__track = track
+
+        self.__table.subscribe(self._on_table_refresh)
+
+    @property
+    def table(self) -> ProcessTable:
+        """
+        The process table the ranking follows.
+
+        Returns:
+            ProcessTable
+        """
+        return self.__table
+
+    @property
+    def tracked(self) -> tuple[str, ...]:
+        """
+        The figures being tracked.
+
+        Returns:
+            tuple[str, ...]
+        """
+        return self.__track
+
+    def _on_table_refresh(self, started: set[int], exited: set[int]) -> None:
+        for pid in exited:
+            self.__cpu_percent.pop(pid, None)
+            self.__rss.pop(pid, None)
+            self.__stats_cache.forget(pid)
+
+    def update(self, refresh: bool = True) -> None:
+        """
+        Refresh the per-process figures.
+
+        Parameters:
+            refresh (bool):
+                If True, the process table is refreshed first. Pass False when something else refreshes a shared
+                table each tick. Optional; default is True.
+
+        Returns:
+            None
+        """
+        if refresh or not self.__table.refreshed:
+            self.__table.refresh()
+
+        track_cpu = 'cpu' in self.__track
+        track_rss = 'rss' in self.__track
+
+        cpu_percent = self.__cpu_percent
+        rss = self.__rss
+        stats_cache = self.__stats_cache
+
+        for entry in self.__table:
+            pid = entry.pid
+
+            try:
+                if track_cpu:
+                    # One oneshot() read gives both figures, and the CPU history is shared with other samplers.
+                    stats = stats_cache.sample(entry.process)
+                else:
+                    stats = None
+                    rss[pid] = entry.process.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+
+            if stats is not None:
+                cpu_percent[pid] = stats.cpu_percent
+
+                if track_rss:
+                    rss[pid] = stats.rss
+
+        self.__rankings.clear()
+
+    def top(self, n: int = 10, by: str = 'cpu') -> list[RankedProcess]:
+        """
+        Get the processes using the most CPU or memory, as of the last update.
+
+        Parameters:
+            n (int):
+                How many processes to return. Optional; default is 10.
+
+            by (str):
+                ``'cpu'`` or ``'rss'``. Optional; default is ``'cpu'``.
+
+        Returns:
+            list[RankedProcess]:
+                Up to ``n`` processes, highest first.
+
+        Raises:
+            ValueError:
+                Raised when ranking by a figure that is not being tracked.
+        """
+        if by not in self.__track:
+            raise ValueError(f"Not tracking '{by}'. Tracked: {self.__track}")
+
+        cached = self.__rankings.get((by, n))
+
+        if cached is not None:
+            return cached
+
+        values = self.__cpu_percent if by == 'cpu' else self.__rss
+        track_cpu = 'cpu' in self.__track
+        track_rss = 'rss' in self.__track
+        ranking = []
+
+        for pid in heapq.nlargest(n, values, key=values.__getitem__):
+            entry = self.__table.get(pid)
+
+            ranking.append(RankedProcess(
+                    pid=pid,
+                    name=entry.name if entry is not None else '',
+                    cpu_percent=self.__cpu_percent.get(pid, 0.0) if track_cpu else None,
+                    rss=self.__rss.get(pid, 0) if track_rss else None,
+                    ))
+
+        self.__rankings[(by, n)] = ranking
+
+        return ranking
@@ -0,0 +1,249 @@
+"""
+Non-blocking per-process statistics.
+
+`psutil.Process.cpu_percent(interval=...)` sleeps for the length of the interval to measure CPU usage. This module
+keeps the previous CPU-time sample for every process it has seen (keyed by PID *and* creation time, so a recycled PID
+never inherits another process's history) and derives CPU usage from the delta between lookups instead.
+
+Classes:
+    CPUSample:
+        A single CPU-time reading for a process.
+
+    ProcessStats:
+        The statistics gathered for a process in one lookup.
+
+    ProcessStatsCache:
+        Gathers process statistics without sleeping, remembering CPU-time samples between lookups.
+
+Misc Variables:
+    PROCESS_STATS_CACHE (ProcessStatsCache):
+        The shared cache used by :func:`inspy_hard_stat.ihs_lib.pid.find_process_by_pid`.
+
+Since:
+    1.0.0
+"""
+import time
+from typing import Iterable, NamedTuple, Optional, Union
+
+import psutil
+
+
+ProcessKey = tuple[int, float]
+
+
+class CPUSample(NamedTuple):
+    """
+    A single CPU-time reading for a process.
+
+    Attributes:
+        cpu_time (float):
+            The combined user and system CPU time of the process, in seconds.
+
+        timestamp (float):
+            The value of :func:`time.monotonic` when the reading was taken.
+
+        percent (float):
+            The CPU usage computed from this reading.
+    """
+    cpu_time: float
+    timestamp: float
+    percent: float
+
+
+class ProcessStats(NamedTuple):
+    """
+    The statistics gathered for a process in one lookup.
+
+    Attributes:
+        pid (int):
+            The PID of the process.
+
+        name (str):
+            The name of the process.
+
+        status (str):
+            The status of the process (e.g. 'running', 'sleeping').
+
+        create_time (float):
+            The creation time of the process, as a UNIX timestamp.
+
+        cpu_percent (float):
+            The CPU usage of the process since it was last sampled. For a process that has not been sampled before,
+            this is its average usage over its lifetime.
+
+        rss (int):
+            The resident set size of the process, in bytes.
+    """
+    pid: int
+    name: str
+    status: str
+    create_time: float
+    cpu_percent: float
+    rss: int
+
+
+class ProcessStatsCache:
+    """
+    Gathers process statistics without sleeping.
+
+    Each lookup reads everything it needs inside a single :meth:`psutil.Process.oneshot` block and stores the CPU time
+    it saw. The next lookup of the same process computes CPU usage from the difference, so no lookup ever has to wait
+    for a measurement interval.
+
+    Samples are keyed by ``(pid, create_time)``; if a PID is reused by a new process, the old samples are not used for
+    it.
+    """
+
+    def __init__(self):
+        self.__samples = {}
+
+    @property
+    def samples(self) -> dict[ProcessKey, CPUSample]:
+        """
+        The CPU-time samples currently held, keyed by ``(pid, create_time)``.
+
+        Returns:
+            dict[tuple[int, float], CPUSample]
+        """
+        return self.__samples
+
+    def cpu_percent(self, key: ProcessKey, cpu_time: float, now: Optional[float] = None) -> float:
+        """
+        Record a CPU-time reading for a process and return its CPU usage since the previous reading.
+
+        Parameters:
+            key (tuple[int, float]):
+                The ``(pid, create_time)`` key of the process.
+
+            cpu_time (float):
+                The combined user and system CPU time of the process, in seconds.
+
+            now (float):
+                The value of :func:`time.monotonic` at the time of the reading. Optional; defaults to the current value.
+
+        Returns:
+            float:
+                The CPU usage as a percentage of one CPU (so it may exceed 100 on multicore systems, the same as
+                :meth:`psutil.Process.cpu_percent`).
+        """
+        if now is None:
+            now = time.monotonic()
+
+        previous = self.__samples.get(key)
+
+        if previous is None:
+            # No history yet; report the lifetime average rather than blocking for a second reading.
+            lifetime = time.time() - key[1]
+            percent = (cpu_time / lifetime) * 100 if lifetime > 0 else 0.0
+        else:
+            elapsed = now - previous.timestamp
+
+            if elapsed <= 0:
+                return previous.percent
+
+            percent = max(cpu_time - previous.cpu_time, 0.0) / elapsed * 100
+
+        self.__samples[key] = CPUSample(cpu_time, now, percent)
+
+        return percent
+
+    def forget(self, pid: int) -> None:
+        """
+        Drop all samples held for the given PID.
+
+        Parameters:
+            pid (int):
+                The PID to forget.
+
+        Returns:
+            None
+        """
+        for key in [key for key in self.__samples if key[0] == pid]:
+            del self.__samples[key]
+
+    def prune(self, live_pids: Optional[Iterable[int]] = None) -> int:
+        """
+        Drop samples for processes that are no longer running.
+
+        Parameters:
+            live_pids (Iterable[int]):
+                The PIDs that are currently running. Optional; if not provided, :func:`psutil.pids` is used.
+
+        Returns:
+            int:
+                The number of samples dropped.
+        """
+        live_pids = set(psutil.pids() if live_pids is None else live_pids)
+        stale = [key for key in self.__samples if key[0] not in live_pids]
+
+        for key in stale:
+            del self.__samples[key]
+
+        return len(stale)
+
+    def sample(self, process: Union[int, psutil.Process]) -> Optional[ProcessStats]:
+        """
+        Gather statistics for a single process.
+
+        Parameters:
+            process (Union[int, psutil.Process]):
+                The PID of the process, or a :class:`psutil.Process` object for it.
+
+        Returns:
+            Optional[ProcessStats]:
+                The statistics for the process, or None if the process no longer exists.
+
+        Raises:
+            psutil.AccessDenied:
+                Raised when the current user is not permitted to read the process's information.
+        """
+        try:
+            if not isinstance(process, psutil.Process):
+                process = psutil.Process(process)
+
+            with process.oneshot():
+                create_time = process.create_time()
+                cpu_times = process.cpu_times()
+                stats = ProcessStats(
+                        pid=process.pid,
+                        name=process.name(),
+                        status=process.status(),
+                        create_time=create_time,
+                        cpu_percent=self.cpu_percent((process.pid, create_time), cpu_times.user + cpu_times.system),
+                        rss=process.memory_info().rss
+                        )
+        except psutil.NoSuchProcess:
+            self.forget(process if isinstance(process, int) else process.pid)
+            return None
+
+        return stats
+
+    def sample_many(self, pids: Iterable[Union[int, psutil.Process]]) -> list[ProcessStats]:
+        """
+        Gather statistics for several processes.
+
+        Processes that no longer exist, or whose information cannot be read, are skipped.
+
+        Parameters:
+            pids (Iterable[Union[int, psutil.Process]]):
+                The PIDs (or :class:`psutil.Process` objects) of the processes to sample.
+
+        Returns:
+            list[ProcessStats]:
+                The statistics for each process that could be sampled, in the order given.
+        """
+        results = []
+
+        for pid in pids:
+            try:
+                stats = self.sample(pid)
+            except psutil.AccessDenied:
+                continue
+
+            if stats is not None:
+                results.append(stats)
+
+        return results
+
+
+PROCESS_STATS_CACHE = ProcessStatsCache()
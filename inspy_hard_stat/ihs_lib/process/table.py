@@ -0,0 +1,315 @@
+"""
+An incrementally maintained table of running processes.
+
+Scanning every process with :func:`psutil.process_iter` on every tick is expensive. :class:`ProcessTable` instead
+keeps the set of PIDs it has already seen and, on each refresh, only describes (name, parent PID, creation time) the
+processes that have appeared since the last refresh. It also keeps parent/child links, so process trees can be
+followed without asking the operating system for each process's children.
+
+Several consumers can share one table; each subscribes with :meth:`ProcessTable.subscribe` and is told which processes
+started and exited whenever any of them refreshes it.
+
+The running PIDs are listed through a :class:`~inspy_hard_stat.ihs_lib.process.events.ProcessEventStream`, so a
+refresh also delivers start/exit events to anything subscribed to the same stream.
+
+Classes:
+    ProcessEntry:
+        What the table knows about a single process.
+
+    ProcessTable:
+        The table itself.
+
+Since:
+    1.0.0
+"""
+from fnmatch import fnmatchcase
+from typing import Callable, Iterator, Optional
+
+import psutil
+
+from inspy_hard_stat.ihs_lib.process.events import ProcessEventStream
+
+
+class ProcessEntry:
+    """
+    What a :class:`ProcessTable` knows about a single process.
+
+    Attributes:
+        pid (int):
+            The PID of the process.
+
+        ppid (int):
+            The PID of the process's parent.
+
+        name (str):
+            The name of the process.
+
+        create_time (float):
+            The creation time of the process, as a UNIX timestamp.
+
+        process (psutil.Process):
+            The :class:`psutil.Process` object for the process, kept so samplers do not have to create a new one.
+    """
+    __slots__ = ('pid', 'ppid', 'name', 'create_time', 'process')
+
+    def __init__(self, pid: int, ppid: int, name: str, create_time: float, process: psutil.Process):
+        self.pid = pid
+        self.ppid = ppid
+        self.name = name
+        self.create_time = create_time
+        self.process = process
+
+    @property
+    def key(self) -> tuple[int, float]:
+        """
+        The ``(pid, create_time)`` key used to identify this process across PID reuse.
+
+        Returns:
+            tuple[int, float]
+        """
+        return self.pid, self.create_time
+
+    def __repr__(self):
+        return f'<ProcessEntry: {self.name} ({self.pid}) | parent: {self.ppid}>'
+
+
+class ProcessTable:
+    """
+    An incrementally maintained table of running processes.
+
+    Call :meth:`refresh` once per tick; it returns the PIDs that started and exited since the previous refresh. Only
+    the processes that started are inspected.
+    """
+
+    def __init__(self, events: Optional[ProcessEventStream] = None):
+        """
+        Initialize the table.
+
+        Parameters:
+            events (ProcessEventStream):
+                The event stream used to list running PIDs. Optional; a new stream is created if not provided. Pass a
+                shared stream so its subscribers are notified whenever the table is refreshed.
+        """
+        self.__children = {}
+        self.__entries = {}
+        self.__events = events if events is not None else ProcessEventStream()
+        self.__listeners = []
+        self.__refreshed = False
+
+    @property
+    def entries(self) -> dict[int, ProcessEntry]:
+        """
+        The entries in the table, keyed by PID.
+
+        Returns:
+            dict[int, ProcessEntry]
+        """
+        return self.__entries
+
+    @property
+    def events(self) -> ProcessEventStream:
+        """
+        The event stream used to list running PIDs.
+
+        Returns:
+            ProcessEventStream
+        """
+        return self.__events
+
+    @property
+    def listeners(self) -> list[Callable[[set[int], set[int]], None]]:
+        """
+        The callables notified after each refresh.
+
+        Returns:
+            list[Callable[[set[int], set[int]], None]]
+        """
+        return list(self.__listeners)
+
+    @property
+    def refreshed(self) -> bool:
+        """
+        Whether the table has been refreshed at least once.
+
+        Returns:
+            bool
+        """
+        return self.__refreshed
+
+    def refresh(self) -> tuple[set[int], set[int]]:
+        """
+        Bring the table up to date with the running processes.
+
+        Returns:
+            tuple[set[int], set[int]]:
+                The PIDs of the processes that started, and the PIDs of the processes that exited, since the last
+                refresh. Processes that started and could not be inspected (because they already exited) are not
+                included.
+        """
+        self.__events.poll()
+
+        pids = self.__events.pids
+        known = self.__entries.keys()
+
+        exited = known - pids
+        started = set()
+
+        for pid in exited:
+            entry = self.__entries.pop(pid)
+            self.__children.pop(pid, None)
+
+            siblings = self.__children.get(entry.ppid)
+
+            if siblings is not None:
+                siblings.discard(pid)
+
+        for pid in pids - known:
+            entry = self.describe(pid)
+
+            if entry is not None:
+                self.__entries[pid] = entry
+                self.__children.setdefault(entry.ppid, set()).add(pid)
+                started.add(pid)
+
+        self.__refreshed = True
+
+        for listener in self.__listeners:
+            listener(started, exited)
+
+        return started, exited
+
+    def children_of(self, pid: int) -> set[int]:
+        """
+        Get the PIDs of the direct children of a process, as of the last refresh.
+
+        Parameters:
+            pid (int):
+                The PID of the parent process.
+
+        Returns:
+            set[int]:
+                The PIDs of the children. The returned set must not be modified.
+        """
+        return self.__children.get(pid, set())
+
+    def descendants_of(self, pid: int) -> set[int]:
+        """
+        Get the PIDs of all descendants of a process, as of the last refresh.
+
+        Parameters:
+            pid (int):
+                The PID of the ancestor process.
+
+        Returns:
+            set[int]:
+                The PIDs of the children, grandchildren, and so on. The process itself is not included.
+        """
+        descendants = set()
+        pending = [pid]
+
+        while pending:
+            for child in self.__children.get(pending.pop(), ()):
+                if child not in descendants:
+                    descendants.add(child)
+                    pending.append(child)
+
+        return descendants
+
+    @staticmethod
+    def describe(pid: int) -> Optional[ProcessEntry]:
+        """
+        Build a :class:`ProcessEntry` for the given PID.
+
+        Parameters:
+            pid (int):
+                The PID of the process to describe.
+
+        Returns:
+            Optional[ProcessEntry]:
+                The entry, or None if the process no longer exists or cannot be inspected.
+        """
+        try:
+            process = psutil.Process(pid)
+
+            with process.oneshot():
+                return ProcessEntry(pid, process.ppid(), process.name(), process.create_time(), process)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return None
+
+    def find_by_name(self, pattern: str, strict_case: bool = False) -> list[int]:
+        """
+        Find the PIDs of all processes in the table whose name matches the given pattern.
+
+        Parameters:
+            pattern (str):
+                A shell-style pattern (see :mod:`fnmatch`) or an exact process name.
+
+            strict_case (bool):
+                If True, the comparison is case-sensitive. Optional; default is False.
+
+        Returns:
+            list[int]:
+                The matching PIDs.
+        """
+        if not self.__refreshed:
+            self.refresh()
+
+        if not strict_case:
+            pattern = pattern.lower()
+
+        return [
+                pid for pid, entry in self.__entries.items()
+                if fnmatchcase(entry.name if strict_case else entry.name.lower(), pattern)
+                ]
+
+    def subscribe(self, listener: Callable[[set[int], set[int]], None]) -> None:
+        """
+        Register a callable to be notified after each refresh.
+
+        Parameters:
+            listener (Callable[[set[int], set[int]], None]):
+                Called with the PIDs that started and the PIDs that exited. On the first refresh every running process
+                is reported as started.
+
+        Returns:
+            None
+        """
+        if listener not in self.__listeners:
+            self.__listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[set[int], set[int]], None]) -> None:
+        """
+        Stop notifying a callable previously passed to :meth:`subscribe`.
+
+        Parameters:
+            listener (Callable[[set[int], set[int]], None]):
+                The callable to remove.
+
+        Returns:
+            None
+        """
+        if listener in self.__listeners:
+            self.__listeners.remove(listener)
+
+    def get(self, pid: int) -> Optional[ProcessEntry]:
+        """
+        Get the entry for the given PID.
+
+        Parameters:
+            pid (int):
+                The PID to look up.
+
+        Returns:
+            Optional[ProcessEntry]:
+                The entry, or None if the PID is not in the table.
+        """
+        return self.__entries.get(pid)
+
+    def __contains__(self, pid: int) -> bool:
+        return pid in self.__entries
+
+    def __iter__(self) -> Iterator[ProcessEntry]:
+        return iter(self.__entries.values())
+
+    def __len__(self) -> int:
+        return len(self.__entries)
@@ -0,0 +1,303 @@
+"""
+Resource usage summed over a process and all of its descendants.
+
+Applications that fork worker processes use far more than the numbers reported for their top-level PID. A
+:class:`ProcessTree` follows a root process (given by PID or by name) and every process descended from it, and reports
+the combined usage of the whole tree.
+
+The set of descendants is maintained incrementally from the parent/child links kept by a
+:class:`~inspy_hard_stat.ihs_lib.process.table.ProcessTable`: when a process starts it joins the tree if its parent is
+already a member, and when it exits it leaves. Nothing walks ``psutil.Process.children(recursive=True)`` on each tick.
+
+Processes whose parent exits stay in the tree, even though the operating system re-parents them; they are still doing
+the tree's work.
+
+Classes:
+    TreeTotals:
+        The combined usage of a process tree at one point in time.
+
+    ProcessTree:
+        Follows a process tree and sums its usage.
+
+Since:
+    1.0.0
+"""
+import time
+from fnmatch import fnmatchcase
+from typing import NamedTuple, Optional, Union
+
+import psutil
+
+from inspy_hard_stat.ihs_lib.process.stats import ProcessStatsCache
+from inspy_hard_stat.ihs_lib.process.table import ProcessTable
+
+
+class TreeTotals(NamedTuple):
+    """
+    The combined usage of a process tree at one point in time.
+
+    Attributes:
+        timestamp (float):
+            The UNIX timestamp at which the tree was sampled.
+
+        roots (tuple[int, ...]):
+            The PIDs of the root processes.
+
+        num_processes (int):
+            The number of processes that were sampled.
+
+        cpu_percent (float):
+            Combined CPU usage since the previous sample, as a percentage of one CPU.
+
+        rss (int):
+            Combined resident set size, in bytes. Shared pages are counted once per process.
+
+        pss (Optional[int]):
+            Combined proportional set size, in bytes, of the processes that reported one; None if PSS was not
+            requested, or no process reported it (it is Linux-only, and needs permission to read a process's memory
+            map). Unlike RSS, shared pages are split between the processes sharing them.
+
+        num_threads (int):
+            Combined number of threads.
+
+        read_bytes (int):
+            Combined bytes read, over the lifetime of each process currently in the tree.
+
+        write_bytes (int):
+            Combined bytes written, over the lifetime of each process currently in the tree.
+    """
+    timestamp: float
+    roots: tuple[int, ...]
+    num_processes: int
+    cpu_percent: float
+    rss: int
+    pss: Optional[int]
+    num_threads: int
+    read_bytes: int
+    write_bytes: int
+
+
+class ProcessTree:
+    """
+    Follows a process and its descendants and sums their resource usage.
+
+    If the root is given by name, every process with a matching name whose parent is not itself in the tree becomes a
+    root, including ones started later.
+    """
+
+    def __init__(
+            self,
+            root: Union[int, str],
+            table: Optional[ProcessTable] = None,
+            stats_cache: Optional[ProcessStatsCache] = None,
+            strict_case: bool = False,
+            include_pss: bool = False,
+            ):
+        """
+        Initialize the tree.
+
+        Parameters:
+            root (Union[int, str]):
+                The PID of the root process, or a process name (or shell-style pattern) to match roots by.
+
+            table (ProcessTable):
+                The process table to follow. Optional; a new table is created if not provided. Share one table between
+                trees and monitors so processes are only tracked once.
+
+            stats_cache (ProcessStatsCache):
+                The cache holding CPU-time samples between ticks. Optional; a new cache is created if not provided.
+
+            strict_case (bool):
+                If True, a root name is matched case-sensitively. Optional; default is False.
+
+            include_pss (bool):
+                If True, the proportional set size is summed as well. This reads each process's full memory map, so
+                it is considerably more expensive than RSS. Optional; default is False.
+        """
+        self.__root_pid = root if isinstance(root, int) else None
+        self.__root_pattern = None
+        self.__strict_case = strict_case
+
+        if isinstance(root, str):
+            self.__root_pattern = root if strict_case else root.lower()
+
+        self.__include_pss = include_pss
+        self.__members = set()
+        self.__roots = set()
+        self.__table = table if table is not None else ProcessTable()
+        self.__stats_cache = stats_cache if stats_cache is not None else ProcessStatsCache()
+
+        self.__table.subscribe(self._on_table_refresh)
+
+        if self.__table.refreshed:
+            self._on_table_refresh(set(self.__table.entries), set())
+
+    @property
+    def members(self) -> set[int]:
+        """
+        The PIDs of every process currently in the tree, roots included.
+
+        Returns:
+            set[int]
+        """
+        return set(self.__members)
+
+    @property
+    def roots(self) -> set[int]:
+        """
+        The PIDs of the root processes currently in the tree.
+
+        Returns:
+            set[int]
+        """
+        return set(self.__roots)
+
+    @property
+    def table(self) -> ProcessTable:
+        """
+        The process table the tree follows.
+
+        Returns:
+            ProcessTable
+        """
+        return self.__table
+
+    def _is_root(self, pid: int) -> bool:
+        if self.__root_pid is not None:
+            return pid == self.__root_pid
+
+        name = self.__table.get(pid).name
+
+        return fnmatchcase(name if self.__strict_case else name.lower(), self.__root_pattern)
+
+    def _add_subtree(self, pid: int) -> None:
+        self.__members.add(pid)
+        self.__members.update(self.__table.descendants_of(pid))
+
+    def _on_table_refresh(self, started: set[int], exited: set[int]) -> None:
+        """
+        Update the membership of the tree after the process table is refreshed.
+
+        Parameters:
+            started (set[int]):
+                The PIDs that started.
+
+            exited (set[int]):
+                The PIDs that exited.
+
+        Returns:
+            None
+        """
+        self.__members.difference_update(exited)
+        self.__roots.difference_update(exited)
+
+        for pid in exited:
+            self.__stats_cache.forget(pid)
+
+        for pid in started:
+            if pid in self.__members:
+                continue
+
+            if self.__table.get(pid).ppid in self.__members:
+                self._add_subtree(pid)
+            elif self._is_root(pid):
+                self.__roots.add(pid)
+                self._add_subtree(pid)
+
+        # A root matched by name may have turned out to descend from another root.
+        for pid in [pid for pid in self.__roots if self.__table.get(pid).ppid in self.__members]:
+            self.__roots.discard(pid)
+
+    def refresh(self) -> None:
+        """
+        Refresh the process table, bringing the tree's membership up to date.
+
+        Returns:
+            None
+        """
+        self.__table.refresh()
+
+    def sample(self, refresh: bool = True) -> TreeTotals:
+        """
+        Sum the resource usage of every process in the tree.
+
+        Parameters:
+            refresh (bool):
+                If True, the process table is refreshed first. Pass False when something else refreshes a shared
+                table each tick. Optional; default is True.
+
+        Returns:
+            TreeTotals:
+                The combined usage of the tree.
+        """
+        if refresh or not self.__table.refreshed:
+            self.refresh()
+
+        timestamp = time.time()
+        now = time.monotonic()
+
+        count = num_threads = rss = read_bytes = write_bytes = 0
+        include_pss = self.__include_pss
+        pss = None
+        cpu_percent = 0.0
+
+        for pid in list(self.__members):
+            entry = self.__table.get(pid)
+
+            if entry is None:
+                continue
+
+            process = entry.process
+
+            try:
+                with process.oneshot():
+                    cpu_times = process.cpu_times()
+                    threads = process.num_threads()
+                    memory = None
+
+                    if include_pss:
+                        try:
+                            memory = process.memory_full_info()
+                        except psutil.AccessDenied:
+                            # The memory map is often unreadable when the basic counters are not; keep RSS.
+                            pass
+
+                    if memory is None:
+                        memory = process.memory_info()
+
+                    try:
+                        io = process.io_counters()
+                    except (psutil.AccessDenied, AttributeError):
+                        io = None
+            except psutil.NoSuchProcess:
+                self.__members.discard(pid)
+                self.__roots.discard(pid)
+                self.__stats_cache.forget(pid)
+                continue
+            except psutil.AccessDenied:
+                continue
+
+            num_threads += threads
+            rss += memory.rss
+
+            if include_pss and getattr(memory, 'pss', None) is not None:
+                pss = (pss or 0) + memory.pss
+
+            if io is not None:
+                read_bytes += io.read_bytes
+                write_bytes += io.write_bytes
+
+            cpu_percent += self.__stats_cache.cpu_percent(entry.key, cpu_times.user + cpu_times.system, now)
+            count += 1
+
+        return TreeTotals(
+                timestamp=timestamp,
+                roots=tuple(sorted(self.__roots)),
+                num_processes=count,
+                cpu_percent=cpu_percent,
+                rss=rss,
+                pss=pss,
+                num_threads=num_threads,
+                read_bytes=read_bytes,
+                write_bytes=write_bytes,
+                )
@@ -0,0 +1,613 @@
+"""
+Periodic sampling, streamed as NDJSON.
+
+The engine behind ``inspy-hard-stat sample``: every tick, each selected collector is asked for its reading, and the
+readings are written as one JSON object per line. Lines go through a :class:`BufferedLineWriter`, which hands them to
+the output in batches (when enough bytes are waiting, or when the oldest waiting line is old enough), so the tool can
+feed a log shipper at a high rate without a system call per line.
+
+Like :mod:`~inspy_hard_stat.ihs_lib.snapshot`, this module imports only :mod:`psutil` and the standard library; the
+GPU collector loads the Libre Hardware Monitor configuration and :mod:`requests` only when it is selected.
+
+Classes:
+    BufferedLineWriter:
+        Batches lines and writes them out on a size or time threshold.
+
+    CpuCollector:
+        Overall and per-core CPU usage.
+
+    MemoryCollector:
+        Memory usage, from :func:`~inspy_hard_stat.ihs_lib.memory.get_memory_stat_dict`.
+
+    GpuCollector:
+        GPU sensors, read from the Libre Hardware Monitor web server.
+
+    Sampler:
+        Runs the collectors on an interval and writes the records.
+
+Functions:
+    create_collectors(names):
+        Create collectors by name.
+
+    add_sample_arguments(parser):
+        Add the sampling options to an argument parser.
+
+    main(argv=None):
+        Stream samples to standard output.
+
+Since:
+    1.0.0
+"""
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from argparse import ArgumentParser, ArgumentTypeError
+from typing import BinaryIO, Iterable, Optional
+
+import psutil
+
+from inspy_hard_stat.ihs_lib.clock import Tick, TickClock, stamp
+from inspy_hard_stat.ihs_lib.memory import get_memory_stat_dict
+
+
+DEFAULT_INTERVAL = 1.0
+
+DEFAULT_FLUSH_BYTES = 64 * 1024
+"""Write the buffered lines out once this many bytes are waiting."""
+
+DEFAULT_FLUSH_INTERVAL = 1.0
+"""Write the buffered lines out once the oldest has waited this many seconds."""
+
+DEFAULT_METRICS = ('cpu', 'mem')
+
+OUTPUT_FORMATS = ('ndjson',)
+
+
+class BufferedLineWriter:
+    """
+    Batches lines and writes them out on a size or time threshold.
+
+    The time threshold is checked whenever a line is written, and can be checked between writes with
+    :meth:`flush_if_due`; no background thread is used, so a caller that waits between writes should wake by
+    :attr:`flush_deadline`.
+    """
+
+    def __init__(
+            self,
+            stream: BinaryIO,
+            max_bytes: int = DEFAULT_FLUSH_BYTES,
+            max_delay: float = DEFAULT_FLUSH_INTERVAL,
+            ):
+        """
+        Initialize the writer.
+
+        Parameters:
+            stream (BinaryIO):
+                Where the lines go; a binary stream such as ``sys.stdout.buffer``.
+
+            max_bytes (int):
+                Write out once this many bytes are waiting. Optional; default is :data:`DEFAULT_FLUSH_BYTES`.
+
+            max_delay (float):
+                Write out once the oldest waiting line has waited this many seconds; 0 writes every line straight
+                away. Optional; default is :data:`DEFAULT_FLUSH_INTERVAL`.
+        """
+        self.__buffer = []
+        self.__buffered_bytes = 0
+        self.__first_buffered_at = None
+        self.__lines_written = 0
+        self.__max_bytes = max_bytes
+        self.__max_delay = max_delay
+        self.__stream = stream
+        self.__writes = 0
+
+    @property
+    def buffered_bytes(self) -> int:
+        """
+        The number of bytes waiting to be written.
+
+        Returns:
+            int
+        """
+        return self.__buffered_bytes
+
+    @property
+    def flush_deadline(self) -> Optional[float]:
+        """
+        When the oldest waiting line will have waited long enough to be written out, on the :func:`time.monotonic`
+        clock; None if no lines are waiting.
+
+        Returns:
+            Optional[float]
+        """
+        if not self.__buffer:
+            return None
+
+        return self.__first_buffered_at + self.__max_delay
+
+    @property
+    def lines_written(self) -> int:
+        """
+        The number of lines written to the stream so far.
+
+        Returns:
+            int
+        """
+        return self.__lines_written
+
+    @property
+    def writes(self) -> int:
+        """
+        The number of batches written to the stream so far.
+
+        Returns:
+            int
+        """
+        return self.__writes
+
+    def write(self, line: bytes) -> None:
+        """
+        Add a line; it should end with a newline.
+
+        Parameters:
+            line (bytes):
+                The line.
+
+        Returns:
+            None
+        """
+        if not self.__buffer:
+            self.__first_buffered_at = time.monotonic()
+
+        self.__buffer.append(line)
+        self.__buffered_bytes += len(line)
+
+        if self.__buffered_bytes >= self.__max_bytes:
+            self.flush()
+        else:
+            self.flush_if_due()
+
+    def flush_if_due(self) -> bool:
+        """
+        Write out the waiting lines if the oldest has waited long enough.
+
+        Returns:
+            bool:
+                True if anything was written.
+        """
+        if self.__buffer and time.monotonic() - self.__first_buffered_at >= self.__max_delay:
+            self.flush()
+            return True
+
+        return False
+
+    def flush(self) -> None:
+        """
+        Write out every waiting line now.
+
+        Returns:
+            None
+        """
+        if not self.__buffer:
+            return
+
+        lines = self.__buffer
+        self.__buffer = []
+        self.__buffered_bytes = 0
+        self.__first_buffered_at = None
+
+        self.__stream.write(b''.join(lines))
+        self.__stream.flush()
+        self.__lines_written += len(lines)
+        self.__writes += 1
+
+    def close(self) -> None:
+        """
+        Write out every waiting line.
+
+        Returns:
+            None
+        """
+        self.flush()
+
+
+class CpuCollector:
+    """
+    Overall and per-core CPU usage since the previous reading.
+    """
+    name = 'cpu'
+
+    def __init__(self):
+        # The first reading of cpu_percent(interval=None) is meaningless; take it now so the first sample is not.
+        psutil.cpu_percent(interval=None, percpu=True)
+
+    def collect(self) -> dict:
+        per_cpu = psutil.cpu_percent(interval=None, percpu=True)
+
+        return {
+                'percent': round(sum(per_cpu) / len(per_cpu), 1) if per_cpu else None,
+                'per_cpu': per_cpu,
+                }
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryCollector:
+    """
+    Memory usage.
+    """
+    name = 'mem'
+
+    def collect(self) -> dict:
+        return get_memory_stat_dict()
+
+    def close(self) -> None:
+        pass
+
+
+class GpuCollector:
+    """
+    GPU sensors, read from the Libre Hardware Monitor web server.
+
+    One HTTP session is kept open for the life of the collector. A failed request is reported in the reading as
+    ``{'error': ...}`` rather than raised, so one missed tick does not end the stream.
+    """
+    name = 'gpu'
+
+    def __init__(self, timeout: float = 2.0):
+        import requests
+        from requests.auth import HTTPBasicAuth
+
+        from inspy_hard_stat.ihs_lib.libre_hw_monitor.config import CONFIG
+        from inspy_hard_stat.ihs_lib.libre_hw_monitor.utils import find_gpus
+
+        self.__find_gpus = find_gpus
+        self.__request_exception = requests.RequestException
+        self.__session = requests.Session()
+        self.__session.auth = HTTPBasicAuth(CONFIG.user_name, CONFIG.password)
+        self.__timeout = timeout
+        self.__url = f'http://{CONFIG.host}:{CONFIG.port}/data.json'
+
+    def collect(self) -> dict:
+        try:
+            response = self.__session.get(self.__url, timeout=self.__timeout)
+            response.raise_for_status()
+            data = response.json()
+        except (self.__request_exception, ValueError) as e:
+            return {'error': str(e)}
+
+        return {'gpus': self.__find_gpus(data.get('Children', []))}
+
+    def close(self) -> None:
+        self.__session.close()
+
+
+COLLECTORS = {
+        CpuCollector.name:    CpuCollector,
+        MemoryCollector.name: MemoryCollector,
+        GpuCollector.name:    GpuCollector,
+        }
+"""The available collectors, by metric name."""
+
+
+def create_collectors(names: Iterable[str]) -> list:
+    """
+    Create collectors by name.
+
+    Parameters:
+        names (Iterable[str]):
+            Metric names; see :data:`COLLECTORS`.
+
+    Returns:
+        list:
+            The collectors, in the order named.
+
+    Raises:
+        ValueError:
+            Raised when a name is not a known metric.
+    """
+    collectors = []
+
+    for name in names:
+        if name not in COLLECTORS:
+            raise ValueError(f'Unknown metric {name!r}; choose from {", ".join(COLLECTORS)}')
+
+        collectors.append(COLLECTORS[name]())
+
+    return collectors
+
+
+class Sampler:
+    """
+    Runs the collectors on an interval and writes one NDJSON record per tick.
+
+    Ticks come from a :class:`~inspy_hard_stat.ihs_lib.clock.TickClock`, and every record is stamped with it::
+
+        {"ts": <wall time>, "mono": <monotonic time>, "at": <tick boundary>, "late": <seconds>, "seq": 0, ...}
+    """
+
+    def __init__(
+            self,
+            collectors: list,
+            writer: BufferedLineWriter,
+            interval: float = DEFAULT_INTERVAL,
+            align: bool = True,
+            ):
+        """
+        Initialize the sampler.
+
+        Parameters:
+            collectors (list):
+                The collectors; see :func:`create_collectors`.
+
+            writer (BufferedLineWriter):
+                Where the records go.
+
+            interval (float):
+                Seconds between ticks. Optional; default is :data:`DEFAULT_INTERVAL`.
+
+            align (bool):
+                If True, ticks fall on wall-clock multiples of ``interval``, so records from different hosts line up;
+                if False, the first tick is straight away. Optional; default is True.
+        """
+        self.__align = align
+        self.__collectors = collectors
+        self.__interval = interval
+        self.__sequence = 0
+        self.__stop_event = threading.Event()
+        self.__writer = writer
+
+    @property
+    def sequence(self) -> int:
+        """
+        The number of records taken so far.
+
+        Returns:
+            int
+        """
+        return self.__sequence
+
+    def sample(self, tick: Optional[Tick] = None) -> dict:
+        """
+        Take one record from every collector.
+
+        Parameters:
+            tick (Tick):
+                The tick the record is for. Optional; if not given, the record is stamped with the current time only.
+
+        Returns:
+            dict
+        """
+        if tick is None:
+            mono, wall = stamp()
+            record = {'ts': wall, 'mono': mono, 'seq': self.__sequence}
+        else:
+            record = {
+                    'ts':   tick.wall,
+                    'mono': tick.mono,
+                    'at':   tick.scheduled,
+                    'late': round(tick.lateness, 6),
+                    'seq':  self.__sequence,
+                    }
+
+        for collector in self.__collectors:
+            record[collector.name] = collector.collect()
+
+        self.__sequence += 1
+
+        return record
+
+    def stop(self) -> None:
+        """
+        Make :meth:`run` return before its next tick. Safe to call from any thread or a signal handler.
+
+        Returns:
+            None
+        """
+        self.__stop_event.set()
+
+    def _next_tick(self, clock: TickClock) -> Optional[Tick]:
+        writer = self.__writer
+        stop_event = self.__stop_event
+
+        while True:
+            flush_deadline = writer.flush_deadline
+
+            if flush_deadline is None or flush_deadline >= clock.next_deadline:
+                return clock.wait(stop_event)
+
+            # Lines are waiting and due out before the next tick; write them out on time.
+            remaining = flush_deadline - time.monotonic()
+
+            if remaining > 0 and stop_event.wait(remaining):
+                return None
+
+            writer.flush_if_due()
+
+    def run(self, count: Optional[int] = None) -> int:
+        """
+        Sample until ``count`` records have been written, or forever, or until :meth:`stop` is called.
+
+        When a tick runs a whole interval late, the missed ticks are skipped rather than run back to back. Between
+        ticks, buffered records are written out as soon as the writer's time threshold is reached.
+
+        Parameters:
+            count (int):
+                The number of records to write. Optional; default is no limit.
+
+        Returns:
+            int:
+                The number of records written.
+        """
+        written = 0
+        clock = TickClock(self.__interval, align=self.__align)
+
+        while count is None or written < count:
+            tick = self._next_tick(clock)
+
+            if tick is None:
+                break
+
+            line = json.dumps(self.sample(tick), separators=(',', ':')) + '\n'
+            self.__writer.write(line.encode())
+            written += 1
+
+        return written
+
+    def close(self) -> None:
+        """
+        Write out any buffered records and close the collectors.
+
+        Returns:
+            None
+        """
+        try:
+            self.__writer.close()
+        finally:
+            for collector in self.__collectors:
+                collector.close()
+
+
+def _metrics(value: str) -> list[str]:
+    names = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in names if name not in COLLECTORS]
+
+    if unknown or not names:
+        raise ArgumentTypeError(f'choose metrics from {", ".join(COLLECTORS)} (got {value!r})')
+
+    return names
+
+
+def _positive_float(value: str) -> float:
+    number = float(value)
+
+    if number <= 0:
+        raise ArgumentTypeError(f'must be greater than 0 (got {value})')
+
+    return number
+
+
+def add_sample_arguments(parser: ArgumentParser) -> ArgumentParser:
+    """
+    Add the sampling options to an argument parser.
+
+    Parameters:
+        parser (ArgumentParser):
+            The parser.
+
+    Returns:
+        ArgumentParser:
+            The same parser.
+    """
+    parser.add_argument(
+            '--interval',
+            type=_positive_float,
+            default=DEFAULT_INTERVAL,
+            help='Seconds between samples. Default: %(default)s'
+            )
+    parser.add_argument(
+            '--count',
+            type=int,
+            default=None,
+            help='Stop after this many samples. Default: run until interrupted.'
+            )
+    parser.add_argument(
+            '--metrics',
+            type=_metrics,
+            default=list(DEFAULT_METRICS),
+            help=f'Comma-separated metrics to collect, from: {", ".join(COLLECTORS)}. '
+                 f'Default: {",".join(DEFAULT_METRICS)}'
+            )
+    parser.add_argument(
+            '--no-align',
+            dest='align',
+            action='store_false',
+            default=True,
+            help='Sample every interval from start-up, rather than on wall-clock multiples of the interval.'
+            )
+    parser.add_argument(
+            '--format',
+            choices=OUTPUT_FORMATS,
+            default=OUTPUT_FORMATS[0],
+            help='Output format. Default: %(default)s'
+            )
+    parser.add_argument(
+            '--flush-interval',
+            type=float,
+            default=None,
+            help=f'Write buffered output at least this often, in seconds. Default: {DEFAULT_FLUSH_INTERVAL}, or every '
+                 f'line when writing to a terminal.'
+            )
+    parser.add_argument(
+            '--flush-bytes',
+            type=int,
+            default=DEFAULT_FLUSH_BYTES,
+            help='Write buffered output once this many bytes are waiting. Default: %(default)s'
+            )
+
+    return parser
+
+
+def run_sampler(args, stream: Optional[BinaryIO] = None) -> int:
+    """
+    Stream samples as the parsed arguments ask.
+
+    Parameters:
+        args (Namespace):
+            Arguments parsed by a parser set up with :func:`add_sample_arguments`.
+
+        stream (BinaryIO):
+            Where the records go. Optional; default is standard output.
+
+    Returns:
+        int:
+            The exit status.
+    """
+    stream = stream or sys.stdout.buffer
+    flush_interval = args.flush_interval
+
+    if flush_interval is None:
+        flush_interval = 0 if getattr(stream, 'isatty', lambda: False)() else DEFAULT_FLUSH_INTERVAL
+
+    writer = BufferedLineWriter(stream, max_bytes=args.flush_bytes, max_delay=flush_interval)
+    sampler = Sampler(create_collectors(args.metrics), writer, args.interval, align=args.align)
+    previous_handler = None
+
+    if hasattr(signal, 'SIGTERM') and threading.current_thread() is threading.main_thread():
+        # Stop between ticks, so the buffered records are written out below rather than lost.
+        previous_handler = signal.signal(signal.SIGTERM, lambda signum, frame: sampler.stop())
+
+    try:
+        sampler.run(args.count)
+    except KeyboardInterrupt:
+        pass
+    except BrokenPipeError:
+        # The reader went away (e.g. `| head`). Point stdout at devnull so the flush at exit does not fail as well.
+        if stream is sys.stdout.buffer:
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    finally:
+        if previous_handler is not None:
+            signal.signal(signal.SIGTERM, previous_handler)
+
+        try:
+            sampler.close()
+        except BrokenPipeError:
+            pass
+
+    return 0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = add_sample_arguments(
+            ArgumentParser(prog='inspy-hard-stat sample', description='Stream samples to standard output as NDJSON.')
+            )
+
+    return run_sampler(parser.parse_args(argv))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
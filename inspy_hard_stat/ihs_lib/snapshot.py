@@ -0,0 +1,289 @@
+"""
+A one-shot snapshot of the system, for cron jobs and shell prompts.
+
+This module is the fast path behind ``inspy-hard-stat snapshot``: it imports only :mod:`psutil` and the standard
+library, and never loads the configuration system, the logger, :mod:`rich`, :mod:`prompt_toolkit` or :mod:`requests`.
+The optional Libre Hardware Monitor section reads the ``lhm`` configuration from its cached snapshot (see
+:func:`~inspy_hard_stat.config.snapshot.read_snapshot_cache`), and only falls back to loading the configuration when
+the cache is missing or out of date.
+
+CPU usage is not measured by sleeping. By default it is worked out from the change in :func:`psutil.cpu_times` since
+the previous snapshot, which is kept in memory and in a small file in the cache directory, so back-to-back runs (a
+shell prompt, a cron job) each report usage over the time since the last one. The first snapshot after boot reports
+usage since boot. Pass a positive ``cpu_interval`` to measure over a fixed window instead, at the cost of blocking for
+it.
+
+Functions:
+    take_snapshot(cpu_interval=DEFAULT_CPU_INTERVAL, lhm=False):
+        Sample the system once.
+
+    add_snapshot_arguments(parser):
+        Add the snapshot options to an argument parser.
+
+    main(argv=None):
+        Print one snapshot and exit.
+
+Since:
+    1.0.0
+"""
+import json
+import os
+import socket
+import sys
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Optional
+
+import psutil
+
+
+DEFAULT_CPU_INTERVAL = 0.0
+"""Seconds over which CPU usage is measured; 0 measures since the previous snapshot, without blocking."""
+
+CPU_TIMES_CACHE_NAME = 'snapshot_cpu_times.json'
+
+
+# The CPU times recorded by the last snapshot taken in this process: (boot time, CPU times by field).
+_last_cpu_times = None
+
+
+def _cpu_times_cache_path() -> Path:
+    from inspy_hard_stat.config.constants import FILE_SYSTEM_DEFAULTS
+
+    return Path(FILE_SYSTEM_DEFAULTS['dirs']['cache']) / CPU_TIMES_CACHE_NAME
+
+
+def _busy_and_total(cpu_times: dict) -> tuple[float, float]:
+    # Guest time is already counted in user time on Linux, so leave it out of the total (as psutil does).
+    total = sum(value for field, value in cpu_times.items() if field not in ('guest', 'guest_nice'))
+
+    return total - cpu_times.get('idle', 0.0) - cpu_times.get('iowait', 0.0), total
+
+
+def _read_cpu_times_cache() -> Optional[tuple[float, dict]]:
+    try:
+        with open(_cpu_times_cache_path(), 'r', encoding='utf-8') as cache:
+            cached = json.load(cache)
+
+        return float(cached['boot_time']), {field: float(value) for field, value in cached['cpu_times'].items()}
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def _write_cpu_times_cache(boot_time: float, cpu_times: dict) -> None:
+    cache_path = _cpu_times_cache_path()
+    # A lost or torn write only costs the next snapshot its window, so there is no fsync here.
+    temp_path = cache_path.with_name(f'{cache_path.name}.{os.getpid()}.tmp')
+
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path.write_text(json.dumps({'boot_time': boot_time, 'cpu_times': cpu_times}), encoding='utf-8')
+        os.replace(temp_path, cache_path)
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+
+def _cpu_percent_since_last(boot_time: float) -> float:
+    """
+    Get CPU usage since the previous snapshot (in this process, or failing that, any process), without blocking.
+
+    Parameters:
+        boot_time (float):
+            The system boot time; samples from an earlier boot are ignored.
+
+    Returns:
+        float:
+            The percentage of CPU time spent busy, across all CPUs, since the previous snapshot, or since boot if
+            there is no usable previous snapshot.
+    """
+    global _last_cpu_times
+
+    current = psutil.cpu_times()._asdict()
+    previous = _last_cpu_times or _read_cpu_times_cache()
+    _last_cpu_times = (boot_time, current)
+    _write_cpu_times_cache(boot_time, current)
+
+    busy, total = _busy_and_total(current)
+
+    if previous is not None and abs(previous[0] - boot_time) < 1:
+        previous_busy, previous_total = _busy_and_total(previous[1])
+
+        if total > previous_total and busy >= previous_busy:
+            busy, total = busy - previous_busy, total - previous_total
+
+    if total <= 0:
+        return 0.0
+
+    return round(min(max(busy / total * 100, 0.0), 100.0), 1)
+
+
+def _lhm_config() -> dict:
+    from inspy_hard_stat.config.snapshot import read_snapshot_cache
+
+    values = read_snapshot_cache('lhm')
+
+    if values is None:
+        # No current cache; loading the configuration writes one for next time.
+        from inspy_hard_stat.ihs_lib.libre_hw_monitor.config import CONFIG
+
+        values = CONFIG.snapshot.as_dict()
+
+    return values
+
+
+def _lhm_status() -> dict:
+    config = _lhm_config()
+    executable_path = config.get('executable_path')
+    running = False
+
+    if executable_path:
+        executable_name = os.path.basename(executable_path.replace('\\', '/')).lower()
+
+        for proc in psutil.process_iter(['name']):
+            if (proc.info['name'] or '').lower() == executable_name:
+                running = True
+                break
+
+    return {
+            'url':     f'http://{config.get("host")}:{config.get("port")}',
+            'running': running,
+            }
+
+
+def take_snapshot(cpu_interval: float = DEFAULT_CPU_INTERVAL, lhm: bool = False) -> dict:
+    """
+    Sample the system once.
+
+    Parameters:
+        cpu_interval (float):
+            Seconds over which CPU usage is measured, blocking for that long. If 0, usage is measured since the
+            previous snapshot instead, without blocking. Optional; default is :data:`DEFAULT_CPU_INTERVAL`.
+
+        lhm (bool):
+            If True, include the Libre Hardware Monitor address and whether it is running. Optional; default is
+            False.
+
+    Returns:
+        dict:
+            The snapshot; every value is JSON-serializable.
+    """
+    memory = psutil.virtual_memory()
+    swap = psutil.swap_memory()
+    frequency = psutil.cpu_freq()
+    boot_time = psutil.boot_time()
+    now = time.time()
+
+    snapshot = {
+            'timestamp': now,
+            'hostname':  socket.gethostname(),
+            'uptime':    now - boot_time,
+            'cpu':       {
+                    'percent':          (psutil.cpu_percent(interval=cpu_interval) if cpu_interval > 0
+                                         else _cpu_percent_since_last(boot_time)),
+                    'logical_cores':    psutil.cpu_count(),
+                    'frequency_mhz':    frequency.current if frequency else None,
+                    'load_average':     list(os.getloadavg()) if hasattr(os, 'getloadavg') else None,
+                    },
+            'memory':    {
+                    'total':     memory.total,
+                    'available': memory.available,
+                    'used':      memory.used,
+                    'percent':   memory.percent,
+                    },
+            'swap':      {
+                    'total':   swap.total,
+                    'used':    swap.used,
+                    'percent': swap.percent,
+                    },
+            'processes': len(psutil.pids()),
+            }
+
+    if lhm:
+        snapshot['lhm'] = _lhm_status()
+
+    return snapshot
+
+
+def _format_text(snapshot: dict, prefix: str = '') -> str:
+    lines = []
+
+    for key, value in snapshot.items():
+        if isinstance(value, dict):
+            lines.append(_format_text(value, f'{prefix}{key}.'))
+        else:
+            lines.append(f'{prefix}{key}: {value}')
+
+    return '\n'.join(lines)
+
+
+def add_snapshot_arguments(parser: ArgumentParser) -> ArgumentParser:
+    """
+    Add the snapshot options to an argument parser.
+
+    Parameters:
+        parser (ArgumentParser):
+            The parser.
+
+    Returns:
+        ArgumentParser:
+            The same parser.
+    """
+    parser.add_argument(
+            '--json',
+            action='store_true',
+            default=False,
+            help='Print the snapshot as a single line of JSON.'
+            )
+    parser.add_argument(
+            '--cpu-interval',
+            type=float,
+            default=DEFAULT_CPU_INTERVAL,
+            help='Seconds to block for while measuring CPU usage. By default (0), usage is measured since the previous '
+                 'snapshot, without blocking.'
+            )
+    parser.add_argument(
+            '--lhm',
+            action='store_true',
+            default=False,
+            help='Include the Libre Hardware Monitor address and whether it is running.'
+            )
+
+    return parser
+
+
+def print_snapshot(args) -> int:
+    """
+    Take a snapshot and print it, as the parsed arguments ask.
+
+    Parameters:
+        args (Namespace):
+            Arguments parsed by a parser set up with :func:`add_snapshot_arguments`.
+
+    Returns:
+        int:
+            The exit status.
+    """
+    snapshot = take_snapshot(cpu_interval=args.cpu_interval, lhm=args.lhm)
+
+    if args.json:
+        sys.stdout.write(json.dumps(snapshot, separators=(',', ':')) + '\n')
+    else:
+        sys.stdout.write(_format_text(snapshot) + '\n')
+
+    return 0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = add_snapshot_arguments(
+            ArgumentParser(prog='inspy-hard-stat snapshot', description='Print one system snapshot and exit.')
+            )
+
+    return print_snapshot(parser.parse_args(argv))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
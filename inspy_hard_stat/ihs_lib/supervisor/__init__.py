@@ -0,0 +1,11 @@
+from inspy_hard_stat.ihs_lib.supervisor.spec import ChildSpec, ChildState, ChildStatus, RestartPolicy
+from inspy_hard_stat.ihs_lib.supervisor.supervisor import Supervisor
+
+
+__all__ = [
+        'ChildSpec',
+        'ChildState',
+        'ChildStatus',
+        'RestartPolicy',
+        'Supervisor',
+        ]
@@ -0,0 +1,202 @@
+"""
+Specifications and status records for supervised child processes.
+
+Classes:
+    RestartPolicy:
+        When a child process should be restarted after it exits.
+
+    ChildState:
+        The states a supervised child process moves through.
+
+    ChildSpec:
+        Describes how to run and supervise one child process.
+
+    ChildStatus:
+        A point-in-time view of a supervised child process.
+
+Since:
+    1.0.0
+"""
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Callable, NamedTuple, Optional, Sequence
+
+
+class RestartPolicy(str, Enum):
+    """
+    When a child process should be restarted after it exits.
+
+    Members:
+        NEVER:
+            Never restart the child.
+
+        ON_FAILURE:
+            Restart the child only if it exits with a non-zero exit code, or fails its health probe.
+
+        ALWAYS:
+            Restart the child whenever it exits.
+    """
+    NEVER = 'never'
+    ON_FAILURE = 'on-failure'
+    ALWAYS = 'always'
+
+
+class ChildState(str, Enum):
+    """
+    The states a supervised child process moves through.
+
+    Members:
+        STOPPED:
+            Not running, and not due to be started.
+
+        STARTING:
+            Running, but has not yet outlived its start-up grace period.
+
+        RUNNING:
+            Running, and has outlived its start-up grace period.
+
+        BACKOFF:
+            Exited (or failed to start) and waiting to be restarted.
+
+        STOPPING:
+            Asked to exit, and waiting for it to do so.
+
+        EXITED:
+            Exited and will not be restarted under its restart policy.
+
+        FAILED:
+            Exited too many times in a row without outliving its start-up grace period, and has been given up on.
+    """
+    STOPPED = 'stopped'
+    STARTING = 'starting'
+    RUNNING = 'running'
+    BACKOFF = 'backoff'
+    STOPPING = 'stopping'
+    EXITED = 'exited'
+    FAILED = 'failed'
+
+
+@dataclass
+class ChildSpec:
+    """
+    Describes how to run and supervise one child process.
+
+    Attributes:
+        name (str):
+            A unique name for the child.
+
+        args (Sequence[str]):
+            The command line to run, passed to :class:`subprocess.Popen`.
+
+        restart (RestartPolicy):
+            When to restart the child after it exits. Optional; default is :attr:`RestartPolicy.ON_FAILURE`.
+
+        backoff_initial (float):
+            The delay, in seconds, before the first restart. Optional; default is 1.0.
+
+        backoff_factor (float):
+            The factor the delay is multiplied by after each consecutive failed start. Optional; default is 2.0.
+
+        backoff_max (float):
+            The longest delay, in seconds, between restarts. Optional; default is 60.0.
+
+        start_grace (float):
+            How long, in seconds, the child must stay up for its start to count as successful. The restart delay is
+            reset once it has. Optional; default is 5.0.
+
+        max_restarts (Optional[int]):
+            How many consecutive failed starts are tolerated before the child is marked as
+            :attr:`ChildState.FAILED`. Optional; default is None (no limit).
+
+        health_probe (Optional[Callable[[int], bool]]):
+            Called with the child's PID once it is running; should return True if the child is healthy. It runs on
+            the supervisor's thread, so it must be quick. Optional.
+
+        probe_interval (float):
+            Seconds between health probes. Optional; default is 10.0.
+
+        probe_failures (int):
+            Consecutive failed probes after which the child is restarted. Optional; default is 3.
+
+        stop_timeout (float):
+            Seconds to wait after asking the child to terminate before killing it. Optional; default is 5.0.
+
+        cwd (Optional[str]):
+            The working directory for the child. Optional.
+
+        env (Optional[dict]):
+            The environment for the child. Optional; defaults to the supervisor's environment.
+
+        popen_kwargs (dict):
+            Any other keyword arguments for :class:`subprocess.Popen`. Optional.
+    """
+    name: str
+    args: Sequence[str]
+    restart: RestartPolicy = RestartPolicy.ON_FAILURE
+    backoff_initial: float = 1.0
+    backoff_factor: float = 2.0
+    backoff_max: float = 60.0
+    start_grace: float = 5.0
+    max_restarts: Optional[int] = None
+    health_probe: Optional[Callable[[int], bool]] = None
+    probe_interval: float = 10.0
+    probe_failures: int = 3
+    stop_timeout: float = 5.0
+    cwd: Optional[str] = None
+    env: Optional[dict] = None
+    popen_kwargs: dict = field(default_factory=dict)
+
+    def backoff_delay(self, consecutive_failures: int) -> float:
+        """
+        Compute the delay before the next restart.
+
+        Parameters:
+            consecutive_failures (int):
+                The number of consecutive failed starts so far (at least 1).
+
+        Returns:
+            float:
+                The delay, in seconds.
+        """
+        exponent = max(consecutive_failures - 1, 0)
+
+        return min(self.backoff_initial * (self.backoff_factor ** exponent), self.backoff_max)
+
+
+class ChildStatus(NamedTuple):
+    """
+    A point-in-time view of a supervised child process.
+
+    Attributes:
+        name (str):
+            The name of the child.
+
+        state (ChildState):
+            The state of the child.
+
+        pid (Optional[int]):
+            The PID of the child, if it is running.
+
+        restarts (int):
+            How many times the child has been restarted.
+
+        consecutive_failures (int):
+            How many times in a row the child has exited before outliving its start-up grace period.
+
+        last_exit_code (Optional[int]):
+            The exit code from the last time the child exited, if it has.
+
+        started_at (Optional[float]):
+            The UNIX timestamp at which the child was last started, if it has been.
+
+        next_start_in (Optional[float]):
+            Seconds until the child is restarted, if it is in :attr:`ChildState.BACKOFF`.
+    """
+    name: str
+    state: ChildState
+    pid: Optional[int]
+    restarts: int
+    consecutive_failures: int
+    last_exit_code: Optional[int]
+    started_at: Optional[float]
+    next_start_in: Optional[float]
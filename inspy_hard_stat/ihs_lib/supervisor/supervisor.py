@@ -0,0 +1,590 @@
+"""
+A supervisor for several child processes, driven by a single event loop.
+
+The loop sleeps in :meth:`selectors.BaseSelector.select` until something needs doing: a child exits, a timer (restart
+back-off, start-up grace period, health probe, stop timeout) falls due, or another thread sends a command. On Linux,
+child exits are delivered through pidfds (:func:`os.pidfd_open`, Linux 5.3 and later), so a supervisor with nothing due
+uses no CPU at all; elsewhere, children are polled for exit every ``poll_interval`` seconds.
+
+Classes:
+    Supervisor:
+        Starts, watches and restarts child processes.
+
+Since:
+    1.0.0
+"""
+import heapq
+import itertools
+import os
+import selectors
+import socket
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import Iterable, Optional
+
+from inspy_hard_stat.ihs_lib.supervisor.spec import ChildSpec, ChildState, ChildStatus, RestartPolicy
+
+
+HAS_PIDFD = hasattr(os, 'pidfd_open')
+
+DEFAULT_POLL_INTERVAL = 1.0
+
+
+class _Child:
+    """
+    The supervisor's record of one child process.
+    """
+    __slots__ = (
+            'spec', 'state', 'popen', 'pidfd', 'generation', 'restarts', 'failures', 'probe_failures',
+            'last_exit_code', 'started_mono', 'started_at', 'next_start', 'restart_reason', 'remove_on_exit',
+            )
+
+    def __init__(self, spec: ChildSpec):
+        self.spec = spec
+        self.state = ChildState.STOPPED
+        self.popen = None
+        self.pidfd = None
+        self.generation = 0
+        self.restarts = 0
+        self.failures = 0
+        self.probe_failures = 0
+        self.last_exit_code = None
+        self.started_mono = None
+        self.started_at = None
+        self.next_start = None
+        self.restart_reason = None
+        self.remove_on_exit = False
+
+    @property
+    def alive(self) -> bool:
+        return self.popen is not None
+
+
+class Supervisor:
+    """
+    Starts, watches and restarts child processes.
+
+    All bookkeeping happens on the thread running :meth:`run` (see :meth:`start` to run it in the background). The
+    public methods may be called from any thread; they queue a command and wake the loop.
+
+    Example:
+        >>> supervisor = Supervisor([ChildSpec('lhm', [CONFIG.executable_path], restart=RestartPolicy.ALWAYS)])
+        >>> supervisor.start()
+        >>> supervisor.status('lhm').state
+        <ChildState.STARTING: 'starting'>
+        >>> supervisor.stop()
+    """
+
+    def __init__(self, specs: Optional[Iterable[ChildSpec]] = None, poll_interval: float = DEFAULT_POLL_INTERVAL):
+        """
+        Initialize the supervisor.
+
+        Parameters:
+            specs (Iterable[ChildSpec]):
+                Children to supervise. They are started when the loop starts. Optional.
+
+            poll_interval (float):
+                Seconds between exit checks on platforms without pidfds. Optional; default is 1.0.
+        """
+        self.__children = {}
+        self.__commands = deque()
+        self.__counter = itertools.count()
+        self.__lock = threading.RLock()
+        self.__poll_interval = poll_interval
+        self.__ready = threading.Event()
+        self.__resume = set()
+        self.__selector = None
+        self.__shutting_down = False
+        self.__use_pidfd = HAS_PIDFD
+        self.__thread = None
+        self.__timers = []
+        self.__wake_reader = None
+        self.__wake_writer = None
+
+        for spec in specs or ():
+            self.add(spec)
+
+    @property
+    def is_running(self) -> bool:
+        """
+        Whether the event loop is running.
+
+        Returns:
+            bool
+        """
+        return self.__ready.is_set()
+
+    @property
+    def names(self) -> list[str]:
+        """
+        The names of the supervised children.
+
+        Returns:
+            list[str]
+        """
+        with self.__lock:
+            return list(self.__children)
+
+    # -- Public API; safe to call from any thread.
+
+    def add(self, spec: ChildSpec, start: bool = True) -> None:
+        """
+        Add a child to the supervisor.
+
+        Parameters:
+            spec (ChildSpec):
+                The specification of the child.
+
+            start (bool):
+                If True, the child is started as soon as the loop is running. Optional; default is True.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError:
+                Raised when a child with the same name is already supervised.
+        """
+        with self.__lock:
+            if spec.name in self.__children:
+                raise ValueError(f"A child named '{spec.name}' is already supervised.")
+
+            self.__children[spec.name] = _Child(spec)
+
+        if start:
+            self._post('start', spec.name)
+
+    def remove(self, name: str) -> None:
+        """
+        Stop a child and stop supervising it.
+
+        Parameters:
+            name (str):
+                The name of the child.
+
+        Returns:
+            None
+        """
+        self._post('remove', name)
+
+    def restart_child(self, name: str) -> None:
+        """
+        Restart a child immediately, without counting it as a failure.
+
+        Parameters:
+            name (str):
+                The name of the child.
+
+        Returns:
+            None
+        """
+        self._post('restart', name)
+
+    def start_child(self, name: str) -> None:
+        """
+        Start a child that is stopped, exited or failed, or cut short its restart back-off.
+
+        Parameters:
+            name (str):
+                The name of the child.
+
+        Returns:
+            None
+        """
+        self._post('start', name)
+
+    def stop_child(self, name: str) -> None:
+        """
+        Stop a child. It will not be restarted until :meth:`start_child` is called.
+
+        Parameters:
+            name (str):
+                The name of the child.
+
+        Returns:
+            None
+        """
+        self._post('stop', name)
+
+    def status(self, name: Optional[str] = None):
+        """
+        Get the status of one child, or of every child.
+
+        Parameters:
+            name (str):
+                The name of the child. Optional; if not provided, the status of every child is returned.
+
+        Returns:
+            Union[ChildStatus, dict[str, ChildStatus]]:
+                The status of the named child, or a dictionary of statuses keyed by name.
+
+        Raises:
+            KeyError:
+                Raised when no child with the given name is supervised.
+        """
+        now = time.monotonic()
+
+        with self.__lock:
+            if name is not None:
+                return self._status_of(self.__children[name], now)
+
+            return {child_name: self._status_of(child, now) for child_name, child in self.__children.items()}
+
+    def start(self) -> threading.Thread:
+        """
+        Run the event loop on a background (daemon) thread.
+
+        After :meth:`stop`, this starts the children again that were running (or due to restart) when it was called.
+
+        Returns:
+            threading.Thread:
+                The thread running the loop.
+        """
+        if self.__thread is None or not self.__thread.is_alive():
+            self.__thread = threading.Thread(target=self.run, name='ihs-supervisor', daemon=True)
+            self.__thread.start()
+            self.__ready.wait()
+
+        return self.__thread
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop every child and end the event loop.
+
+        If the loop is running on a thread started by :meth:`start`, this waits for it to finish. Does nothing if the
+        loop is not running.
+
+        Parameters:
+            timeout (float):
+                The longest time to wait for the loop to finish, in seconds. Optional; default is to wait until it
+                does.
+
+        Returns:
+            None
+        """
+        if not self.is_running:
+            return
+
+        self._post('shutdown', None)
+
+        if self.__thread is not None and self.__thread is not threading.current_thread():
+            self.__thread.join(timeout)
+
+    def run(self) -> None:
+        """
+        Run the event loop on the current thread until :meth:`stop` is called and every child has exited.
+
+        Returns:
+            None
+        """
+        with self.__lock:
+            # Bring back the children a previous stop() shut down.
+            for name in self.__resume:
+                self.__commands.append(('start', name))
+
+            self.__resume.clear()
+
+        self.__selector = selectors.DefaultSelector()
+        self.__wake_reader, self.__wake_writer = socket.socketpair()
+        self.__wake_reader.setblocking(False)
+        self.__wake_writer.setblocking(False)
+        self.__selector.register(self.__wake_reader, selectors.EVENT_READ)
+        self.__shutting_down = False
+        self.__ready.set()
+
+        try:
+            while True:
+                with self.__lock:
+                    self._process_commands()
+                    self._run_due_timers()
+
+                    if self.__shutting_down and not any(child.alive for child in self.__children.values()):
+                        break
+
+                    timeout = self._next_timeout()
+
+                events = self.__selector.select(timeout)
+
+                with self.__lock:
+                    for key, _ in events:
+                        if key.data is None:
+                            self._drain_wakeups()
+                        else:
+                            self._check_exit(key.data)
+        finally:
+            self.__ready.clear()
+
+            with self.__lock:
+                for child in self.__children.values():
+                    self._close_pidfd(child)
+
+            self.__selector.close()
+            self.__wake_reader.close()
+            self.__wake_writer.close()
+            self.__selector = self.__wake_reader = self.__wake_writer = None
+            self.__timers.clear()
+
+    # -- Loop internals; only called on the loop's thread, with the lock held.
+
+    def _post(self, command: str, name: Optional[str]) -> None:
+        self.__commands.append((command, name))
+
+        writer = self.__wake_writer
+
+        if writer is not None:
+            try:
+                writer.send(b'\0')
+            except (BlockingIOError, OSError):
+                # The buffer is full (so the loop is already due to wake), or the loop has just closed it.
+                pass
+
+    def _drain_wakeups(self) -> None:
+        try:
+            while self.__wake_reader.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _process_commands(self) -> None:
+        while self.__commands:
+            command, name = self.__commands.popleft()
+
+            if command == 'shutdown':
+                self._shutdown()
+                continue
+
+            child = self.__children.get(name)
+
+            if child is None or (self.__shutting_down and command in ('start', 'restart')):
+                continue
+
+            if command == 'start':
+                if child.state == ChildState.BACKOFF:
+                    child.generation += 1
+                elif child.alive:
+                    continue
+                else:
+                    child.failures = 0
+
+                self._spawn(child)
+            elif command == 'stop':
+                self._stop(child)
+            elif command == 'restart':
+                if child.alive:
+                    child.restart_reason = 'manual'
+                    self._terminate(child)
+                else:
+                    child.generation += 1
+                    self._spawn(child)
+            elif command == 'remove':
+                if child.alive:
+                    child.remove_on_exit = True
+                    self._stop(child)
+                else:
+                    del self.__children[name]
+
+    def _schedule(self, delay: float, kind: str, child: _Child) -> None:
+        deadline = time.monotonic() + delay
+        heapq.heappush(self.__timers, (deadline, next(self.__counter), kind, child, child.generation))
+
+    def _next_timeout(self) -> Optional[float]:
+        if not self.__timers:
+            return None
+
+        return max(self.__timers[0][0] - time.monotonic(), 0.0)
+
+    def _run_due_timers(self) -> None:
+        now = time.monotonic()
+
+        while self.__timers and self.__timers[0][0] <= now:
+            _, _, kind, child, generation = heapq.heappop(self.__timers)
+
+            # Timers are invalidated by bumping the child's generation rather than being removed from the heap.
+            if generation != child.generation or child.spec.name not in self.__children:
+                continue
+
+            if kind == 'start' and child.state == ChildState.BACKOFF:
+                child.restarts += 1
+                self._spawn(child)
+            elif kind == 'grace' and child.state == ChildState.STARTING:
+                child.state = ChildState.RUNNING
+
+                # A child with a health probe has only started successfully once it passes its first probe.
+                if child.spec.health_probe is None:
+                    child.failures = 0
+                else:
+                    self._schedule(child.spec.probe_interval, 'probe', child)
+            elif kind == 'probe' and child.state == ChildState.RUNNING:
+                self._probe(child)
+            elif kind == 'poll' and child.alive:
+                if not self._check_exit(child):
+                    self._schedule(self.__poll_interval, 'poll', child)
+            elif kind == 'kill' and child.state == ChildState.STOPPING and child.alive:
+                try:
+                    child.popen.kill()
+                except ProcessLookupError:
+                    pass
+
+    def _spawn(self, child: _Child) -> None:
+        spec = child.spec
+        child.generation += 1
+        child.probe_failures = 0
+        child.restart_reason = None
+        child.started_mono = time.monotonic()
+        child.started_at = time.time()
+
+        try:
+            child.popen = subprocess.Popen(spec.args, cwd=spec.cwd, env=spec.env, **spec.popen_kwargs)
+        except OSError:
+            child.popen = None
+            child.last_exit_code = None
+            self._handle_failure(child)
+            return
+
+        child.state = ChildState.STARTING
+
+        if self.__use_pidfd:
+            try:
+                child.pidfd = os.pidfd_open(child.popen.pid)
+            except OSError:
+                # The kernel is older than 5.3 (or pidfds are blocked); poll from now on instead.
+                self.__use_pidfd = False
+            else:
+                self.__selector.register(child.pidfd, selectors.EVENT_READ, child)
+
+        if child.pidfd is None:
+            self._schedule(self.__poll_interval, 'poll', child)
+
+        self._schedule(spec.start_grace, 'grace', child)
+
+    def _probe(self, child: _Child) -> None:
+        try:
+            healthy = bool(child.spec.health_probe(child.popen.pid))
+        except Exception:
+            healthy = False
+
+        if healthy:
+            child.failures = 0
+            child.probe_failures = 0
+        else:
+            child.probe_failures += 1
+
+        if child.probe_failures >= child.spec.probe_failures:
+            child.restart_reason = 'probe'
+            self._terminate(child)
+        else:
+            self._schedule(child.spec.probe_interval, 'probe', child)
+
+    def _terminate(self, child: _Child) -> None:
+        child.state = ChildState.STOPPING
+
+        try:
+            child.popen.terminate()
+        except ProcessLookupError:
+            pass
+
+        self._schedule(child.spec.stop_timeout, 'kill', child)
+
+    def _stop(self, child: _Child) -> None:
+        child.restart_reason = None
+
+        if child.alive:
+            if child.state != ChildState.STOPPING:
+                self._terminate(child)
+        else:
+            child.generation += 1
+
+            if child.state == ChildState.BACKOFF:
+                child.state = ChildState.STOPPED
+
+    def _shutdown(self) -> None:
+        self.__shutting_down = True
+        self.__resume = {
+                name for name, child in self.__children.items()
+                if child.alive and (child.state != ChildState.STOPPING or child.restart_reason is not None)
+                or child.state == ChildState.BACKOFF
+                }
+
+        for child in self.__children.values():
+            self._stop(child)
+
+    def _close_pidfd(self, child: _Child) -> None:
+        if child.pidfd is not None:
+            self.__selector.unregister(child.pidfd)
+            os.close(child.pidfd)
+            child.pidfd = None
+
+    def _check_exit(self, child: _Child) -> bool:
+        """
+        Handle a child's exit, if it has exited.
+
+        Returns:
+            bool:
+                True if the child had exited, False otherwise.
+        """
+        if not child.alive or child.popen.poll() is None:
+            return False
+
+        self._close_pidfd(child)
+        child.last_exit_code = child.popen.returncode
+        child.popen = None
+        child.generation += 1
+
+        reason = child.restart_reason
+        child.restart_reason = None
+
+        if child.remove_on_exit:
+            del self.__children[child.spec.name]
+            return True
+
+        if self.__shutting_down or (child.state == ChildState.STOPPING and reason is None):
+            child.state = ChildState.STOPPED
+        elif reason == 'manual':
+            child.restarts += 1
+            self._spawn(child)
+        elif reason == 'probe':
+            self._handle_failure(child)
+        elif child.spec.restart == RestartPolicy.ALWAYS or (
+                child.spec.restart == RestartPolicy.ON_FAILURE and child.last_exit_code != 0
+                ):
+            self._handle_failure(child)
+        else:
+            child.state = ChildState.EXITED
+
+        return True
+
+    def _handle_failure(self, child: _Child) -> None:
+        """
+        Schedule a restart with back-off, or give up on the child.
+        """
+        spec = child.spec
+
+        if spec.restart == RestartPolicy.NEVER:
+            child.state = ChildState.EXITED
+            return
+
+        child.failures += 1
+
+        if spec.max_restarts is not None and child.failures > spec.max_restarts:
+            child.state = ChildState.FAILED
+            return
+
+        delay = spec.backoff_delay(child.failures)
+        child.state = ChildState.BACKOFF
+        child.next_start = time.monotonic() + delay
+        self._schedule(delay, 'start', child)
+
+    @staticmethod
+    def _status_of(child: _Child, now: float) -> ChildStatus:
+        return ChildStatus(
+                name=child.spec.name,
+                state=child.state,
+                pid=child.popen.pid if child.alive else None,
+                restarts=child.restarts,
+                consecutive_failures=child.failures,
+                last_exit_code=child.last_exit_code,
+                started_at=child.started_at,
+                next_start_in=max(child.next_start - now, 0.0) if child.state == ChildState.BACKOFF else None,
+                )
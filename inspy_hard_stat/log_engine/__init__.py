@@ -10,7 +10,28 @@ else:
     ROOT_LOGGER = InspyLogger('inspy-hard-stat', console_level='info')
 
 
+def apply_logger_config():
+    """
+    Load the logger configuration, which applies its log level to :data:`ROOT_LOGGER` and re-applies it whenever it
+    changes (see :data:`inspy_hard_stat.config.LOGGER_CONFIG`).
+
+    Called when this module is imported, so every program that logs honours ``logger.ini``; programs that never log
+    never load it.
+
+    Returns:
+        ConfigFactory:
+            The logger configuration.
+    """
+    from inspy_hard_stat import config
+
+    return config.LOGGER_CONFIG
+
+
+apply_logger_config()
+
+
 __all__ = [
         'Loggable',
-        'ROOT_LOGGER'
+        'ROOT_LOGGER',
+        'apply_logger_config',
         ]
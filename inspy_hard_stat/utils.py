@@ -1,9 +1,12 @@
 import os
+import selectors
+import socket
+import subprocess
+import sys
 import threading
 import time
 from pathlib import Path
 from typing import Union
-import keyboard
 from inspyre_toolbox.path_man import provision_path
 
 
@@ -35,82 +38,160 @@ def has_changed(file_path, last_modified_time):
         return False
 
 
-def wait_for_changes(config_factory, interval=1):
+def open_in_default_app(file_path: Union[str, Path]) -> bool:
     """
-    Waits for changes to the file at the given path or until the user presses Enter.
+    Open a file or directory with the application the desktop associates with it.
+
+    Args:
+        file_path (Union[str, Path]):
+            The file or directory to open.
+
+    Returns:
+        bool: True if an application was launched, False if no opener is available on this system.
+    """
+    file_path = str(file_path)
+
+    try:
+        if hasattr(os, 'startfile'):
+            os.startfile(file_path)
+        elif sys.platform == 'darwin':
+            subprocess.Popen(['open', file_path])
+        else:
+            subprocess.Popen(['xdg-open', file_path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except FileNotFoundError:
+        print(f"No application available to open '{file_path}'; please open it yourself.")
+        return False
+
+    return True
+
+
+def _wait_for_enter(event: threading.Event, wake: socket.socket, timeout=None) -> bool:
+    """
+    Wait until the user presses Enter, ``event`` is set, or the timeout passes.
+
+    Standard input is only read while waiting, and nothing is left reading it afterward, so a later prompt gets every
+    line typed at it.
+
+    Args:
+        event (threading.Event):
+            Ends the wait when set. Whoever sets it must also write a byte to the other end of ``wake``.
+
+        wake (socket.socket):
+            Becomes readable when ``event`` is set.
+
+        timeout (Optional[Union[int, float]]):
+            The longest time to wait, in seconds. Default is to wait indefinitely.
+
+    Returns:
+        bool: True if Enter was pressed, False otherwise.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+
+    def remaining():
+        return None if deadline is None else max(deadline - time.monotonic(), 0.0)
+
+    if os.name == 'nt':
+        import msvcrt
+
+        # Console input cannot be waited on with select() on Windows; check for a key press a few times a second.
+        while not event.is_set() and remaining() != 0:
+            while msvcrt.kbhit():
+                if msvcrt.getwch() in '\r\n':
+                    return True
+
+            event.wait(0.1 if deadline is None else min(0.1, remaining()))
+
+        return False
+
+    with selectors.DefaultSelector() as selector:
+        selector.register(wake, selectors.EVENT_READ)
+
+        try:
+            selector.register(sys.stdin, selectors.EVENT_READ, 'stdin')
+        except (AttributeError, ValueError, OSError):
+            # No standard input that can be waited on; only the event (or the timeout) ends the wait.
+            pass
+
+        while not event.is_set():
+            wait = remaining()
+
+            if wait == 0:
+                return False
+
+            for key, _ in selector.select(wait):
+                if key.data != 'stdin':
+                    return False
+
+                if sys.stdin.readline():
+                    return True
+
+                # End of input; keep waiting for the event.
+                selector.unregister(sys.stdin)
+
+    return False
+
+
+def wait_for_changes(config_factory, timeout=None):
+    """
+    Opens the configuration file in the default editor and waits until its contents change, or the user presses Enter.
+
+    The file is watched through the shared :data:`~inspy_hard_stat.config.watcher.CONFIG_WATCHER`, so nothing polls
+    it; saving the file without changing its contents does not count as a change. Standard input is only read while
+    waiting; once a change or the timeout ends the wait, nothing is left reading it.
 
     Args:
         config_factory (ConfigFactory):
             The ConfigFactory object that contains the file path to monitor.
 
-        interval (Union[int, float]):
-            The interval in seconds to check for changes.
+        timeout (Optional[Union[int, float]]):
+            The longest time to wait, in seconds. Default is to wait indefinitely.
 
     Returns:
-        bool: True if the file was modified, False if the user pressed Enter without modification.
+        bool: True if the file was modified, False if the user pressed Enter (or the wait timed out) without modification.
     """
-    cf = config_factory
-    file_path = cf.config_file_path
-    if isinstance(file_path, str):
-        file_path = Path(file_path).expanduser().resolve().absolute()
+    from inspy_hard_stat.config.watcher import CONFIG_WATCHER
 
-    interval = float(interval)
+    cf = config_factory
+    file_path = Path(cf.config_file_path).expanduser().resolve().absolute()
 
-    try:
-        last_modified_time = os.path.getmtime(file_path)
-    except FileNotFoundError:
+    if not file_path.exists():
         print(f"File not found: {file_path}")
         return False
 
-    fp_str = str(file_path)
+    modification_detected = threading.Event()
+    wake_reader, wake_writer = socket.socketpair()
 
-    # Open the file in the default editor
-    os.startfile(fp_str)
+    def on_change(path):
+        print(f"File has been modified at: {time.ctime()}")
+        modification_detected.set()
 
-    modification_detected = threading.Event()
-    enter_pressed = threading.Event()
-
-    def check_modifications():
-        nonlocal last_modified_time
-        while not modification_detected.is_set() and not enter_pressed.is_set():
-            if enter_pressed.is_set():
-                break
-            try:
-                current_modified_time = os.path.getmtime(file_path)
-            except FileNotFoundError:
-                print(f"File not found: {file_path}")
-                return
-            if current_modified_time != last_modified_time:
-                print(f"File has been modified at: {time.ctime(current_modified_time)}")
-                config_factory._ConfigFactory__file_modified = True
-                modification_detected.set()
-            else:
-                time.sleep(interval)
-                print("No changes detected, continuing to monitor...")
-
-    def on_press(event):
-        if keyboard.is_pressed('enter') and keyboard.is_pressed('esc'):
-            print("Enter and ESC keys pressed.")
-            enter_pressed.set()
-            keyboard.unhook_all()  # Unhook all the keyboard hooks
-            return False  # Stop the listener
-
-    checker_thread = threading.Thread(target=check_modifications)
-    checker_thread.start()
-
-    keyboard.on_press(on_press)
-
-    # Join the threads but only if neither event is set yet
-    while not modification_detected.is_set() and not enter_pressed.is_set():
-        time.sleep(0.1)
-
-    # Ensure the checker thread is joined before exiting
-    checker_thread.join()
+        try:
+            wake_writer.send(b'\0')
+        except OSError:
+            pass
+
+    CONFIG_WATCHER.watch(file_path, on_change)
+
+    try:
+        # Open the file in the default editor
+        open_in_default_app(file_path)
+
+        print("Waiting for changes to be saved; press Enter to stop waiting...")
+
+        if _wait_for_enter(modification_detected, wake_reader, timeout):
+            print("Enter pressed.")
+    finally:
+        CONFIG_WATCHER.unwatch(file_path, on_change)
+        wake_reader.close()
+        wake_writer.close()
 
     print("Exiting wait_for_changes...")
 
+    if modification_detected.is_set():
+        config_factory._ConfigFactory__file_modified = True
+
+    return modification_detected.is_set()
 
-    return config_factory._ConfigFactory__file_modified
 
 def conjugate(lst, conjunction='and'):
     if conjunction not in ['and', 'or']:
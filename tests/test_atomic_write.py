@@ -0,0 +1,52 @@
+"""
+Replacing files with :func:`atomic_write_bytes`.
+"""
+import os
+import stat
+
+import pytest
+
+from inspy_hard_stat.config import utils
+from inspy_hard_stat.config.utils import atomic_write_bytes
+
+
+pytestmark = pytest.mark.skipif(os.name == 'nt', reason='Checks POSIX permissions.')
+
+
+def mode_of(path):
+    return stat.S_IMODE(path.stat().st_mode)
+
+
+def test_new_file_gets_the_umask_default(tmp_path):
+    path = tmp_path / 'new.ini'
+    atomic_write_bytes(path, b'new')
+
+    assert path.read_bytes() == b'new'
+    assert mode_of(path) == 0o666 & ~utils._UMASK
+
+
+def test_existing_file_keeps_its_mode(tmp_path):
+    path = tmp_path / 'config.ini'
+    path.write_bytes(b'old')
+    path.chmod(0o640)
+
+    atomic_write_bytes(path, b'new')
+
+    assert path.read_bytes() == b'new'
+    assert mode_of(path) == 0o640
+
+
+def test_failed_replace_leaves_the_old_file(tmp_path, monkeypatch):
+    path = tmp_path / 'config.ini'
+    path.write_bytes(b'old')
+
+    def fail(source, destination):
+        raise OSError('disk full')
+
+    monkeypatch.setattr(os, 'replace', fail)
+
+    with pytest.raises(OSError, match='disk full'):
+        atomic_write_bytes(path, b'new')
+
+    assert path.read_bytes() == b'old'
+    assert [entry.name for entry in tmp_path.iterdir()] == ['config.ini']
@@ -0,0 +1,76 @@
+"""
+Debounced saving with :class:`DebouncedSaver`.
+"""
+import gc
+import threading
+import time
+
+from inspy_hard_stat.config import autosave
+from inspy_hard_stat.config.autosave import DebouncedSaver
+
+
+class Recorder:
+    def __init__(self):
+        self.saves = []
+        self.saved = threading.Event()
+
+    def __call__(self):
+        self.saves.append(time.monotonic())
+        self.saved.set()
+
+
+def test_a_burst_of_changes_is_saved_once():
+    save = Recorder()
+    saver = DebouncedSaver(save, delay=0.1)
+    started = time.monotonic()
+
+    for _ in range(5):
+        saver.schedule()
+        time.sleep(0.02)
+
+    assert save.saved.wait(2)
+    time.sleep(0.2)
+
+    assert len(save.saves) == 1
+    assert save.saves[0] - started >= 0.18
+    assert not saver.pending
+
+
+def test_flush_saves_pending_changes_now():
+    save = Recorder()
+    saver = DebouncedSaver(save, delay=60)
+    saver.schedule()
+
+    assert saver.pending
+
+    saver.flush()
+
+    assert len(save.saves) == 1
+    assert not saver.pending
+
+
+def test_flush_without_changes_does_nothing():
+    save = Recorder()
+    DebouncedSaver(save, delay=60).flush()
+
+    assert save.saves == []
+
+
+def test_exit_flushes_every_live_saver():
+    save = Recorder()
+    saver = DebouncedSaver(save, delay=60)
+    saver.schedule()
+
+    autosave._flush_all()
+
+    assert len(save.saves) == 1
+
+
+def test_dropped_savers_are_released():
+    saver = DebouncedSaver(Recorder(), delay=60)
+    count = len(autosave._SAVERS)
+
+    del saver
+    gc.collect()
+
+    assert len(autosave._SAVERS) == count - 1
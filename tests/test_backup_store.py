@@ -0,0 +1,122 @@
+"""
+The :class:`BackupStore` summary, legacy imports, and several processes sharing one store.
+"""
+import multiprocessing
+
+import pytest
+
+from inspy_hard_stat.config.backups import LEGACY_MARKER_NAME, BackupRecord, BackupStore, fcntl
+
+
+needs_fcntl = pytest.mark.skipif(fcntl is None, reason='The store is only locked across processes with fcntl.')
+
+WORKERS = 4
+ROUNDS = 25
+
+
+def add_unchanged(root, barrier):
+    store = BackupStore(root)
+    barrier.wait()
+
+    for _ in range(ROUNDS):
+        store.add('lhm', data=b'[DEFAULT]\nport = 8085\n')
+
+
+def add_distinct(root, worker, barrier):
+    store = BackupStore(root, keep_last=3, keep_daily_days=0)
+    barrier.wait()
+
+    for round_ in range(ROUNDS):
+        store.add('lhm', data=f'[DEFAULT]\nport = {worker * 1000 + round_}\n'.encode())
+
+        if round_ % 5 == 0:
+            store.apply_retention()
+
+    store.flush()
+
+
+def run_workers(target, args_for):
+    context = multiprocessing.get_context('fork')
+    barrier = context.Barrier(WORKERS)
+    workers = [context.Process(target=target, args=(*args_for(worker), barrier)) for worker in range(WORKERS)]
+
+    for worker in workers:
+        worker.start()
+
+    for worker in workers:
+        worker.join(30)
+        assert worker.exitcode == 0
+
+
+@needs_fcntl
+def test_unchanged_file_is_recorded_once(tmp_path):
+    run_workers(add_unchanged, lambda worker: (tmp_path,))
+
+    assert len(BackupStore(tmp_path).records()) == 1
+
+
+@needs_fcntl
+def test_retention_keeps_every_indexed_object(tmp_path):
+    run_workers(add_distinct, lambda worker: (tmp_path, worker))
+    store = BackupStore(tmp_path, keep_last=3, keep_daily_days=0)
+    records = store.records()
+
+    assert len(records) >= 3
+
+    for record in records:
+        assert store.read(record)
+
+    store.apply_retention()
+
+    assert len(store.records()) == 3
+
+
+def test_systems_and_latest_come_from_the_summary(tmp_path):
+    store = BackupStore(tmp_path)
+    store.add('lhm', data=b'a', timestamp=1.0)
+    store.add('app', data=b'b', timestamp=2.0)
+    latest_lhm = store.add('lhm', data=b'c', timestamp=3.0)
+
+    assert store.summary_path.exists()
+    assert store.systems() == ['lhm', 'app']
+    assert store.latest('LHM') == latest_lhm
+    assert store.latest('missing') is None
+
+
+def test_out_of_date_summary_is_rebuilt(tmp_path):
+    store = BackupStore(tmp_path)
+    store.add('lhm', data=b'a', timestamp=1.0)
+
+    # Written behind the store's back, as an older version would.
+    with open(store.index_path, 'a', encoding='utf-8') as index:
+        index.write(BackupRecord('app', 2.0, 'f' * 64, 1, '').to_json() + '\n')
+
+    assert store.systems() == ['app', 'lhm']
+    assert store.latest('app').timestamp == 2.0
+
+
+def test_retention_keeps_the_summary_current(tmp_path):
+    store = BackupStore(tmp_path, keep_last=1, keep_daily_days=0)
+
+    for number in range(3):
+        store.add('lhm', data=str(number).encode(), timestamp=float(number))
+
+    store.add('app', data=b'app', timestamp=5.0)
+    store.apply_retention(now=10.0)
+
+    assert store.systems() == ['app', 'lhm']
+    assert store.read(store.latest('lhm')) == b'2'
+
+
+def test_legacy_backups_are_imported_once(tmp_path):
+    store = BackupStore(tmp_path)
+    (tmp_path / 'lhm_20240102_030405.bak').write_bytes(b'old')
+
+    assert store.import_legacy(once=True) == 1
+    assert (tmp_path / LEGACY_MARKER_NAME).exists()
+
+    (tmp_path / 'lhm_20240103_030405.bak').write_bytes(b'older')
+
+    assert store.import_legacy(once=True) == 0
+    assert store.import_legacy() == 1
+    assert len(store.records()) == 2
@@ -0,0 +1,91 @@
+"""
+The typed-value cache behind :class:`ConfigFactory` attribute reads.
+"""
+import configparser
+
+import pytest
+
+from inspy_hard_stat.config.factory import ConfigFactory
+
+
+@pytest.fixture
+def config(tmp_path):
+    return ConfigFactory('lhm', auto_load=True, config_dir_path=tmp_path, skip_auto_saving=True)
+
+
+def write_port(config, port):
+    parser = configparser.ConfigParser()
+    parser.read(config.config_file_path)
+    parser.set('USER' if parser.has_section('USER') else 'DEFAULT', 'port', str(port))
+
+    with open(config.config_file_path, 'w') as config_file:
+        parser.write(config_file)
+
+
+def test_set_invalidates(config):
+    original = config.port
+    config.port = original + 1
+
+    assert config.port == original + 1
+
+
+@pytest.mark.parametrize('method', ['load_config', 'reload_config'])
+def test_load_and_reload_invalidate(config, method):
+    original = config.port
+    write_port(config, original + 2)
+    getattr(config, method)()
+
+    assert config.port == original + 2
+
+
+def test_reset_invalidates(config):
+    default = config.port
+    config.port = default + 3
+
+    assert config.port == default + 3
+
+    config.reset_to_defaults(skip_save=True)
+
+    assert config.port == default
+
+
+def test_value_read_during_a_set_is_not_cached(config, monkeypatch):
+    original = config.port
+    read = ConfigFactory._return_from_config
+    calls = []
+
+    def read_then_set(self, item, section_name, strict_case=False):
+        value = read(self, item, section_name, strict_case)
+
+        if item == 'port' and not calls:
+            calls.append(value)
+            # Another writer gets in between the read and the cache fill.
+            self.port = original + 4
+
+        return value
+
+    config.clear_value_cache()
+    monkeypatch.setattr(ConfigFactory, '_return_from_config', read_then_set)
+
+    assert config.port == original
+    assert config.port == original + 4
+
+
+def test_a_miss_converts_once(config, monkeypatch):
+    converters = config.config_spec.converters
+    convert = converters['port']
+    calls = []
+
+    def counting(value):
+        calls.append(value)
+        return convert(value)
+
+    monkeypatch.setitem(converters, 'port', counting)
+    config.clear_value_cache()
+    config.port
+
+    assert len(calls) == 1
+
+    config.port
+
+    assert len(calls) == 1
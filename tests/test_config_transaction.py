@@ -0,0 +1,131 @@
+"""
+Key-subscriber notifications around :meth:`ConfigFactory.transaction`.
+"""
+import configparser
+import contextlib
+import threading
+
+import pytest
+
+from inspy_hard_stat.config.factory import ConfigFactory
+
+
+@pytest.fixture
+def subscribed(tmp_path):
+    config = ConfigFactory('lhm', auto_load=True, config_dir_path=tmp_path, skip_auto_saving=True)
+    seen = []
+
+    def record(key, old, new):
+        seen.append((key, old, new))
+
+    config.subscribe('port', record, watch_file=False)
+
+    yield config, seen
+
+    config.unsubscribe('port', record)
+
+
+def test_commit_notifies_once_with_committed_value(subscribed):
+    config, seen = subscribed
+    original = config.port
+
+    with config.transaction():
+        config.port = original + 1
+        config.port = original + 2
+
+        assert seen == []
+
+    assert seen == [('port', original, original + 2)]
+
+
+def test_nested_transactions_notify_when_outermost_commits(subscribed):
+    config, seen = subscribed
+    original = config.port
+
+    with config.transaction():
+        with config.transaction():
+            config.port = original + 1
+
+        assert seen == []
+
+    assert seen == [('port', original, original + 1)]
+
+
+def test_rollback_does_not_notify(subscribed):
+    config, seen = subscribed
+    original = config.port
+
+    with pytest.raises(RuntimeError):
+        with config.transaction():
+            config.port = original + 1
+            raise RuntimeError
+
+    assert config.port == original
+    assert seen == []
+
+
+def test_commit_without_net_change_does_not_notify(subscribed):
+    config, seen = subscribed
+    original = config.port
+
+    with config.transaction():
+        config.port = original + 1
+        config.port = original
+
+    assert seen == []
+
+
+def test_assignment_from_another_thread_is_not_batched(subscribed):
+    config, seen = subscribed
+    original = config.port
+    thread = threading.Thread(target=setattr, args=(config, 'port', original + 5))
+
+    with pytest.raises(RuntimeError):
+        with config.transaction():
+            config.port = original + 1
+            thread.start()
+            thread.join(0.2)
+
+            # The other thread waits for the transaction instead of joining it.
+            assert thread.is_alive()
+            raise RuntimeError
+
+    thread.join()
+
+    assert config.port == original + 5
+    assert seen == [('port', original, original + 5)]
+
+
+def write_port(config, port):
+    parser = configparser.ConfigParser()
+    parser.read(config.config_file_path)
+    parser.set('USER' if parser.has_section('USER') else 'DEFAULT', 'port', str(port))
+
+    with open(config.config_file_path, 'w') as config_file:
+        parser.write(config_file)
+
+
+@pytest.mark.parametrize('fail', [False, True], ids=['commit', 'rollback'])
+def test_reload_waits_for_an_open_transaction(subscribed, fail):
+    config, seen = subscribed
+    original = config.port
+    write_port(config, original + 7)
+    reload = threading.Thread(target=config.reload_config)
+
+    with contextlib.suppress(RuntimeError):
+        with config.transaction():
+            config.port = original + 1
+            reload.start()
+            reload.join(0.2)
+
+            # The reload waits for the transaction rather than mixing the file into it.
+            assert reload.is_alive()
+            assert config.port == original + 1
+
+            if fail:
+                raise RuntimeError
+
+    reload.join()
+
+    assert config.port == original + 7
+    assert config.snapshot.port == original + 7
@@ -0,0 +1,146 @@
+"""
+Running, stopping and guarding :class:`MonitorDaemon`.
+"""
+import os
+import signal
+import subprocess
+import sys
+import threading
+from argparse import ArgumentParser
+
+import pytest
+
+from inspy_hard_stat.ihs_lib.daemon.daemon import MonitorDaemon, add_daemon_arguments, run_daemon
+from inspy_hard_stat.ihs_lib.daemon.sinks import CallbackSink, LatestSink, Sink
+from inspy_hard_stat.ihs_lib.pid import fcntl
+
+
+class Collector:
+    def __init__(self, name='cpu'):
+        self.name = name
+        self.closed = False
+
+    def collect(self):
+        return {'value': 1}
+
+    def close(self):
+        self.closed = True
+
+
+class FailingSink(Sink):
+    def __init__(self, error):
+        self.error = error
+        self.closed = False
+
+    @property
+    def flush_deadline(self):
+        return None
+
+    def emit(self, record):
+        raise self.error
+
+    def close(self):
+        self.closed = True
+        raise self.error
+
+
+def make_daemon(tmp_path, sinks, collectors=None, **kwargs):
+    kwargs.setdefault('pid_file', tmp_path / 'daemon.pid')
+
+    return MonitorDaemon(collectors or [Collector()], sinks, interval=0.05, stats_interval=0, align=False, **kwargs)
+
+
+def test_failing_sink_does_not_stop_the_daemon(tmp_path):
+    records = []
+    failing = FailingSink(BrokenPipeError('reader went away'))
+    daemon = make_daemon(tmp_path, [failing, CallbackSink(records.append)])
+
+    assert daemon.run(duration=0.22) == 0
+    assert len(records) == daemon.records >= 4
+    # One error per record, plus one on close.
+    assert daemon.sink_errors == daemon.records + 1
+    assert daemon.last_sink_error is failing.error
+    assert daemon.footprint().sink_errors == daemon.sink_errors
+    assert failing.closed
+
+
+def test_failing_flush_does_not_stop_the_daemon(tmp_path):
+    latest = tmp_path / 'latest.json'
+    latest.mkdir()
+    records = []
+    daemon = make_daemon(tmp_path, [LatestSink(latest, min_interval=0.05), CallbackSink(records.append)])
+
+    assert daemon.run(duration=0.22) == 0
+    assert len(records) >= 4
+    assert daemon.sink_errors >= 1
+    assert isinstance(daemon.last_sink_error, OSError)
+
+
+def test_stop_closes_everything_and_removes_the_pid_file(tmp_path):
+    collector = Collector()
+    daemon = make_daemon(tmp_path, [CallbackSink(lambda record: None)], [collector])
+    pid_file = daemon.pid_file
+    seen = []
+
+    def stop():
+        seen.append(pid_file.read_text().split()[0])
+        daemon.stop()
+
+    threading.Timer(0.1, stop).start()
+
+    assert daemon.run() == 0
+    assert seen == [str(os.getpid())]
+    assert collector.closed
+    assert not pid_file.exists()
+
+
+@pytest.mark.skipif(not hasattr(signal, 'SIGTERM') or os.name == 'nt', reason='Needs POSIX signals.')
+def test_sigterm_stops_the_daemon(tmp_path):
+    daemon = make_daemon(tmp_path, [CallbackSink(lambda record: None)])
+    previous = signal.getsignal(signal.SIGTERM)
+    threading.Timer(0.1, os.kill, (os.getpid(), signal.SIGTERM)).start()
+
+    assert daemon.run(duration=30) == 0
+    assert not daemon.pid_file.exists()
+    assert signal.getsignal(signal.SIGTERM) is previous
+
+
+@pytest.mark.skipif(fcntl is None, reason='PID files are only locked with fcntl.')
+def test_refuses_to_start_while_another_daemon_holds_the_pid_file(tmp_path):
+    pid_file = tmp_path / 'daemon.pid'
+    pid_file.write_text('1\n')
+    holder = subprocess.Popen(
+            [sys.executable, '-c', 'import fcntl, sys, time; f = open(sys.argv[1]); fcntl.flock(f, fcntl.LOCK_EX); '
+             'print(flush=True); time.sleep(60)', str(pid_file)],
+            stdout=subprocess.PIPE,
+            )
+
+    try:
+        holder.stdout.readline()
+        collector = Collector()
+        daemon = make_daemon(tmp_path, [CallbackSink(lambda record: None)], [collector])
+
+        with pytest.raises(FileExistsError):
+            daemon.run(duration=0.1)
+
+        assert collector.closed
+        assert pid_file.read_text() == '1\n'
+    finally:
+        holder.kill()
+        holder.wait()
+        holder.stdout.close()
+
+
+def test_intervals_must_name_collected_metrics(tmp_path):
+    with pytest.raises(ValueError, match='gpu'):
+        make_daemon(tmp_path, [], intervals={'gpu': 5})
+
+
+def test_every_must_name_a_metric_in_metrics(tmp_path, capsys):
+    args = add_daemon_arguments(ArgumentParser()).parse_args(
+            ['--metrics', 'cpu', '--every', 'gpu=5', '--pid-file', str(tmp_path / 'daemon.pid')]
+            )
+
+    assert run_daemon(args) == 2
+    assert 'gpu' in capsys.readouterr().err
+    assert not (tmp_path / 'daemon.pid').exists()
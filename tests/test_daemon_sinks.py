@@ -0,0 +1,91 @@
+"""
+The sinks the monitoring daemon writes its records to.
+"""
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from inspy_hard_stat.ihs_lib.daemon.sinks import CallbackSink, LatestSink, NdjsonSink, create_sink
+
+
+def test_ndjson_sink_appends_one_record_per_line(tmp_path):
+    path = tmp_path / 'out' / 'records.ndjson'
+    sink = NdjsonSink(path)
+    sink.emit({'seq': 0, 'cpu': {'percent': 1.5}})
+    sink.emit({'seq': 1, 'mem': {'percent': 40.0}})
+    sink.close()
+
+    lines = path.read_text().splitlines()
+
+    assert [json.loads(line)['seq'] for line in lines] == [0, 1]
+
+
+@pytest.mark.skipif(os.name == 'nt', reason='Needs a POSIX pipe.')
+def test_ndjson_sink_drops_records_once_stdout_is_gone(monkeypatch):
+    read_fd, write_fd = os.pipe()
+    os.close(read_fd)
+
+    with os.fdopen(write_fd, 'wb') as stream:
+        monkeypatch.setattr(sys, 'stdout', SimpleNamespace(buffer=stream))
+        sink = NdjsonSink('-', max_delay=0)
+
+        with pytest.raises(BrokenPipeError):
+            sink.emit({'seq': 0})
+
+        sink.emit({'seq': 1})
+        sink.close()
+
+
+def test_latest_sink_keeps_the_latest_reading_of_each_metric(tmp_path):
+    path = tmp_path / 'latest.json'
+    sink = LatestSink(path, min_interval=60)
+    sink.emit({'seq': 0, 'cpu': 1})
+    sink.emit({'seq': 1, 'mem': 2})
+
+    assert not path.exists()
+
+    sink.flush_if_due()
+
+    assert json.loads(path.read_text()) == {'seq': 1, 'cpu': 1, 'mem': 2}
+
+    sink.emit({'seq': 2, 'cpu': 3})
+    sink.flush_if_due()
+
+    # Not rewritten until min_interval has passed, but still written out on close.
+    assert json.loads(path.read_text())['seq'] == 1
+
+    sink.close()
+
+    assert json.loads(path.read_text()) == {'seq': 2, 'cpu': 3, 'mem': 2}
+    assert os.listdir(tmp_path) == ['latest.json']
+
+
+def test_failed_latest_write_is_retried_later(tmp_path):
+    path = tmp_path / 'latest.json'
+    path.mkdir()
+    sink = LatestSink(path, min_interval=60)
+    sink.emit({'seq': 0})
+
+    with pytest.raises(OSError):
+        sink.flush_if_due()
+
+    assert os.listdir(tmp_path) == ['latest.json']
+    # Still waiting to be written, but not until min_interval has passed.
+    assert sink.flush_deadline is not None
+    sink.flush_if_due()
+
+
+def test_callback_sink_passes_records_on():
+    records = []
+    CallbackSink(records.append).emit({'seq': 0})
+
+    assert records == [{'seq': 0}]
+
+
+@pytest.mark.parametrize('spec', ['csv:/tmp/out.csv', 'ndjson', 'latest:'])
+def test_bad_sink_specs_are_rejected(spec):
+    with pytest.raises(ValueError):
+        create_sink(spec)
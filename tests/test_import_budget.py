@@ -0,0 +1,41 @@
+"""
+Cold-import budget for the core sampling API.
+
+Each check imports the module in a fresh interpreter under ``-X importtime`` (see ``Scripts/startup_profile.py``), so
+nothing imported by the test run itself can hide a regression.
+"""
+import pytest
+
+from Scripts.startup_profile import import_tree, profile_import, total_import_time
+
+
+IMPORT_BUDGET_MS = 150
+"""Generous next to the ~20 ms measured, so slow CI machines pass but a return of the eager imports (~280 ms) fails."""
+
+CORE_MODULES = (
+        'inspy_hard_stat.ihs_lib.process',
+        'inspy_hard_stat.ihs_lib.snapshot',
+        'inspy_hard_stat.ihs_lib.sampler',
+        )
+
+HEAVY_MODULES = ('requests', 'prompt_toolkit', 'rich', 'inspy_logger', 'inspyre_toolbox', 'cpuinfo')
+"""Packages the core sampling API must not load."""
+
+
+@pytest.fixture(scope='module', params=CORE_MODULES)
+def profiled(request):
+    return request.param, profile_import(request.param)
+
+
+def test_cold_import_within_budget(profiled):
+    module, timings = profiled
+    total_ms = total_import_time(module, timings) / 1000
+
+    assert total_ms <= IMPORT_BUDGET_MS, f'{module} took {total_ms:.1f} ms to import (budget {IMPORT_BUDGET_MS} ms)'
+
+
+def test_cold_import_skips_heavy_packages(profiled):
+    module, timings = profiled
+    loaded = {timing.module.partition('.')[0] for timing in import_tree(module, timings)}
+
+    assert not loaded & set(HEAVY_MODULES)
@@ -0,0 +1,147 @@
+"""
+Validating PID files, and cleaning up the PID files this process holds.
+"""
+import atexit
+import os
+import subprocess
+import sys
+
+import psutil
+import pytest
+
+from inspy_hard_stat.ihs_lib import pid as pid_module
+from inspy_hard_stat.ihs_lib.pid import (HELD_PID_FILES, create_pid_file, fcntl, get_process_start_time, hold_pid_file,
+                                         load_and_validate_pid, read_pid_file, remove_held_pid_files, remove_pid_file)
+
+
+@pytest.fixture
+def pid_files(tmp_path):
+    yield tmp_path / 'a.pid', tmp_path / 'b.pid'
+
+    remove_held_pid_files()
+
+
+@pytest.mark.skipif(not hasattr(atexit, '_ncallbacks'), reason='Needs CPython to count exit handlers.')
+def test_exit_handler_is_registered_once(pid_files):
+    first, second = pid_files
+    create_pid_file(os.getpid(), first)
+    registered = atexit._ncallbacks()
+
+    create_pid_file(os.getpid(), first)
+    create_pid_file(os.getpid(), second)
+
+    assert atexit._ncallbacks() == registered
+    assert pid_module._EXIT_HANDLER_REGISTERED
+
+
+def test_exit_handler_removes_every_held_file(pid_files):
+    first, second = pid_files
+    create_pid_file(os.getpid(), first)
+    create_pid_file(os.getpid(), second)
+
+    remove_pid_file(first)
+
+    assert not first.exists()
+    assert str(second) in HELD_PID_FILES
+
+    remove_held_pid_files()
+
+    assert not second.exists()
+    assert not HELD_PID_FILES
+
+
+def test_existing_file_is_held_once_free(pid_files):
+    first, _ = pid_files
+    first.write_text(f'{os.getpid()}\n')
+
+    assert hold_pid_file(first)
+
+    remove_held_pid_files()
+
+    assert not first.exists()
+
+
+@pytest.mark.skipif(fcntl is None, reason='PID files are only locked with fcntl.')
+def test_file_held_by_another_process_is_left_alone(pid_files):
+    first, _ = pid_files
+    first.write_text('1\n')
+    holder = subprocess.Popen(
+            [sys.executable, '-c', 'import fcntl, sys, time; f = open(sys.argv[1]); fcntl.flock(f, fcntl.LOCK_EX); '
+             'print(flush=True); time.sleep(60)', str(first)],
+            stdout=subprocess.PIPE,
+            )
+
+    try:
+        holder.stdout.readline()
+
+        assert not hold_pid_file(first)
+        assert str(first) not in HELD_PID_FILES
+    finally:
+        holder.kill()
+        holder.wait()
+        holder.stdout.close()
+
+
+def exited_pid():
+    process = subprocess.Popen([sys.executable, '-c', ''])
+    process.wait()
+
+    return process.pid
+
+
+def test_matching_start_time_is_valid(pid_files):
+    first, _ = pid_files
+    first.write_text(f'{os.getpid()}\n{get_process_start_time(os.getpid())}\n')
+
+    assert load_and_validate_pid(first) == os.getpid()
+    assert str(first) in HELD_PID_FILES
+
+
+def test_mismatched_start_time_removes_the_file(pid_files):
+    first, _ = pid_files
+    first.write_text(f'{os.getpid()}\n1\n')
+
+    assert load_and_validate_pid(first) is None
+    assert not first.exists()
+
+
+def test_legacy_file_is_checked_by_name(pid_files):
+    first, second = pid_files
+    name = psutil.Process().name()
+    first.write_text(f'{os.getpid()}\n')
+    second.write_text(f'{os.getpid()}\n')
+
+    assert load_and_validate_pid(first, expected_process_name=name) == os.getpid()
+    assert load_and_validate_pid(second, expected_process_name=f'not-{name}') is None
+    assert not second.exists()
+
+
+def test_missing_or_dead_pid_is_invalid(pid_files):
+    first, second = pid_files
+    first.write_text(f'{exited_pid()}\n')
+
+    assert load_and_validate_pid(first) is None
+    assert not first.exists()
+    assert load_and_validate_pid(second) is None
+
+
+def test_start_time_of_a_dead_process_is_none():
+    assert get_process_start_time(exited_pid()) is None
+
+
+@pytest.mark.parametrize('contents', ['', '\n', 'abc\n', '-5\n', '12.5 100\n'])
+def test_malformed_pid_file_reads_as_none(pid_files, contents):
+    first, _ = pid_files
+    first.write_text(contents)
+
+    assert read_pid_file(first) is None
+    assert load_and_validate_pid(first) is None
+
+
+def test_pid_file_with_start_time_is_read(pid_files):
+    first, second = pid_files
+    first.write_text('42\n1234\n')
+    second.write_text('42\n')
+
+    assert read_pid_file(first) == (42, '1234')
+    assert read_pid_file(second) == (42, None)
@@ -0,0 +1,48 @@
+"""
+Notifying subscribers with :class:`ProcessEventStream`.
+"""
+import pytest
+
+from inspy_hard_stat.ihs_lib.process import events as events_module
+from inspy_hard_stat.ihs_lib.process.events import ProcessEventKind, ProcessEventStream
+
+
+@pytest.fixture
+def running(monkeypatch):
+    pids = {1, 2}
+    monkeypatch.setattr(events_module, 'scan_pids', lambda: set(pids))
+
+    return pids
+
+
+def test_events_follow_changes_between_polls(running):
+    stream = ProcessEventStream()
+    events = []
+    stream.subscribe(events.append)
+
+    assert stream.poll() == (set(), set())
+
+    running.discard(1)
+    running.add(3)
+
+    assert stream.poll() == ({3}, {1})
+    assert [(event.kind, event.pid) for event in events] == [(ProcessEventKind.EXITED, 1), (ProcessEventKind.STARTED, 3)]
+
+
+def test_failing_callback_does_not_stop_the_others(running):
+    stream = ProcessEventStream()
+    error = RuntimeError('boom')
+    events = []
+
+    def fail(event):
+        raise error
+
+    stream.subscribe(fail)
+    stream.subscribe(events.append, kinds=[ProcessEventKind.STARTED])
+    stream.poll()
+    running.update({3, 4})
+
+    assert stream.poll() == ({3, 4}, set())
+    assert [event.pid for event in events] == [3, 4]
+    assert stream.callback_errors == 2
+    assert stream.last_callback_error is error
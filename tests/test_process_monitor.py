@@ -0,0 +1,22 @@
+"""
+Watching processes by name with :class:`WatchedProcessMonitor`.
+"""
+import os
+
+import psutil
+
+from inspy_hard_stat.ihs_lib.process.monitor import WatchedProcessMonitor
+
+
+def test_unwatch_name_drops_processes_the_table_has_lost(monkeypatch):
+    name = psutil.Process().name()
+    monitor = WatchedProcessMonitor(names=[name, 'no-such-process-*'])
+    monitor.table.refresh()
+
+    assert os.getpid() in monitor.watched_pids
+
+    monkeypatch.setattr(monitor.table, 'get', lambda pid: None)
+    monitor.unwatch_name('no-such-process-*')
+
+    assert os.getpid() not in monitor.watched_pids
+    assert monitor.patterns == [name.lower()]
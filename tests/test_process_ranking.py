@@ -0,0 +1,51 @@
+"""
+Rankings from :class:`ProcessRanking`.
+"""
+import os
+import time
+
+from inspy_hard_stat.ihs_lib.process.ranking import ProcessRanking
+from inspy_hard_stat.ihs_lib.process.stats import PROCESS_STATS_CACHE, ProcessStatsCache
+
+
+def burn(seconds):
+    deadline = time.monotonic() + seconds
+
+    while time.monotonic() < deadline:
+        pass
+
+
+def test_cpu_usage_goes_through_the_stats_cache():
+    cache = ProcessStatsCache()
+    ranking = ProcessRanking(stats_cache=cache)
+    ranking.update()
+    burn(0.3)
+    ranking.update()
+
+    ours = {process.pid: process for process in ranking.top(len(ranking.table.entries))}[os.getpid()]
+
+    assert ours.cpu_percent > 10
+    assert ours.rss > 0
+    assert any(key[0] == os.getpid() for key in cache.samples)
+
+
+def test_rss_only_ranking_leaves_the_stats_cache_alone():
+    cache = ProcessStatsCache()
+    ranking = ProcessRanking(track=('rss',), stats_cache=cache)
+    ranking.update()
+
+    top = ranking.top(5, by='rss')
+
+    assert top and top[0].cpu_percent is None and top[0].rss > 0
+    assert not cache.samples
+
+
+def test_default_stats_cache_is_not_the_shared_one(monkeypatch):
+    def sample(process):
+        raise AssertionError('The shared cache was sampled.')
+
+    monkeypatch.setattr(PROCESS_STATS_CACHE, 'sample', sample)
+    ranking = ProcessRanking(track=('cpu',))
+    ranking.update()
+
+    assert ranking.top(1)
@@ -0,0 +1,35 @@
+"""
+Memory totals from :class:`ProcessTree`.
+"""
+import os
+import sys
+
+import psutil
+import pytest
+
+from inspy_hard_stat.ihs_lib.process.tree import ProcessTree
+
+
+def deny(self):
+    raise psutil.AccessDenied(self.pid)
+
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason='PSS is only reported on Linux.')
+def test_pss_is_summed_when_readable():
+    totals = ProcessTree(os.getpid(), include_pss=True).sample()
+
+    assert totals.num_processes == 1
+    assert totals.pss > 0
+
+
+def test_pss_is_none_when_not_requested():
+    assert ProcessTree(os.getpid()).sample().pss is None
+
+
+def test_unreadable_memory_map_falls_back_to_rss(monkeypatch):
+    monkeypatch.setattr(psutil.Process, 'memory_full_info', deny)
+    totals = ProcessTree(os.getpid(), include_pss=True).sample()
+
+    assert totals.num_processes == 1
+    assert totals.rss > 0
+    assert totals.pss is None
@@ -0,0 +1,162 @@
+"""
+Batched output from :class:`BufferedLineWriter` and :class:`Sampler`, on a fake clock.
+"""
+import io
+import json
+import os
+import signal
+import threading
+from argparse import ArgumentParser
+from types import SimpleNamespace
+
+import pytest
+
+from inspy_hard_stat.ihs_lib import clock as clock_module
+from inspy_hard_stat.ihs_lib import sampler as sampler_module
+from inspy_hard_stat.ihs_lib.sampler import BufferedLineWriter, Sampler, add_sample_arguments, run_sampler
+
+
+class FakeTime:
+    def __init__(self):
+        self.mono = 100.0
+        self.wall = 1000.0
+
+    def advance(self, seconds):
+        self.mono += seconds
+        self.wall += seconds
+
+
+class FakeEvent:
+    """Waiting moves the fake clock on instead of sleeping."""
+
+    def __init__(self, fake_time):
+        self.fake_time = fake_time
+        self.flag = False
+
+    def is_set(self):
+        return self.flag
+
+    def set(self):
+        self.flag = True
+
+    def wait(self, timeout=None):
+        if not self.flag:
+            self.fake_time.advance(timeout)
+
+        return self.flag
+
+
+class RecordingStream(io.BytesIO):
+    def __init__(self, fake_time):
+        super().__init__()
+        self.fake_time = fake_time
+        self.written_at = []
+
+    def write(self, data):
+        self.written_at.append((self.fake_time.mono, data.count(b'\n')))
+        return super().write(data)
+
+
+class Collector:
+    name = 'test'
+
+    def collect(self):
+        return 1
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_time(monkeypatch):
+    fake = FakeTime()
+    fake_module = SimpleNamespace(monotonic=lambda: fake.mono, time=lambda: fake.wall, sleep=fake.advance)
+    monkeypatch.setattr(clock_module, 'time', fake_module)
+    monkeypatch.setattr(sampler_module, 'time', fake_module)
+    monkeypatch.setattr(sampler_module, 'threading', SimpleNamespace(Event=lambda: FakeEvent(fake)))
+
+    return fake
+
+
+def test_size_threshold_writes_a_batch(fake_time):
+    stream = io.BytesIO()
+    writer = BufferedLineWriter(stream, max_bytes=10, max_delay=60)
+    writer.write(b'12345\n')
+
+    assert stream.getvalue() == b''
+    assert writer.buffered_bytes == 6
+
+    writer.write(b'67890\n')
+
+    assert stream.getvalue() == b'12345\n67890\n'
+    assert writer.writes == 1
+    assert writer.lines_written == 2
+    assert writer.flush_deadline is None
+
+
+def test_time_threshold_writes_a_batch(fake_time):
+    stream = io.BytesIO()
+    writer = BufferedLineWriter(stream, max_bytes=1024, max_delay=1.0)
+    writer.write(b'a\n')
+
+    assert writer.flush_deadline == pytest.approx(fake_time.mono + 1.0)
+
+    fake_time.advance(0.5)
+    writer.write(b'b\n')
+
+    assert not writer.flush_if_due()
+    assert stream.getvalue() == b''
+
+    fake_time.advance(0.5)
+
+    assert writer.flush_if_due()
+    assert stream.getvalue() == b'a\nb\n'
+    assert writer.writes == 1
+
+
+def test_zero_delay_writes_every_line(fake_time):
+    stream = io.BytesIO()
+    writer = BufferedLineWriter(stream, max_delay=0)
+    writer.write(b'a\n')
+    writer.write(b'b\n')
+
+    assert stream.getvalue() == b'a\nb\n'
+    assert writer.writes == 2
+
+
+def test_waiting_records_go_out_before_the_next_tick(fake_time):
+    stream = RecordingStream(fake_time)
+    sampler = Sampler([Collector()], BufferedLineWriter(stream, max_delay=1.0), interval=5, align=False)
+
+    assert sampler.run(count=2) == 2
+
+    # The first record waited its 1 second, not until the second tick 5 seconds later.
+    assert stream.written_at == [(pytest.approx(101.0), 1)]
+
+    sampler.close()
+
+    assert [json.loads(line)['seq'] for line in stream.getvalue().splitlines()] == [0, 1]
+
+
+def test_stop_ends_the_run_before_the_next_tick(fake_time):
+    sampler = Sampler([Collector()], BufferedLineWriter(io.BytesIO()), interval=5, align=False)
+    sampler.stop()
+
+    assert sampler.run() == 0
+
+
+@pytest.mark.skipif(not hasattr(signal, 'SIGTERM') or os.name == 'nt', reason='Needs POSIX signals.')
+def test_sigterm_stops_sampling_and_writes_out_the_buffer():
+    stream = io.BytesIO()
+    args = add_sample_arguments(ArgumentParser()).parse_args(['--interval', '0.05', '--no-align', '--metrics', 'mem'])
+    previous = signal.getsignal(signal.SIGTERM)
+    threading.Timer(0.2, os.kill, (os.getpid(), signal.SIGTERM)).start()
+
+    assert run_sampler(args, stream) == 0
+
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+
+    # Nothing reached the 1 second flush threshold; the records were written out on the way out.
+    assert len(records) >= 2
+    assert [record['seq'] for record in records] == list(range(len(records)))
+    assert signal.getsignal(signal.SIGTERM) is previous
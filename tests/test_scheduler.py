@@ -0,0 +1,85 @@
+"""
+Running periodic jobs with :class:`Scheduler`.
+"""
+import threading
+import time
+
+import pytest
+
+from inspy_hard_stat.ihs_lib.daemon.scheduler import Scheduler
+
+
+def test_jobs_run_on_their_own_intervals():
+    scheduler = Scheduler()
+    fast = scheduler.add('fast', lambda tick: None, 0.05, align=False)
+    slow = scheduler.add('slow', lambda tick: None, 0.2, align=False)
+
+    scheduler.run(until=time.monotonic() + 0.43)
+
+    assert 8 <= fast.runs <= 10
+    assert slow.runs == 3
+
+
+def test_duplicate_names_are_rejected():
+    scheduler = Scheduler()
+    scheduler.add('job', lambda tick: None, 1.0)
+
+    with pytest.raises(ValueError):
+        scheduler.add('job', lambda tick: None, 1.0)
+
+
+def test_failing_job_is_counted_and_does_not_stop_the_others():
+    scheduler = Scheduler()
+    error = RuntimeError('boom')
+
+    def fail(tick):
+        raise error
+
+    failing = scheduler.add('failing', fail, 0.05, align=False)
+    working = scheduler.add('working', lambda tick: None, 0.05, align=False)
+
+    scheduler.run(until=time.monotonic() + 0.22)
+
+    assert failing.errors == failing.runs >= 4
+    assert failing.last_error is error
+    assert working.runs == failing.runs
+    assert working.errors == 0
+
+
+def test_stop_wakes_a_waiting_run():
+    scheduler = Scheduler()
+    scheduler.add('job', lambda tick: None, 60, delay=60, align=False)
+    threading.Timer(0.1, scheduler.stop).start()
+    started = time.monotonic()
+
+    scheduler.run()
+
+    assert time.monotonic() - started < 5
+
+
+def test_after_each_follows_each_batch_of_jobs():
+    scheduler = Scheduler()
+    ran = []
+    scheduler.add('a', lambda tick: ran.append('a'), 0.1, align=False)
+    scheduler.add('b', lambda tick: ran.append('b'), 0.1, align=False)
+
+    scheduler.run(until=time.monotonic() + 0.15, after_each=lambda: ran.append('after'))
+
+    assert ran == ['a', 'b', 'after', 'a', 'b', 'after']
+
+
+def test_after_each_runs_by_its_deadline_when_no_job_is_due():
+    scheduler = Scheduler()
+    scheduler.add('job', lambda tick: None, 60, delay=60, align=False)
+    started = time.monotonic()
+    deadlines = [started + 0.1]
+    called = []
+
+    def after_each():
+        called.append(time.monotonic() - started)
+        deadlines.clear()
+
+    scheduler.run(until=started + 0.3, after_each=after_each, wake_at=lambda: deadlines[0] if deadlines else None)
+
+    assert len(called) == 1
+    assert 0.1 <= called[0] < 0.25
@@ -0,0 +1,141 @@
+"""
+Publishing snapshots through :class:`SharedConfigPublisher` and reading them with :class:`SharedConfigReader`.
+"""
+import threading
+import time
+import warnings
+
+import pytest
+
+from inspy_hard_stat.config import shared as shared_module
+from inspy_hard_stat.config.shared import HEADER, SharedConfigPublisher, SharedConfigReader, _attach
+from inspy_hard_stat.config.snapshot import snapshot_class_for
+
+
+class FakeFactory:
+    config_system = 'fake'
+
+    def __init__(self, **values):
+        self.listeners = []
+        self.version = 0
+        self.commit(**values)
+
+    def commit(self, **values):
+        self.version += 1
+        self.snapshot = snapshot_class_for(self.config_system, tuple(values))(self.version, values)
+
+        for listener in list(self.listeners):
+            listener(self, self.snapshot)
+
+    def add_snapshot_listener(self, listener):
+        self.listeners.append(listener)
+
+    def remove_snapshot_listener(self, listener):
+        self.listeners.remove(listener)
+
+
+@pytest.fixture
+def published():
+    factory = FakeFactory(value='small')
+    publisher = SharedConfigPublisher([factory], name=f'ihs_test_{id(factory)}', size=256, set_env=False)
+    reader = SharedConfigReader(publisher.name)
+
+    yield factory, publisher, reader
+
+    reader.close()
+    publisher.close()
+
+
+def test_oversized_commit_warns_and_keeps_the_last_version(published):
+    factory, publisher, reader = published
+    version = reader.version
+
+    with pytest.warns(UserWarning, match='does not fit'):
+        factory.commit(value='x' * 1024)
+
+    assert publisher.version == version
+    assert reader.version == version
+    assert reader.get('fake').value == 'small'
+
+    factory.commit(value='fits')
+
+    assert reader.get('fake').value == 'fits'
+    assert reader.version == version + 1
+
+
+def test_version_matches_the_snapshots_read(published):
+    factory, publisher, reader = published
+    factory.commit(value='next')
+
+    assert reader.version == publisher.version
+    assert reader.get('fake').version == reader.version
+
+
+def test_version_waits_out_a_write_in_progress(published):
+    _, publisher, reader = published
+    version = reader.version
+    segment = _attach(publisher.name)
+    sequence, length = HEADER.unpack_from(segment.buf, 0)
+    HEADER.pack_into(segment.buf, 0, sequence + 1, length)
+
+    def finish():
+        time.sleep(0.05)
+        HEADER.pack_into(segment.buf, 0, sequence + 2, length)
+
+    writer = threading.Thread(target=finish)
+    writer.start()
+
+    try:
+        assert reader.version == version + 1
+    finally:
+        writer.join()
+        segment.close()
+
+
+@pytest.fixture
+def stuck_write(published, monkeypatch):
+    _, publisher, reader = published
+    # Read before the write gets stuck.
+    snapshot = reader.get('fake')
+    monkeypatch.setattr(shared_module, 'READ_TIMEOUT', 0.05)
+    segment = _attach(publisher.name)
+    sequence, length = HEADER.unpack_from(segment.buf, 0)
+
+    # A publisher that dies part way through a write leaves the sequence odd.
+    HEADER.pack_into(segment.buf, 0, sequence + 1, length)
+
+    yield segment, sequence, length, snapshot
+
+    segment.close()
+
+
+def test_abandoned_write_keeps_the_last_version(published, stuck_write):
+    _, _, reader = published
+    segment, sequence, length, snapshot = stuck_write
+    version = sequence // 2
+
+    with pytest.warns(UserWarning, match='never finished'):
+        assert reader.get('fake') is snapshot
+
+    # Given up on once: later reads neither wait nor warn again.
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        started = time.monotonic()
+
+        assert reader.version == version
+        assert time.monotonic() - started < 0.05
+
+    HEADER.pack_into(segment.buf, 0, sequence + 2, length)
+
+    assert reader.version == version + 1
+
+
+def test_abandoned_first_write_raises(published, stuck_write):
+    _, publisher, _ = published
+    reader = SharedConfigReader(publisher.name)
+
+    try:
+        with pytest.raises(TimeoutError):
+            reader.get('fake')
+    finally:
+        reader.close()
@@ -0,0 +1,53 @@
+"""
+When :func:`write_snapshot_cache` touches the disk.
+"""
+import pytest
+
+from inspy_hard_stat.config import snapshot as snapshot_module
+from inspy_hard_stat.config.snapshot import read_snapshot_cache, snapshot_class_for, write_snapshot_cache
+
+
+@pytest.fixture
+def cache_path(tmp_path, monkeypatch):
+    path = tmp_path / 'cache' / 'test.json'
+    monkeypatch.setattr(snapshot_module, 'get_snapshot_cache_path', lambda config_system: path)
+
+    return path
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / 'config.ini'
+    path.write_text('[DEFAULT]\nport = 8085\n')
+
+    return path
+
+
+def make_snapshot(**values):
+    return snapshot_class_for('test', ('port',))(1, values)
+
+
+def test_unchanged_snapshot_is_not_rewritten(cache_path, source):
+    assert write_snapshot_cache('test', make_snapshot(port=8085), source)
+    written = cache_path.stat()
+
+    # A rewrite replaces the file, so it would show up as a new inode.
+    assert write_snapshot_cache('test', make_snapshot(port=8085), source)
+    assert cache_path.stat().st_ino == written.st_ino
+    assert read_snapshot_cache('test') == {'port': 8085}
+
+
+def test_changed_values_are_rewritten(cache_path, source):
+    write_snapshot_cache('test', make_snapshot(port=8085), source)
+
+    assert write_snapshot_cache('test', make_snapshot(port=9000), source)
+    assert read_snapshot_cache('test') == {'port': 9000}
+
+
+def test_changed_source_is_rewritten(cache_path, source):
+    write_snapshot_cache('test', make_snapshot(port=8085), source)
+    source.write_text('[DEFAULT]\nport = 8085\n\n')
+
+    assert read_snapshot_cache('test') is None
+    assert write_snapshot_cache('test', make_snapshot(port=8085), source)
+    assert read_snapshot_cache('test') == {'port': 8085}
@@ -0,0 +1,24 @@
+"""
+Measuring commands with :func:`Scripts.startup_profile.run_once`.
+"""
+import sys
+
+import pytest
+
+from Scripts.startup_profile import run_once
+
+
+NOISY = 'import sys; sys.stderr.write("x" * 1_000_000); sys.exit({status})'
+
+
+def test_run_once_survives_more_stderr_than_a_pipe_holds():
+    wall_ms, _ = run_once([sys.executable, '-c', NOISY.format(status=0)])
+
+    assert wall_ms > 0
+
+
+def test_run_once_reports_the_tail_of_stderr_on_failure():
+    with pytest.raises(RuntimeError, match='exited with status 2') as raised:
+        run_once([sys.executable, '-c', NOISY.format(status=2)])
+
+    assert str(raised.value).endswith('x' * 2000)
@@ -0,0 +1,140 @@
+"""
+:class:`Supervisor` against real (dummy) child processes.
+"""
+import os
+import sys
+import time
+
+import pytest
+
+from inspy_hard_stat.ihs_lib.supervisor import ChildSpec, ChildState, RestartPolicy, Supervisor
+
+
+CRASH = [sys.executable, '-c', 'import sys; sys.exit(3)']
+SLEEP = [sys.executable, '-c', 'import time; time.sleep(60)']
+
+
+def wait_for(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+
+    while time.monotonic() < deadline:
+        result = predicate()
+
+        if result:
+            return result
+
+        time.sleep(0.02)
+
+    raise AssertionError('Timed out waiting for the supervisor.')
+
+
+def pid_gone(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+
+    return False
+
+
+@pytest.fixture
+def supervisor():
+    supervisor = Supervisor(poll_interval=0.05)
+
+    yield supervisor
+
+    supervisor.stop(timeout=10)
+
+
+def test_crash_backs_off_before_restarting(supervisor):
+    supervisor.add(ChildSpec('crash', CRASH, backoff_initial=0.5, backoff_factor=2.0, start_grace=5.0))
+    supervisor.start()
+
+    status = wait_for(lambda: (s := supervisor.status('crash')).state == ChildState.BACKOFF and s)
+
+    assert status.last_exit_code == 3
+    assert status.consecutive_failures == 1
+    assert 0 < status.next_start_in <= 0.5
+
+    status = wait_for(lambda: (s := supervisor.status('crash')).consecutive_failures == 2 and s)
+
+    assert status.restarts == 1
+    assert 0.5 < status.next_start_in <= 1.0
+
+
+def test_gives_up_after_max_restarts(supervisor):
+    supervisor.add(ChildSpec('crash', CRASH, backoff_initial=0.05, start_grace=5.0, max_restarts=2))
+    supervisor.start()
+
+    status = wait_for(lambda: (s := supervisor.status('crash')).state == ChildState.FAILED and s)
+
+    assert status.restarts == 2
+    assert status.pid is None
+    assert status.last_exit_code == 3
+
+
+def test_restarts_on_failed_probe(supervisor):
+    probed = []
+
+    def probe(pid):
+        probed.append(pid)
+        return False
+
+    supervisor.add(ChildSpec(
+            'sleeper',
+            SLEEP,
+            restart=RestartPolicy.ON_FAILURE,
+            backoff_initial=0.05,
+            start_grace=0.1,
+            health_probe=probe,
+            probe_interval=0.05,
+            probe_failures=2,
+            stop_timeout=1.0,
+            ))
+    supervisor.start()
+
+    first_pid = wait_for(lambda: supervisor.status('sleeper').pid)
+    status = wait_for(lambda: (s := supervisor.status('sleeper')).restarts >= 1 and s.pid and s)
+
+    assert probed[:2] == [first_pid, first_pid]
+    assert status.pid != first_pid
+    assert wait_for(lambda: pid_gone(first_pid))
+
+
+def test_stop_terminates_children(supervisor):
+    supervisor.add(ChildSpec('sleeper', SLEEP, stop_timeout=1.0))
+    supervisor.start()
+    pid = wait_for(lambda: supervisor.status('sleeper').pid)
+
+    supervisor.stop(timeout=10)
+
+    assert not supervisor.is_running
+    assert supervisor.status('sleeper').state == ChildState.STOPPED
+    assert supervisor.status('sleeper').pid is None
+    assert pid_gone(pid)
+
+
+def test_start_after_stop_restarts_children(supervisor):
+    supervisor.add(ChildSpec('sleeper', SLEEP, stop_timeout=1.0))
+    supervisor.start()
+    first_pid = wait_for(lambda: supervisor.status('sleeper').pid)
+    supervisor.stop(timeout=10)
+
+    supervisor.start()
+    pid = wait_for(lambda: supervisor.status('sleeper').pid)
+
+    assert pid != first_pid
+    assert supervisor.status('sleeper').state in (ChildState.STARTING, ChildState.RUNNING)
+
+
+def test_falls_back_to_polling_without_pidfds(supervisor, monkeypatch):
+    def pidfd_open(pid, flags=0):
+        raise OSError(38, 'Function not implemented')
+
+    monkeypatch.setattr(os, 'pidfd_open', pidfd_open, raising=False)
+    supervisor.add(ChildSpec('crash', CRASH, backoff_initial=0.05, start_grace=5.0, max_restarts=1))
+    supervisor.start()
+
+    status = wait_for(lambda: (s := supervisor.status('crash')).state == ChildState.FAILED and s)
+
+    assert status.restarts == 1
@@ -0,0 +1,82 @@
+"""
+CPU usage in :func:`take_snapshot`, measured without blocking.
+"""
+from collections import namedtuple
+
+import psutil
+import pytest
+
+from inspy_hard_stat.ihs_lib import snapshot as snapshot_module
+from inspy_hard_stat.ihs_lib.snapshot import take_snapshot
+
+
+CpuTimes = namedtuple('CpuTimes', 'user system idle iowait guest')
+
+
+@pytest.fixture
+def cpu(tmp_path, monkeypatch):
+    times = {'now': CpuTimes(0.0, 0.0, 0.0, 0.0, 0.0), 'boot': 1000.0}
+
+    monkeypatch.setattr(snapshot_module, '_cpu_times_cache_path', lambda: tmp_path / 'cpu_times.json')
+    monkeypatch.setattr(snapshot_module, '_last_cpu_times', None)
+    monkeypatch.setattr(psutil, 'cpu_times', lambda: times['now'])
+    monkeypatch.setattr(psutil, 'boot_time', lambda: times['boot'])
+
+    def cpu_percent(interval=None):
+        raise AssertionError('The snapshot blocked on psutil.cpu_percent.')
+
+    monkeypatch.setattr(psutil, 'cpu_percent', cpu_percent)
+
+    return times
+
+
+def cpu_percent():
+    return take_snapshot()['cpu']['percent']
+
+
+def test_first_snapshot_reports_usage_since_boot(cpu):
+    cpu['now'] = CpuTimes(20.0, 5.0, 70.0, 5.0, 3.0)
+
+    assert cpu_percent() == 25.0
+
+
+def test_next_snapshot_reports_usage_since_the_last(cpu):
+    cpu['now'] = CpuTimes(20.0, 5.0, 75.0, 0.0, 0.0)
+    cpu_percent()
+    cpu['now'] = CpuTimes(29.0, 6.0, 85.0, 0.0, 0.0)
+
+    assert cpu_percent() == 50.0
+
+
+def test_previous_snapshot_is_read_from_the_cache(cpu):
+    cpu['now'] = CpuTimes(20.0, 5.0, 75.0, 0.0, 0.0)
+    cpu_percent()
+    # As if the next snapshot were taken by a new process.
+    snapshot_module._last_cpu_times = None
+    cpu['now'] = CpuTimes(20.0, 5.0, 95.0, 0.0, 0.0)
+
+    assert cpu_percent() == 0.0
+
+
+def test_samples_from_an_earlier_boot_are_ignored(cpu):
+    cpu['now'] = CpuTimes(90.0, 0.0, 10.0, 0.0, 0.0)
+    cpu_percent()
+    cpu['boot'] = 5000.0
+    cpu['now'] = CpuTimes(10.0, 0.0, 30.0, 0.0, 0.0)
+
+    assert cpu_percent() == 25.0
+
+
+def test_unreadable_cache_falls_back_to_usage_since_boot(cpu, tmp_path):
+    (tmp_path / 'cpu_times.json').write_text('{not json')
+    cpu['now'] = CpuTimes(10.0, 0.0, 30.0, 0.0, 0.0)
+
+    assert cpu_percent() == 25.0
+
+
+def test_positive_interval_blocks_on_psutil(cpu, monkeypatch):
+    intervals = []
+    monkeypatch.setattr(psutil, 'cpu_percent', lambda interval=None: intervals.append(interval) or 42.0)
+
+    assert take_snapshot(cpu_interval=0.2)['cpu']['percent'] == 42.0
+    assert intervals == [0.2]
@@ -0,0 +1,119 @@
+"""
+Deadlines, lateness and skipped ticks of :class:`TickClock`, on a fake clock.
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from inspy_hard_stat.ihs_lib import clock as clock_module
+from inspy_hard_stat.ihs_lib.clock import TickClock
+
+
+class FakeTime:
+    def __init__(self, mono, wall):
+        self.mono = mono
+        self.wall = wall
+
+    def advance(self, seconds):
+        self.mono += seconds
+        self.wall += seconds
+
+    def advance_to(self, mono):
+        self.advance(mono - self.mono)
+
+    def step_wall(self, seconds):
+        self.wall += seconds
+
+
+@pytest.fixture
+def fake_time(monkeypatch):
+    fake = FakeTime(mono=50.0, wall=1000.25)
+    monkeypatch.setattr(
+            clock_module,
+            'time',
+            SimpleNamespace(monotonic=lambda: fake.mono, time=lambda: fake.wall, sleep=fake.advance),
+            )
+
+    return fake
+
+
+def test_aligned_ticks_fall_on_offset_boundaries(fake_time):
+    clock = TickClock(5, offset=1)
+
+    assert clock.next_deadline == pytest.approx(50.75)
+
+    fake_time.advance_to(clock.next_deadline)
+    tick = clock.tick()
+
+    assert tick.scheduled == 1001
+    assert tick.index == 200
+    assert tick.lateness == pytest.approx(0)
+
+    tick = clock.wait()
+
+    assert tick.scheduled == 1006
+    assert tick.mono == pytest.approx(55.75)
+
+
+def test_lateness_is_measured_from_the_deadline(fake_time):
+    clock = TickClock(5)
+    fake_time.advance_to(clock.next_deadline + 1.5)
+    tick = clock.tick()
+
+    assert tick.scheduled == 1005
+    assert tick.lateness == pytest.approx(1.5)
+    assert tick.skipped == 0
+    assert clock.max_lateness == pytest.approx(1.5)
+
+
+def test_ticks_missed_in_a_stall_are_skipped(fake_time):
+    clock = TickClock(5)
+    clock.wait()
+    fake_time.advance_to(clock.next_deadline + 3 * 5 + 2.5)
+    tick = clock.tick()
+
+    assert tick.scheduled == 1025
+    assert tick.skipped == 3
+    assert tick.lateness == pytest.approx(2.5)
+    assert clock.skipped == 3
+    assert clock.ticks == 2
+    assert clock.next_deadline == pytest.approx(fake_time.mono + 2.5)
+
+
+def test_wall_clock_step_reanchors_the_ticks(fake_time):
+    clock = TickClock(5)
+    clock.wait()
+    fake_time.advance(1)
+    fake_time.step_wall(32)
+    tick = clock.wait()
+
+    # This tick was already due on the monotonic clock; the next one falls on the stepped wall clock's boundary.
+    assert tick.scheduled == 1010
+    assert fake_time.wall == pytest.approx(1042)
+    assert clock.next_deadline == pytest.approx(fake_time.mono + 3)
+    assert clock.wait().scheduled == 1045
+
+
+def test_small_wall_clock_drift_is_ignored(fake_time):
+    clock = TickClock(5)
+    clock.wait()
+    fake_time.step_wall(0.1)
+    clock.wait()
+
+    assert clock.next_deadline == pytest.approx(fake_time.mono + 5)
+
+
+def test_unaligned_ticks_count_from_the_delay(fake_time):
+    clock = TickClock(2, align=False, delay=0.5)
+
+    assert clock.next_deadline == pytest.approx(50.5)
+
+    first, second = clock.wait(), clock.wait()
+
+    assert (first.index, second.index) == (0, 1)
+    assert second.scheduled - first.scheduled == pytest.approx(2)
+
+
+def test_interval_must_be_positive():
+    with pytest.raises(ValueError):
+        TickClock(0)
@@ -0,0 +1,70 @@
+"""
+Waiting for Enter without leaving a reader on standard input.
+"""
+import os
+import socket
+import sys
+import threading
+
+import pytest
+
+from inspy_hard_stat.utils import _wait_for_enter
+
+
+pytestmark = pytest.mark.skipif(os.name == 'nt', reason='Uses a pipe as standard input.')
+
+
+@pytest.fixture
+def stdin(monkeypatch):
+    read_fd, write_fd = os.pipe()
+    reader = os.fdopen(read_fd, 'r')
+    writer = os.fdopen(write_fd, 'w')
+    monkeypatch.setattr(sys, 'stdin', reader)
+
+    yield writer
+
+    writer.close()
+    reader.close()
+
+
+@pytest.fixture
+def wake():
+    pair = socket.socketpair()
+
+    yield pair
+
+    for end in pair:
+        end.close()
+
+
+def test_enter_ends_the_wait(stdin, wake):
+    stdin.write('\n')
+    stdin.flush()
+
+    assert _wait_for_enter(threading.Event(), wake[0], timeout=5)
+
+
+@pytest.mark.parametrize('by_event', [True, False], ids=['event', 'timeout'])
+def test_nothing_reads_stdin_after_the_wait(stdin, wake, by_event):
+    event = threading.Event()
+
+    if by_event:
+        event.set()
+        wake[1].send(b'\0')
+
+    assert not _wait_for_enter(event, wake[0], timeout=0.1)
+
+    # A later prompt gets the next line typed.
+    stdin.write('later\n')
+    stdin.flush()
+
+    assert sys.stdin.readline() == 'later\n'
+
+
+def test_end_of_input_waits_for_the_event(stdin, wake):
+    stdin.close()
+    event = threading.Event()
+    threading.Timer(0.1, lambda: (event.set(), wake[1].send(b'\0'))).start()
+
+    assert not _wait_for_enter(event, wake[0], timeout=5)
+    assert event.is_set()